@@ -3,22 +3,43 @@ EduDB Flask Application
 Main application file with all routes
 """
 
-from flask import Flask, request, jsonify, send_from_directory, render_template_string
+from flask import Flask, Response, g, request, jsonify, send_from_directory, render_template_string, stream_with_context
 from flask_cors import CORS
+import csv
+import hashlib
+import io
 import logging
-import json
+from datetime import date, time, timedelta
+from decimal import Decimal
 from pathlib import Path
+from time import perf_counter
+import re
+import secrets
 
 from config.config import Config
 from backend.database import Database
 from backend.models import Student, Teacher, Course, Enrollment, Progress, Certificate
+from backend.importer import TableImporter, detect_format
+from backend.profiler import set_source as set_profile_source
+from backend import metrics
+from backend.assets import AssetStore
+from backend.json_provider import EduDBJSONProvider, to_json_value
+from backend.certificate_pdf import PDF_MIMETYPE
+from backend import columnar
 
 # Initialize Flask app
+# Static files are served from memory by AssetStore, not Flask's static route
 app = Flask(__name__, 
-            static_folder='../frontend/static',
+            static_folder=None,
             template_folder='../frontend/pages')
 app.config.from_object(Config)
 
+# Serializes dates, DECIMAL and binary columns while encoding (orjson if installed)
+app.json = EduDBJSONProvider(app)
+
+# Pages and static files, loaded once with precompressed variants
+assets = AssetStore(Config.PAGES_DIR, Config.STATIC_DIR)
+
 # Enable CORS
 CORS(app)
 
@@ -29,55 +50,96 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Learner ids: URL-safe tokens, as made by secrets.token_urlsafe
+_LEARNER_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{8,64}$')
+
 # Do NOT initialize database pool on startup
 # It will be initialized lazily when first needed
 
 
+@app.before_request
+def tag_profiled_queries():
+    """Tag statements with the endpoint that issued them for the query profiler"""
+    set_profile_source(request.endpoint)
+
+
+@app.before_request
+def start_request_metrics():
+    """Start timing the request for /metrics"""
+    g.request_started = perf_counter()
+    metrics.HTTP_IN_FLIGHT.inc()
+
+
+@app.after_request
+def record_request_metrics(response):
+    """Record latency and status by route template (not raw path, to bound label values)"""
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.HTTP_LATENCY.observe(perf_counter() - started, request.method, route)
+        metrics.HTTP_REQUESTS.inc(request.method, route, response.status_code)
+        metrics.HTTP_IN_FLIGHT.dec()
+    return response
+
+
+@app.teardown_request
+def finish_request_metrics(error):
+    """Balance the in-flight gauge for requests that never produced a response"""
+    if g.pop('request_started', None) is not None:
+        metrics.HTTP_IN_FLIGHT.dec()
+
+
+metrics.REGISTRY.add_collector(Database.collect_metrics)
+
+
 # ========== Page Routes ==========
 
 @app.route('/')
 def home():
     """Serve home page"""
-    try:
-        with open(Config.PAGES_DIR / 'home.html', 'r', encoding='utf-8') as f:
-            content = f.read()
-            logger.info("Application started successfully. Database will be initialized through Setup page.")
-            return content
-    except FileNotFoundError:
-        return "Home page not found", 404
+    return _serve_page('home', "Home page not found")
 
 
 @app.route('/setup')
 @app.route('/setup/')
 def setup():
     """Serve setup page"""
-    try:
-        with open(Config.PAGES_DIR / 'setup.html', 'r', encoding='utf-8') as f:
-            return f.read()
-    except FileNotFoundError:
-        return "Setup page not found", 404
+    return _serve_page('setup', "Setup page not found")
 
 
 @app.route('/studio')
 @app.route('/studio/')
 def studio():
     """Serve studio page"""
-    try:
-        with open(Config.PAGES_DIR / 'studio.html', 'r', encoding='utf-8') as f:
-            return f.read()
-    except FileNotFoundError:
-        return "Studio page not found", 404
+    return _serve_page('studio', "Studio page not found")
 
 
 @app.route('/exercises')
 @app.route('/exercises/')
 def exercises():
     """Serve exercises page"""
-    try:
-        with open(Config.PAGES_DIR / 'exercises.html', 'r', encoding='utf-8') as f:
-            return f.read()
-    except FileNotFoundError:
-        return "Exercises page not found", 404
+    return _serve_page('exercises', "Exercises page not found")
+
+
+@app.route('/static/<path:filename>')
+def static_file(filename):
+    """Serve a static file (content-hashed URLs are cached for a year)"""
+    if app.config.get('ASSET_RELOAD'):
+        assets.reload_if_changed()
+    response = assets.static_response(filename, request)
+    if response is None:
+        return "File not found", 404
+    return response
+
+
+def _serve_page(name, missing_message):
+    """Serve an in-memory page with ETag revalidation"""
+    if app.config.get('ASSET_RELOAD'):
+        assets.reload_if_changed()
+    response = assets.page_response(name, request)
+    if response is None:
+        return missing_message, 404
+    return response
 
 
 # ========== API Routes - Database Operations ==========
@@ -160,26 +222,91 @@ def get_tables():
     }), 500
 
 
+@app.route('/api/schema', methods=['GET'])
+def get_schema():
+    """Get columns, primary keys, indexes and foreign keys of all tables"""
+    success, result = Database.get_schema()
+    
+    if success:
+        return jsonify({
+            'success': True,
+            'schema': result.to_dict()
+        })
+    return jsonify({
+        'success': False,
+        'error': result
+    }), 500
+
+
 @app.route('/api/tables/<table_name>', methods=['GET'])
 def get_table_data(table_name):
-    """Get all records from a specific table"""
-    success, result = Database.get_table_data(table_name)
+    """
+    Get records from a specific table
+    
+    Query parameters:
+        limit: Page size (default 100, at most TABLE_MAX_PAGE_SIZE)
+        offset: Rows to skip in offset mode
+        cursor: next_cursor from a previous page (enables keyset mode)
+        paginate: 'keyset' to start keyset pagination from the first page
+        exact_total: '1' to count rows exactly instead of using the count cache
+        format: 'columnar' for column arrays, 'msgpack' for the same as MessagePack
+    
+    Responses carry an ETag derived from the table's write version; a
+    matching If-None-Match is answered with 304 before any query runs.
+    'changes' is the change feed cursor to poll /changes from.
+    """
+    result_format, error = _result_format()
+    if error:
+        return error
+    
+    # Read the version before the data so a concurrent write can only make the ETag older
+    etag = None
+    if app.config.get('TABLE_ETAGS'):
+        success, version = Database.get_table_version(table_name)
+        if success and version is not None:
+            etag = _table_etag(table_name, version)
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+                response.set_etag(etag, weak=True)
+                response.headers['Cache-Control'] = 'no-cache'
+                return response
+    
+    limit = request.args.get('limit', 100, type=int)
+    offset = request.args.get('offset', 0, type=int)
+    cursor = request.args.get('cursor') or None
+    keyset = request.args.get('paginate', '').lower() == 'keyset'
+    exact_total = request.args.get('exact_total', '').lower() in ('1', 'true', 'yes')
+    
+    # Taken before the query: writes racing it are sent again, never missed
+    changes = Database.get_change_position()
+    success, result = Database.get_table_data(
+        table_name,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        keyset=keyset,
+        exact_total=exact_total,
+        as_columns=result_format != 'json'
+    )
     
     if success:
         # Result is a dict with 'data' and 'total' keys
         data = result.get('data', []) if isinstance(result, dict) else result
         
-        # Convert date objects to strings
-        for record in data:
-            for key, value in record.items():
-                if hasattr(value, 'isoformat'):
-                    record[key] = value.isoformat()
-        
-        return jsonify({
+        response = _format_response({
             'success': True,
+            'format': result_format,
             'data': data,
-            'total': result.get('total', len(data)) if isinstance(result, dict) else len(data)
-        })
+            'total': result.get('total', len(data)) if isinstance(result, dict) else len(data),
+            'total_exact': result.get('total_exact', False) if isinstance(result, dict) else False,
+            'next_cursor': result.get('next_cursor') if isinstance(result, dict) else None,
+            'changes': changes
+        }, result_format)
+        if etag:
+            response.set_etag(etag, weak=True)
+            # Let browsers keep the page but revalidate it on every use
+            response.headers['Cache-Control'] = 'no-cache'
+        return response
     
     # Check if it's a database not available error
     if isinstance(result, str) and 'not available' in result.lower():
@@ -195,6 +322,225 @@ def get_table_data(table_name):
     }), 400
 
 
+def _table_etag(table_name, version):
+    """ETag for one table page: the table version plus the page's query string"""
+    args = hashlib.sha1(request.query_string).hexdigest()[:12]
+    return f"{table_name}-{version}-{args}"
+
+
+@app.route('/api/overview', methods=['GET'])
+def get_overview():
+    """
+    Get the row count and first page of every table in one request
+    
+    Query parameters:
+        limit: Rows per table (default Config.OVERVIEW_PAGE_SIZE)
+    """
+    limit = request.args.get('limit', type=int)
+    if limit is not None and limit <= 0:
+        return jsonify({
+            'success': False,
+            'error': "'limit' must be a positive integer"
+        }), 400
+    
+    success, result = Database.get_overview(limit)
+    
+    if success:
+        return jsonify({
+            'success': True,
+            'tables': result
+        })
+    
+    if isinstance(result, str) and 'not available' in result.lower():
+        return jsonify({
+            'success': False,
+            'error': result,
+            'database_missing': True
+        }), 503
+    
+    return jsonify({
+        'success': False,
+        'error': result
+    }), 500
+
+
+def _result_format():
+    """
+    Read the ?format= response format of a table or query request
+    
+    Returns:
+        tuple: (format, None) or (None, error response)
+    """
+    result_format = request.args.get('format', 'json').lower()
+    if result_format not in columnar.FORMATS:
+        return None, (jsonify({
+            'success': False,
+            'error': f"Unknown format '{result_format}'; use one of {', '.join(columnar.FORMATS)}"
+        }), 400)
+    if result_format == 'msgpack' and columnar.msgpack is None:
+        return None, (jsonify({
+            'success': False,
+            'error': "MessagePack responses need the msgpack package; use format=columnar"
+        }), 400)
+    return result_format, None
+
+
+def _format_response(payload, result_format):
+    """Send a successful payload as JSON or MessagePack"""
+    if result_format == 'msgpack':
+        return Response(columnar.packb(payload), mimetype=columnar.MSGPACK_MIMETYPE)
+    return jsonify(payload)
+
+
+def _export_value(value):
+    """Convert a column value into something csv can write"""
+    if isinstance(value, (date, time, timedelta, Decimal, bytes, bytearray)):
+        value = to_json_value(value)
+        # Binary that is not text: the same base64 marker as in JSON
+        return app.json.dumps(value) if isinstance(value, dict) else value
+    return value
+
+
+def _export_ndjson(stream):
+    """Yield one JSON object per line, one chunk of rows at a time"""
+    columns = stream.columns
+    for rows in stream:
+        yield ''.join(
+            app.json.dumps(dict(zip(columns, row))) + '\n'
+            for row in rows
+        )
+
+
+def _export_csv(stream):
+    """Yield a CSV header followed by one chunk of rows at a time"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(stream.columns)
+    yield buffer.getvalue()
+    
+    for rows in stream:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_export_value(value) for value in row] for row in rows)
+        yield buffer.getvalue()
+
+
+@app.route('/api/tables/<table_name>/export', methods=['GET'])
+def export_table(table_name):
+    """
+    Stream a whole table as NDJSON or CSV
+    
+    Query parameters:
+        format: 'ndjson' (default) or 'csv'
+    """
+    export_format = request.args.get('format', 'ndjson').lower()
+    if export_format not in ('ndjson', 'csv'):
+        return jsonify({
+            'success': False,
+            'error': "Format must be 'ndjson' or 'csv'"
+        }), 400
+    
+    success, stream = Database.stream_table(table_name)
+    if not success:
+        return jsonify({
+            'success': False,
+            'error': stream
+        }), 400
+    
+    if export_format == 'csv':
+        body, mimetype = _export_csv(stream), 'text/csv'
+    else:
+        body, mimetype = _export_ndjson(stream), 'application/x-ndjson'
+    
+    response = Response(stream_with_context(body), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename={table_name}.{export_format}'
+    response.headers['X-Accel-Buffering'] = 'no'
+    # Return the connection even if the client disconnects mid-stream
+    response.call_on_close(stream.close)
+    return response
+
+
+@app.route('/api/tables/<table_name>/changes', methods=['GET'])
+def get_table_changes(table_name):
+    """
+    Get the writes made to a table after a change feed sequence number
+    
+    Query parameters:
+        cursors: Comma-separated 'feed:next' pairs from previous calls
+        since: 'next' from the previous call, for a single-process server
+        time: 'time' of the table load's change position; feeds without a
+            cursor send the events published since then
+        limit: Maximum number of events (default and maximum 500)
+    
+    Clients poll this. Every worker process has its own feed, so clients
+    keep the 'next' of each 'feed' they were answered from. When 'reload'
+    is true the events the client needs are no longer buffered and the
+    table should be fetched again.
+    """
+    cursors = {}
+    for cursor in request.args.get('cursors', '').split(','):
+        feed_id, _, seq = cursor.partition(':')
+        if seq.isdigit():
+            cursors[feed_id] = int(seq)
+    since = request.args.get('since', type=int)
+    if since is not None:
+        cursors[None] = since
+    since_time = request.args.get('time', type=int)
+    limit = min(max(request.args.get('limit', 500, type=int), 1), 500)
+    
+    success, result = Database.get_changes(table_name, cursors, limit, since_time)
+    if not success:
+        return jsonify({
+            'success': False,
+            'error': result
+        }), 400
+    
+    return jsonify({
+        'success': True,
+        **result
+    })
+
+
+@app.route('/api/tables/<table_name>/import', methods=['POST'])
+def import_table(table_name):
+    """
+    Bulk import a CSV or NDJSON file
+    
+    The file is sent either as multipart field 'file' or as the raw body.
+    
+    Query parameters:
+        format: 'csv' or 'ndjson' (default: from file name, else csv)
+        batch_size: Rows per committed batch
+        load_data: '0' to never use LOAD DATA LOCAL INFILE
+    """
+    upload = request.files.get('file')
+    stream = upload.stream if upload else request.stream
+    file_format = request.args.get('format') or detect_format(upload.filename if upload else None)
+    if file_format not in ('csv', 'ndjson'):
+        return jsonify({
+            'success': False,
+            'error': "Format must be 'csv' or 'ndjson'"
+        }), 400
+    
+    importer = TableImporter(
+        table_name,
+        batch_size=request.args.get('batch_size', type=int),
+        use_load_data=request.args.get('load_data', '1') != '0'
+    )
+    success, result = importer.run(stream, file_format)
+    
+    if success:
+        return jsonify({
+            'success': True,
+            'message': f"Imported {result['rows_imported']} rows",
+            'report': result
+        })
+    return jsonify({
+        'success': False,
+        'error': result
+    }), 400
+
+
 @app.route('/api/tables/<table_name>', methods=['POST'])
 def insert_record(table_name):
     """Insert a new record"""
@@ -213,6 +559,38 @@ def insert_record(table_name):
     }), 400
 
 
+@app.route('/api/tables/<table_name>/bulk', methods=['POST'])
+def bulk_write(table_name):
+    """
+    Apply many writes in one transaction
+    
+    Body: {"inserts": [{...}], "upserts": [{...}],
+           "updates": [{"id": 1, "data": {...}}], "deletes": [1, 2],
+           "chunk_size": 500}
+    """
+    data = request.json or {}
+    success, result = Database.bulk_write(
+        table_name,
+        inserts=data.get('inserts'),
+        upserts=data.get('upserts'),
+        updates=data.get('updates'),
+        deletes=data.get('deletes'),
+        chunk_size=data.get('chunk_size')
+    )
+    
+    if success:
+        return jsonify({
+            'success': True,
+            'message': 'Bulk write completed successfully',
+            'summary': result['summary'],
+            'results': result['results']
+        })
+    return jsonify({
+        'success': False,
+        'error': result
+    }), 400
+
+
 @app.route('/api/tables/<table_name>/<int:record_id>', methods=['PUT'])
 def update_record(table_name, record_id):
     """Update a record"""
@@ -258,37 +636,167 @@ def reset_database():
     })
 
 
+@app.route('/api/snapshots', methods=['GET'])
+def list_snapshots():
+    """List named snapshots of the sample data tables"""
+    success, result = Database.list_snapshots()
+    
+    if success:
+        return jsonify({
+            'success': True,
+            'snapshots': result
+        })
+    return jsonify({
+        'success': False,
+        'error': result
+    }), 500
+
+
+@app.route('/api/snapshots', methods=['POST'])
+def create_snapshot():
+    """Take a named snapshot of the sample data tables"""
+    data = request.json or {}
+    name = data.get('name')
+    
+    if name == Config.PRISTINE_SNAPSHOT:
+        return jsonify({
+            'success': False,
+            'error': f"Snapshot '{name}' is managed by the application"
+        }), 400
+    
+    success, result = Database.create_snapshot(name, data.get('tables'))
+    
+    if success:
+        return jsonify({
+            'success': True,
+            'snapshot': result
+        })
+    return jsonify({
+        'success': False,
+        'error': result
+    }), 400
+
+
+@app.route('/api/snapshots/<name>/restore', methods=['POST'])
+def restore_snapshot(name):
+    """Restore the tables of a named snapshot"""
+    success, result = Database.restore_snapshot(name)
+    
+    if success:
+        return jsonify({
+            'success': True,
+            'snapshot': result
+        })
+    return jsonify({
+        'success': False,
+        'error': result
+    }), 400
+
+
+@app.route('/api/snapshots/<name>', methods=['DELETE'])
+def delete_snapshot(name):
+    """Delete a named snapshot"""
+    if name == Config.PRISTINE_SNAPSHOT:
+        return jsonify({
+            'success': False,
+            'error': f"Snapshot '{name}' is managed by the application"
+        }), 400
+    
+    success, result = Database.delete_snapshot(name)
+    
+    if success:
+        return jsonify({
+            'success': True,
+            'message': result
+        })
+    return jsonify({
+        'success': False,
+        'error': result
+    }), 400
+
+
+@app.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """Get query result cache statistics"""
+    return jsonify({
+        'success': True,
+        'cache': Database.get_cache_stats(),
+        'progress_buffer': Progress.get_buffer_stats(),
+        'certificate_pdfs': Certificate.get_renderer_stats()
+    })
+
+
+@app.route('/api/profile', methods=['GET'])
+def get_profile():
+    """Get recent statement profiles and the most expensive statements"""
+    limit = request.args.get('limit', 100, type=int)
+    min_ms = request.args.get('min_ms', 0, type=float)
+    source = request.args.get('source')
+    
+    return jsonify({
+        'success': True,
+        **Database.get_profile(limit=max(1, min(limit, 1000)), min_ms=min_ms, source=source)
+    })
+
+
+@app.route('/api/profile', methods=['POST'])
+def set_profiling():
+    """Turn statement profiling on or off"""
+    data = request.json or {}
+    slow_ms = data.get('slow_ms')
+    if slow_ms is not None and (not isinstance(slow_ms, (int, float)) or slow_ms < 0):
+        return jsonify({
+            'success': False,
+            'error': "'slow_ms' must be a non-negative number"
+        }), 400
+    
+    return jsonify({
+        'success': True,
+        'profiler': Database.set_profiling(data.get('enabled', True), slow_ms)
+    })
+
+
+@app.route('/api/profile', methods=['DELETE'])
+def clear_profile():
+    """Drop buffered statement profiles"""
+    Database.clear_profile()
+    
+    return jsonify({
+        'success': True,
+        'message': 'Profile cleared'
+    })
+
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Serve request and database metrics in Prometheus text format"""
+    return Response(metrics.REGISTRY.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+
+@app.route('/api/pool/stats', methods=['GET'])
+def get_pool_stats():
+    """Get database connection pool and prepared statement statistics"""
+    return jsonify({
+        'success': True,
+        'pool': Database.get_pool_stats(),
+        'prepared_statements': Database.get_statement_stats(),
+        'fanout': Database.get_executor_stats()
+    })
+
+
 # ========== API Routes - Progress Tracking ==========
 
 @app.route('/api/progress', methods=['GET'])
 def get_progress():
-    """Get user progress"""
-    success, result = Progress.get_progress()
+    """Get the progress of the requesting learner"""
+    learner_id, new_learner = _learner_id()
+    success, result = Progress.get_progress(learner_id)
     
     if success:
-        # Parse JSON fields
-        if result.get('beginner_answers'):
-            try:
-                result['beginner_answers'] = json.loads(result['beginner_answers'])
-            except:
-                result['beginner_answers'] = {}
-        
-        if result.get('intermediate_answers'):
-            try:
-                result['intermediate_answers'] = json.loads(result['intermediate_answers'])
-            except:
-                result['intermediate_answers'] = {}
-        
-        if result.get('advanced_answers'):
-            try:
-                result['advanced_answers'] = json.loads(result['advanced_answers'])
-            except:
-                result['advanced_answers'] = {}
-        
-        return jsonify({
+        return _with_learner_cookie(jsonify({
             'success': True,
             'progress': result
-        })
+        }), learner_id, new_learner)
     return jsonify({
         'success': False,
         'error': result
@@ -297,30 +805,143 @@ def get_progress():
 
 @app.route('/api/progress', methods=['POST'])
 def save_progress():
-    """Save user progress"""
+    """Save the progress of the requesting learner (only the fields sent)"""
     data = request.json
-    success, result = Progress.update_progress(data)
+    if not isinstance(data, dict):
+        return jsonify({
+            'success': False,
+            'error': 'Expected a JSON object of progress fields'
+        }), 400
+    
+    learner_id, new_learner = _learner_id()
+    success, result = Progress.update_progress(learner_id, data)
     
     if success:
-        return jsonify({
+        return _with_learner_cookie(jsonify({
             'success': True,
+            'learner_id': learner_id,
+            # Buffered saves reach the database within PROGRESS_FLUSH_INTERVAL
+            'buffered': result.get('buffered', False),
             'message': 'Progress saved successfully'
-        })
+        }), learner_id, new_learner)
     return jsonify({
         'success': False,
         'error': result
     }), 400
 
 
+@app.route('/api/progress/answers', methods=['GET'])
+def get_answers():
+    """Get the requesting learner's latest answer to each question (?level= for one level)"""
+    level = request.args.get('level')
+    if level is not None and level not in Progress.LEVELS:
+        return jsonify({
+            'success': False,
+            'error': f"level must be one of: {', '.join(Progress.LEVELS)}"
+        }), 400
+    
+    learner_id, new_learner = _learner_id()
+    success, result = Progress.get_answers(learner_id, level)
+    
+    if success:
+        return _with_learner_cookie(jsonify({
+            'success': True,
+            'answers': result
+        }), learner_id, new_learner)
+    return jsonify({
+        'success': False,
+        'error': result
+    }), 500
+
+
+@app.route('/api/progress/answers', methods=['PATCH'])
+def record_answer():
+    """
+    Record the requesting learner's answer to one question
+    
+    Body: {"level", "question_id", "answer", "correct"}. Replaces the
+    previous answer to the question and returns the level's new score.
+    """
+    data = request.json
+    if not isinstance(data, dict):
+        return jsonify({
+            'success': False,
+            'error': 'Expected a JSON object with level, question_id, answer and correct'
+        }), 400
+    
+    level = data.get('level')
+    question_id = data.get('question_id')
+    correct = data.get('correct', False)
+    if level not in Progress.LEVELS:
+        error = f"level must be one of: {', '.join(Progress.LEVELS)}"
+    elif not isinstance(question_id, int) or isinstance(question_id, bool):
+        error = 'question_id must be an integer'
+    elif not isinstance(correct, bool):
+        error = 'correct must be true or false'
+    else:
+        error = None
+    if error:
+        return jsonify({
+            'success': False,
+            'error': error
+        }), 400
+    
+    learner_id, new_learner = _learner_id()
+    success, result = Progress.record_answer(learner_id, level, question_id, data.get('answer'), correct)
+    
+    if success:
+        return _with_learner_cookie(jsonify({
+            'success': True,
+            'learner_id': learner_id,
+            'level': level,
+            'question_id': question_id,
+            'score': result['score']
+        }), learner_id, new_learner)
+    return jsonify({
+        'success': False,
+        'error': result
+    }), 500
+
+
 @app.route('/api/progress/reset', methods=['POST'])
 def reset_progress():
-    """Reset user progress"""
-    success, result = Progress.reset_progress()
+    """Reset the progress of the requesting learner"""
+    learner_id, new_learner = _learner_id()
+    success, result = Progress.reset_progress(learner_id)
     
-    return jsonify({
+    return _with_learner_cookie(jsonify({
         'success': success,
         'message': 'Progress reset successfully' if success else result
-    })
+    }), learner_id, new_learner)
+
+
+def _learner_id():
+    """
+    Get the learner id of the request
+    
+    Taken from the X-Learner-ID header, else the learner cookie. A new id
+    is made up when neither holds a valid one.
+    
+    Returns:
+        tuple: (learner_id, is_new)
+    """
+    learner_id = request.headers.get('X-Learner-ID') or request.cookies.get(Config.LEARNER_COOKIE)
+    if learner_id and _LEARNER_ID_PATTERN.match(learner_id):
+        return learner_id, False
+    return secrets.token_urlsafe(16), True
+
+
+def _with_learner_cookie(response, learner_id, new_learner):
+    """Remember a newly assigned learner id in the browser"""
+    if new_learner:
+        response.set_cookie(
+            Config.LEARNER_COOKIE,
+            learner_id,
+            max_age=Config.LEARNER_COOKIE_MAX_AGE,
+            httponly=True,
+            samesite='Lax'
+        )
+    return response
 
 
 # ========== API Routes - Certificates ==========
@@ -365,14 +986,9 @@ def get_certificate(certificate_id):
     success, result = Certificate.get_by_id(certificate_id)
     
     if success and result:
-        certificate = result[0]
-        # Convert date objects to strings
-        if hasattr(certificate.get('issue_date'), 'isoformat'):
-            certificate['issue_date'] = certificate['issue_date'].isoformat()
-        
         return jsonify({
             'success': True,
-            'certificate': certificate
+            'certificate': result[0]
         })
     return jsonify({
         'success': False,
@@ -380,22 +996,136 @@ def get_certificate(certificate_id):
     }), 404
 
 
+@app.route('/api/certificate/<certificate_id>/pdf', methods=['GET'])
+def get_certificate_pdf(certificate_id):
+    """Download a certificate as a PDF (?download=1 for an attachment)"""
+    success, rows = Certificate.get_by_id(certificate_id)
+    if not success:
+        return jsonify({
+            'success': False,
+            'error': rows
+        }), 500
+    if not rows:
+        return jsonify({
+            'success': False,
+            'error': 'Certificate not found'
+        }), 404
+    
+    # Issued certificates never change: only a deleted one loses its PDF
+    etag = Certificate.pdf_etag(certificate_id)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    
+    success, result = Certificate.get_pdf(rows[0])
+    if not success:
+        return jsonify({
+            'success': False,
+            'error': result
+        }), 500
+    
+    disposition = 'attachment' if request.args.get('download', '').lower() in ('1', 'true', 'yes') else 'inline'
+    response = Response(result, mimetype=PDF_MIMETYPE)
+    response.headers['Content-Disposition'] = f'{disposition}; filename="certificate-{certificate_id}.pdf"'
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, max-age=86400'
+    return response
+
+
+@app.route('/api/certificates/archive', methods=['POST'])
+def get_certificate_archive():
+    """
+    Download a cohort's certificates as one ZIP of PDFs
+    
+    Body: {"certificate_ids": [...]} or the from, to and name filters of
+    /api/certificates.
+    """
+    data = request.json
+    if not isinstance(data, dict):
+        return jsonify({
+            'success': False,
+            'error': 'Expected a JSON object with certificate_ids or from, to and name filters'
+        }), 400
+    
+    certificate_ids = data.get('certificate_ids')
+    filters = {}
+    if certificate_ids is not None:
+        if not isinstance(certificate_ids, list) or not certificate_ids or \
+                not all(isinstance(value, str) for value in certificate_ids):
+            return jsonify({
+                'success': False,
+                'error': 'certificate_ids must be a non-empty list of certificate ids'
+            }), 400
+    else:
+        filters['name_prefix'] = data.get('name') or None
+        for param, name in (('from', 'date_from'), ('to', 'date_to')):
+            try:
+                filters[name] = date.fromisoformat(data[param]) if data.get(param) else None
+            except (TypeError, ValueError):
+                return jsonify({
+                    'success': False,
+                    'error': f"{param} must be a date (YYYY-MM-DD)"
+                }), 400
+    
+    success, result = Certificate.get_archive(certificate_ids, **filters)
+    
+    if success:
+        response = Response(result, mimetype='application/zip')
+        response.headers['Content-Disposition'] = 'attachment; filename="certificates.zip"'
+        return response
+    return jsonify({
+        'success': False,
+        'error': result
+    }), 400
+
+
 @app.route('/api/certificates', methods=['GET'])
 def get_all_certificates():
-    """Get all certificates"""
-    success, result = Certificate.get_all()
+    """
+    Get certificates, newest first, one page at a time
+    
+    Query parameters:
+        limit: Page size (default CERTIFICATE_PAGE_SIZE)
+        cursor: next_cursor from a previous page
+        from, to: Creation date range (YYYY-MM-DD, inclusive)
+        name: Student name prefix
+    """
+    filters, error = _certificate_filters()
+    if error:
+        return error
+    
+    success, result = Certificate.search(
+        limit=request.args.get('limit', type=int),
+        cursor=request.args.get('cursor') or None,
+        **filters
+    )
+    
+    if success:
+        return jsonify({
+            'success': True,
+            'certificates': result['certificates'],
+            'next_cursor': result['next_cursor']
+        })
+    return jsonify({
+        'success': False,
+        'error': result
+    }), 400 if result == "Invalid cursor" else 500
+
+
+@app.route('/api/certificates/count', methods=['GET'])
+def count_certificates():
+    """Count certificates (same from, to and name filters as /api/certificates)"""
+    filters, error = _certificate_filters()
+    if error:
+        return error
+    
+    success, result = Certificate.count(**filters)
     
     if success:
-        # Convert date objects to strings
-        for cert in result:
-            if hasattr(cert.get('issue_date'), 'isoformat'):
-                cert['issue_date'] = cert['issue_date'].isoformat()
-            if hasattr(cert.get('created_at'), 'isoformat'):
-                cert['created_at'] = cert['created_at'].isoformat()
-        
         return jsonify({
             'success': True,
-            'certificates': result
+            'total': result
         })
     return jsonify({
         'success': False,
@@ -403,11 +1133,40 @@ def get_all_certificates():
     }), 500
 
 
+def _certificate_filters():
+    """
+    Read the certificate search filters of the request
+    
+    Returns:
+        tuple: (filters for Certificate.search/count, error response or None)
+    """
+    filters = {'name_prefix': request.args.get('name') or None}
+    for param, name in (('from', 'date_from'), ('to', 'date_to')):
+        value = request.args.get(param)
+        try:
+            filters[name] = date.fromisoformat(value) if value else None
+        except ValueError:
+            return None, (jsonify({
+                'success': False,
+                'error': f"{param} must be a date (YYYY-MM-DD)"
+            }), 400)
+    return filters, None
+
+
 # ========== API Routes - Module Operations ==========
 
 @app.route('/api/execute-query', methods=['POST'])
 def execute_query():
-    """Execute a custom SQL query (for Studio demonstrations)"""
+    """
+    Execute a custom SQL query (for Studio demonstrations)
+    
+    Query parameters:
+        format: 'columnar' for column arrays, 'msgpack' for the same as MessagePack
+    """
+    result_format, error = _result_format()
+    if error:
+        return error
+    
     data = request.json
     query = data.get('query', '')
     params = data.get('params', [])
@@ -420,25 +1179,59 @@ def execute_query():
             'error': 'Only SELECT queries are allowed through this endpoint'
         }), 400
     
-    success, result = Database.execute_query(query, tuple(params) if params else None)
+    # Limits may only be tightened below the Config.QUERY_* defaults
+    limits = {}
+    for key in ('timeout_ms', 'max_rows'):
+        value = data.get(key)
+        if value is not None:
+            if not isinstance(value, int) or isinstance(value, bool) or value <= 0:
+                return jsonify({
+                    'success': False,
+                    'error': f"'{key}' must be a positive integer"
+                }), 400
+            limits[key] = value
+    
+    # Clients may choose the query_id so they can cancel while the request runs
+    success, result = Database.execute_governed_query(
+        query,
+        tuple(params) if params else None,
+        query_id=data.get('query_id'),
+        as_columns=result_format != 'json',
+        **limits
+    )
     
     if success:
-        # Convert date objects to strings
-        for record in result:
-            for key, value in record.items():
-                if hasattr(value, 'isoformat'):
-                    record[key] = value.isoformat()
-        
-        return jsonify({
+        return _format_response({
             'success': True,
-            'data': result
-        })
+            'format': result_format,
+            **result
+        }, result_format)
     return jsonify({
         'success': False,
         'error': result
     }), 400
 
 
+@app.route('/api/execute-query/<query_id>/cancel', methods=['POST'])
+def cancel_query(query_id):
+    """Cancel a running Studio query"""
+    success, message = Database.cancel_query(query_id)
+    
+    return jsonify({
+        'success': success,
+        'message': message
+    }), 200 if success else 404
+
+
+@app.route('/api/execute-query/running', methods=['GET'])
+def get_running_queries():
+    """List running Studio queries and governor counters"""
+    return jsonify({
+        'success': True,
+        'governor': Database.get_governor_stats()
+    })
+
+
 # ========== Error Handlers ==========
 
 @app.errorhandler(404)
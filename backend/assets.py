@@ -0,0 +1,186 @@
+"""
+Page and Static Asset Cache
+
+This module loads the HTML pages and static files into memory once,
+compresses each text asset once (gzip, plus brotli when the optional
+brotli package is installed) and serves them with strong ETags. Pages
+reference static files through content-hashed URLs, which are served with
+a one-year immutable Cache-Control; editing a file changes its URL. In
+development the files can be re-read when they change on disk.
+"""
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import re
+import threading
+import time
+
+from flask import Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Types worth compressing
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+# Smaller files gain little and cost a Vary lookup
+MIN_COMPRESS_BYTES = 1024
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+# "/static/..." references inside pages
+_STATIC_REFERENCE = re.compile(r'(["\'])/static/([^"\'?#]+)\1')
+
+
+class Asset:
+    """One file held in memory with its compressed variants"""
+    
+    def __init__(self, body, content_type, mtime):
+        self.content_type = content_type
+        self.mtime = mtime
+        self.digest = hashlib.sha256(body).hexdigest()
+        # {encoding: (body, unquoted etag)}; None is the identity encoding
+        self.variants = {None: (body, self.digest[:32])}
+        
+        if content_type.startswith(COMPRESSIBLE_TYPES) and len(body) >= MIN_COMPRESS_BYTES:
+            compressed = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(compressed) < len(body):
+                self.variants['gzip'] = (compressed, f'{self.digest[:32]}-gz')
+            if brotli is not None:
+                compressed = brotli.compress(body, quality=11)
+                if len(compressed) < len(body):
+                    self.variants['br'] = (compressed, f'{self.digest[:32]}-br')
+    
+    def response(self, request, cache_control):
+        """Build a 200 or 304 response for a request"""
+        encoding = self._choose_encoding(request.headers.get('Accept-Encoding', ''))
+        body, etag = self.variants[encoding]
+        
+        # Parsed header: a weak or longer tag that contains ours is no match
+        if etag in request.if_none_match:
+            response = Response(status=304)
+        else:
+            response = Response(body, content_type=self.content_type)
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = cache_control
+        if len(self.variants) > 1:
+            response.headers['Vary'] = 'Accept-Encoding'
+        return response
+    
+    def _choose_encoding(self, accept_encoding):
+        """Pick the smallest variant the client accepts"""
+        accepted = {part.split(';')[0].strip().lower() for part in accept_encoding.split(',')}
+        for encoding in ('br', 'gzip'):
+            if encoding in self.variants and encoding in accepted:
+                return encoding
+        return None
+
+
+class AssetStore:
+    """In-memory pages and static files with content-hashed static URLs"""
+    
+    def __init__(self, pages_dir, static_dir, reload_interval=1.0):
+        """
+        Args:
+            pages_dir: Directory with the HTML pages
+            static_dir: Directory served under /static
+            reload_interval: Minimum seconds between checks for changed files
+        """
+        self.pages_dir = pages_dir
+        self.static_dir = static_dir
+        self.reload_interval = reload_interval
+        self._pages = {}
+        self._static = {}
+        self._hashed = {}
+        self._urls = {}
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self.load()
+    
+    def load(self):
+        """Read every page and static file from disk"""
+        static = {}
+        hashed = {}
+        urls = {}
+        for path in sorted(self.static_dir.rglob('*')):
+            if not path.is_file():
+                continue
+            relative = path.relative_to(self.static_dir).as_posix()
+            asset = Asset(path.read_bytes(), self._content_type(path), path.stat().st_mtime)
+            static[relative] = asset
+            stem, dot, suffix = relative.rpartition('.')
+            hashed_name = f"{stem}.{asset.digest[:10]}.{suffix}" if dot else f"{relative}.{asset.digest[:10]}"
+            hashed[hashed_name] = asset
+            urls[relative] = f"/static/{hashed_name}"
+        
+        pages = {}
+        for path in sorted(self.pages_dir.glob('*.html')):
+            html = path.read_text(encoding='utf-8')
+            html = _STATIC_REFERENCE.sub(
+                lambda match: f"{match.group(1)}{urls.get(match.group(2), '/static/' + match.group(2))}{match.group(1)}",
+                html
+            )
+            pages[path.stem] = Asset(html.encode('utf-8'), 'text/html; charset=utf-8', path.stat().st_mtime)
+        
+        with self._lock:
+            self._static, self._hashed, self._urls, self._pages = static, hashed, urls, pages
+            self._checked_at = time.monotonic()
+        logger.info(f"Loaded {len(pages)} pages and {len(static)} static files into memory")
+    
+    def reload_if_changed(self):
+        """Reload everything if a file was added, removed or modified (throttled)"""
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return False
+        self._checked_at = now
+        
+        current = {}
+        for path in self.static_dir.rglob('*'):
+            if path.is_file():
+                current[('static', path.relative_to(self.static_dir).as_posix())] = path.stat().st_mtime
+        for path in self.pages_dir.glob('*.html'):
+            current[('page', path.stem)] = path.stat().st_mtime
+        
+        with self._lock:
+            known = {('static', name): asset.mtime for name, asset in self._static.items()}
+            known.update({('page', name): asset.mtime for name, asset in self._pages.items()})
+        if current == known:
+            return False
+        self.load()
+        return True
+    
+    def page_response(self, name, request):
+        """Serve a page; None if it does not exist"""
+        asset = self._pages.get(name)
+        if asset is None:
+            return None
+        return asset.response(request, REVALIDATE_CACHE_CONTROL)
+    
+    def static_response(self, filename, request):
+        """Serve a static file by hashed or plain path; None if it does not exist"""
+        asset = self._hashed.get(filename)
+        if asset is not None:
+            return asset.response(request, IMMUTABLE_CACHE_CONTROL)
+        asset = self._static.get(filename)
+        if asset is None:
+            return None
+        return asset.response(request, REVALIDATE_CACHE_CONTROL)
+    
+    def url_for(self, filename):
+        """Get the content-hashed URL of a static file"""
+        return self._urls.get(filename, f"/static/{filename}")
+    
+    @staticmethod
+    def _content_type(path):
+        content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type == 'application/javascript':
+            content_type += '; charset=utf-8'
+        return content_type
@@ -0,0 +1,202 @@
+"""
+Query Result Cache
+
+This module provides a read-through LRU/TTL cache for SELECT results.
+Every entry remembers the version of each table it reads; the write paths
+in Database bump those versions, so a stale entry is never served.
+"""
+
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Queries whose result changes without any table being written
+_VOLATILE_PATTERN = re.compile(
+    r'\b(NOW|SYSDATE|CURDATE|CURTIME|CURRENT_DATE|CURRENT_TIME|CURRENT_TIMESTAMP|'
+    r'UNIX_TIMESTAMP|UTC_DATE|UTC_TIME|UTC_TIMESTAMP|RAND|UUID|UUID_SHORT|'
+    r'CONNECTION_ID|LAST_INSERT_ID|FOUND_ROWS|ROW_COUNT|SLEEP|GET_LOCK)\b|'
+    r'\bFOR\s+UPDATE\b|\bLOCK\s+IN\s+SHARE\s+MODE\b|\bFOR\s+SHARE\b|'
+    r'\binformation_schema\b|\bperformance_schema\b|@',
+    re.IGNORECASE
+)
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_IDENTIFIER_PATTERN = re.compile(r'`?(\w+)`?')
+
+
+def normalize_query(query):
+    """Collapse whitespace and trailing semicolons so equivalent queries share a key"""
+    return _WHITESPACE_PATTERN.sub(' ', query).strip().rstrip(';').strip()
+
+
+def is_cacheable(query):
+    """Check whether a query is a deterministic read"""
+    words = query.strip().split(None, 1)
+    if not words or words[0].upper() not in ('SELECT', 'WITH'):
+        return False
+    return _VOLATILE_PATTERN.search(query) is None
+
+
+def referenced_tables(query, table_names):
+    """
+    Get the known tables a query may touch
+    
+    Every identifier in the query is matched against the table list. This
+    over-approximates (a column named like a table also matches), which only
+    costs an extra invalidation and never serves stale data.
+    """
+    known = set(table_names)
+    return sorted({name for name in _IDENTIFIER_PATTERN.findall(query) if name in known})
+
+
+def estimate_size(rows):
+    """Roughly estimate the memory held by a result set (dict, tuple or columnar rows) in bytes"""
+    if rows is None:
+        return 64
+    if isinstance(rows, dict):
+        rows = [rows]
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row)
+        if isinstance(row, dict):
+            values = row.values()
+        elif isinstance(row, (list, tuple)):
+            values = row
+        else:
+            continue
+        for value in values:
+            # Columnar results hold a list of values per column
+            size += estimate_size(value) if isinstance(value, list) else sys.getsizeof(value)
+    return size
+
+
+class ResultCache:
+    """Thread-safe LRU cache with a TTL, an entry limit and a memory cap"""
+    
+    def __init__(self, max_entries=1024, max_bytes=32 * 1024 * 1024, ttl=60):
+        """
+        Args:
+            max_entries: Maximum number of cached results
+            max_bytes: Approximate memory cap for all cached results
+            ttl: Seconds an entry may be served (0 disables expiry)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'stale': 0,
+            'expired': 0,
+            'evictions': 0,
+            'stores': 0,
+            'rejected': 0
+        }
+    
+    @staticmethod
+    def make_key(query, params=None, mode=None):
+        """Build the cache key for a query, its parameters and the fetch mode"""
+        return (normalize_query(query), repr(params), mode)
+    
+    def get(self, key, current_versions):
+        """
+        Look up a cached result
+        
+        Args:
+            key: Key built by make_key
+            current_versions: Callable returning {table: version} for a list of tables
+        
+        Returns:
+            tuple: (hit, rows)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return False, None
+            
+            if self.ttl and time.monotonic() - entry['stored_at'] > self.ttl:
+                self._remove(key)
+                self._stats['expired'] += 1
+                self._stats['misses'] += 1
+                return False, None
+            
+            if current_versions(entry['tables']) != entry['versions']:
+                self._remove(key)
+                self._stats['stale'] += 1
+                self._stats['misses'] += 1
+                return False, None
+            
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            rows = entry['rows']
+        
+        # Callers may mutate what they get back, so hand out copies
+        if isinstance(rows, list):
+            return True, [dict(row) for row in rows]
+        if isinstance(rows, dict):
+            return True, dict(rows)
+        return True, rows
+    
+    def put(self, key, rows, tables, versions):
+        """
+        Store a result read while the tables had the given versions
+        
+        Args:
+            key: Key built by make_key
+            rows: Result rows (list of dicts, dict or None)
+            tables: Tables the query reads
+            versions: {table: version} taken before the query ran
+        """
+        size = estimate_size(rows)
+        with self._lock:
+            if size > self.max_bytes:
+                self._stats['rejected'] += 1
+                return
+            
+            if key in self._entries:
+                self._remove(key)
+            
+            self._entries[key] = {
+                'rows': [dict(row) for row in rows] if isinstance(rows, list) else rows,
+                'tables': tables,
+                'versions': versions,
+                'size': size,
+                'stored_at': time.monotonic()
+            }
+            self._bytes += size
+            self._stats['stores'] += 1
+            
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats['evictions'] += 1
+    
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def stats(self):
+        """Get hit/miss/eviction counters and current usage"""
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                **self._stats,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'hit_rate': round(self._stats['hits'] / lookups, 4) if lookups else 0.0
+            }
+    
+    def _remove(self, key):
+        """Remove an entry (caller holds the lock)"""
+        entry = self._entries.pop(key)
+        self._bytes -= entry['size']
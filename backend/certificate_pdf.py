@@ -0,0 +1,291 @@
+"""
+Certificate PDF Rendering
+
+This module renders certificates as PDF files with reportlab. Rendering
+is CPU-bound, so it runs in a small pool of worker processes and request
+threads only wait for the result. Issued certificates never change, so
+every PDF is cached on disk and in a bounded in-memory LRU, keyed by the
+certificate id and TEMPLATE_VERSION; bump the version when the layout
+changes and old files are simply never read again. Concurrent requests
+for a certificate that is being rendered share that one render.
+"""
+
+import io
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.pdfgen import canvas
+
+logger = logging.getLogger(__name__)
+
+# Part of every cache key; bump when render_pdf draws something different
+TEMPLATE_VERSION = 1
+
+PDF_MIMETYPE = 'application/pdf'
+
+
+def render_pdf(certificate):
+    """
+    Draw one certificate (runs in a worker process)
+    
+    Args:
+        certificate: Row of the certificates table
+    
+    Returns:
+        bytes: The PDF document
+    """
+    buffer = io.BytesIO()
+    width, height = landscape(A4)
+    # invariant: identical certificates give identical bytes (no timestamps or random ids)
+    pdf = canvas.Canvas(buffer, pagesize=(width, height), invariant=1)
+    pdf.setTitle(f"EduDB Certificate {certificate['certificate_id']}")
+    
+    pdf.setStrokeColor(colors.HexColor('#1e40af'))
+    pdf.setLineWidth(4)
+    pdf.rect(30, 30, width - 60, height - 60)
+    pdf.setLineWidth(1)
+    pdf.rect(40, 40, width - 80, height - 80)
+    
+    pdf.setFillColor(colors.HexColor('#1e40af'))
+    pdf.setFont('Helvetica-Bold', 36)
+    pdf.drawCentredString(width / 2, height - 130, 'Certificate of Completion')
+    
+    pdf.setFillColor(colors.black)
+    pdf.setFont('Helvetica', 16)
+    pdf.drawCentredString(width / 2, height - 180, 'This certifies that')
+    pdf.setFont('Helvetica-Bold', 30)
+    pdf.drawCentredString(width / 2, height - 230, str(certificate['student_name']))
+    pdf.setFont('Helvetica', 16)
+    pdf.drawCentredString(width / 2, height - 270, 'has completed the EduDB SQL course')
+    
+    pdf.setFont('Helvetica', 13)
+    scores = (
+        f"Beginner {certificate['beginner_score']}/15    "
+        f"Intermediate {certificate['intermediate_score']}/15    "
+        f"Advanced {certificate['advanced_score']}/15"
+    )
+    pdf.drawCentredString(width / 2, height - 320, scores)
+    pdf.setFont('Helvetica-Bold', 14)
+    pdf.drawCentredString(width / 2, height - 345, f"Overall score: {certificate['overall_score']}%")
+    
+    pdf.setFont('Helvetica', 11)
+    pdf.drawString(70, 70, f"Issued: {certificate['issue_date']}")
+    pdf.drawRightString(width - 70, 70, f"Certificate ID: {certificate['certificate_id']}")
+    
+    pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+class CertificateRenderer:
+    """Process pool renderer with memory and disk caches"""
+    
+    def __init__(self, cache_dir, max_workers=2, max_bytes=32 * 1024 * 1024, timeout=30):
+        """
+        Args:
+            cache_dir: Directory rendered PDFs are kept in
+            max_workers: Rendering processes
+            max_bytes: Memory held by the in-memory LRU
+            timeout: Seconds to wait for one render
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_workers = max_workers
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._stats = {'memory_hits': 0, 'disk_hits': 0, 'renders': 0, 'shared_renders': 0, 'failures': 0}
+    
+    @staticmethod
+    def cache_key(certificate_id):
+        """Key of a certificate's PDF in both caches (also its ETag)"""
+        return f"{certificate_id}-v{TEMPLATE_VERSION}"
+    
+    def get(self, certificate):
+        """
+        Get a certificate's PDF, rendering it on a cache miss
+        
+        Returns:
+            tuple: (success, pdf_bytes or error_message)
+        """
+        return self.get_many([certificate])[certificate['certificate_id']]
+    
+    def get_many(self, certificates):
+        """
+        Get several certificates' PDFs, rendering the misses in parallel
+        
+        Returns:
+            dict: {certificate_id: (success, pdf_bytes or error_message)}
+        """
+        results = {}
+        futures = {}
+        for certificate in certificates:
+            certificate_id = certificate['certificate_id']
+            key = self.cache_key(certificate_id)
+            pdf = self._cached(key)
+            if pdf is not None:
+                results[certificate_id] = (True, pdf)
+            elif certificate_id not in futures:
+                futures[certificate_id] = self._render(key, certificate)
+        
+        if futures:
+            wait(futures.values(), timeout=self.timeout)
+            for certificate_id, future in futures.items():
+                if not future.done():
+                    results[certificate_id] = (False, f"Rendering did not finish within {self.timeout} s")
+                elif future.exception() is not None:
+                    results[certificate_id] = (False, f"Rendering failed: {future.exception()}")
+                else:
+                    results[certificate_id] = (True, future.result())
+        return results
+    
+    def archive(self, certificates):
+        """
+        Render certificates into one ZIP archive
+        
+        Returns:
+            tuple: (success, zip_bytes or error_message)
+        """
+        results = self.get_many(certificates)
+        errors = [f"{certificate_id}: {result}" for certificate_id, (success, result) in results.items() if not success]
+        if errors:
+            return False, '; '.join(errors)
+        
+        buffer = io.BytesIO()
+        # PDFs are already compressed
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as archive:
+            for certificate_id, (_, pdf) in results.items():
+                archive.writestr(f"{certificate_id}.pdf", pdf)
+        return True, buffer.getvalue()
+    
+    def stats(self):
+        """Get cache and render counters"""
+        with self._lock:
+            return {
+                **self._stats,
+                'template_version': TEMPLATE_VERSION,
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_bytes,
+                'max_bytes': self.max_bytes,
+                'rendering': len(self._inflight),
+                'max_workers': self.max_workers
+            }
+    
+    def shutdown(self):
+        """Stop the rendering processes"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _cached(self, key):
+        """Get a PDF from memory, else from disk (promoting it to memory)"""
+        with self._lock:
+            pdf = self._memory.get(key)
+            if pdf is not None:
+                self._memory.move_to_end(key)
+                self._stats['memory_hits'] += 1
+                return pdf
+        
+        try:
+            pdf = (self.cache_dir / f"{key}.pdf").read_bytes()
+        except OSError:
+            return None
+        with self._lock:
+            self._stats['disk_hits'] += 1
+        self._remember(key, pdf)
+        return pdf
+    
+    def _render(self, key, certificate):
+        """Start rendering a PDF, or join the render already running for it"""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self._stats['shared_renders'] += 1
+                return future
+            future = Future()
+            self._inflight[key] = future
+            self._stats['renders'] += 1
+            executor = self._get_executor()
+        
+        def finish(render):
+            try:
+                pdf = render.result()
+            except Exception as e:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                    self._stats['failures'] += 1
+                    if isinstance(e, BrokenProcessPool) and self._executor is executor:
+                        # A worker died; start a fresh pool on the next render
+                        self._executor = None
+                logger.error(f"Rendering certificate {certificate['certificate_id']} failed: {e}")
+                future.set_exception(e)
+                return
+            # Leave the render joinable until both caches have the PDF
+            self._store(key, pdf)
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_result(pdf)
+        
+        # Hand plain values to the worker process
+        values = {name: str(value) for name, value in certificate.items()}
+        try:
+            render = executor.submit(render_pdf, values)
+        except Exception as e:
+            render = Future()
+            render.set_exception(e)
+        render.add_done_callback(finish)
+        return future
+    
+    def _get_executor(self):
+        """Create the process pool on first use (call with the lock held)"""
+        if self._executor is None:
+            # spawn: forking a threaded server process can copy held locks
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._executor
+    
+    def _store(self, key, pdf):
+        """Keep a rendered PDF on disk and in memory"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so readers never see half a PDF
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as temp_file:
+                    temp_file.write(pdf)
+                os.replace(temp_path, self.cache_dir / f"{key}.pdf")
+            except OSError:
+                os.unlink(temp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Could not cache certificate PDF {key} on disk: {e}")
+        self._remember(key, pdf)
+    
+    def _remember(self, key, pdf):
+        """Put a PDF in the memory LRU, evicting the least recently used"""
+        if len(pdf) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous)
+            self._memory[key] = pdf
+            self._memory_bytes += len(pdf)
+            while self._memory_bytes > self.max_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
@@ -0,0 +1,132 @@
+"""
+Table Change Feed
+
+This module keeps the most recent writes made through EduDB in a bounded
+ring buffer so clients can follow a table instead of re-downloading it.
+Every event gets a sequence number; clients poll for the events after the
+last number they saw. Row-level events (insert, update, delete, upsert)
+carry the record id, the column it identifies the row by ('key', None when
+the table has no single-column key) and the written values; a 'reload'
+event means the table changed in a way that is not described row by row
+(a reset, an import, DDL) and should be fetched again. When a client falls
+further behind than the buffer reaches it is told to reload as well.
+
+Every process keeps its own feed with a random id, and sequence numbers of
+different feeds are not comparable. A client served by several worker
+processes therefore keeps one cursor per feed id, plus the time it loaded
+the table: a feed it has no cursor for yet sends the events published
+since that time.
+"""
+
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from itertools import islice
+
+# Table name of events that concern every table
+ALL_TABLES = '*'
+
+
+class ChangeFeed:
+    """Thread-safe ring buffer of change events"""
+    
+    def __init__(self, buffer_size=1000):
+        """
+        Args:
+            buffer_size: Number of recent events kept
+        """
+        self.feed_id = uuid.uuid4().hex[:12]
+        self._events = deque(maxlen=buffer_size)
+        # Publish time of each buffered event in epoch milliseconds
+        self._times = deque(maxlen=buffer_size)
+        # Publish time of the newest event that fell out of the buffer
+        self._dropped_time = 0
+        self._sequence = time.time_ns() // 1000
+        self._lock = threading.Lock()
+    
+    def publish(self, table, op, record_id=None, data=None, key=None):
+        """Add one event; returns its sequence number"""
+        return self.publish_many([(table, op, record_id, data, key)])
+    
+    def publish_many(self, changes):
+        """
+        Add several events with consecutive sequence numbers
+        
+        Args:
+            changes: [(table, op, record_id, data, key)]
+        
+        Returns:
+            int: Sequence number of the last event
+        """
+        now = datetime.now()
+        timestamp = now.isoformat(timespec='milliseconds')
+        published = int(now.timestamp() * 1000)
+        with self._lock:
+            for table, op, record_id, data, key in changes:
+                if len(self._events) == self._events.maxlen:
+                    self._dropped_time = self._times[0]
+                self._times.append(published)
+                self._sequence += 1
+                self._events.append({
+                    'seq': self._sequence,
+                    'table': table,
+                    'op': op,
+                    'id': record_id,
+                    'key': key,
+                    'data': data,
+                    'timestamp': timestamp
+                })
+            return self._sequence
+    
+    def position(self):
+        """Get the current cursor: {"feed", "next" (pass as seq later), "time"}"""
+        with self._lock:
+            return {'feed': self.feed_id, 'next': self._sequence, 'time': time.time_ns() // 1_000_000}
+    
+    def since(self, seq, tables=None, limit=None, feed_id=None, since_time=None):
+        """
+        Get the events after a sequence number
+        
+        Args:
+            seq: Last sequence number the client has seen (None for none)
+            tables: Only return events of these tables (and ALL_TABLES events)
+            limit: Maximum number of events returned
+            feed_id: Feed the sequence number came from; a different feed's
+                number is treated as None
+            since_time: Epoch milliseconds to send events from when there is
+                no sequence number of this feed (None: only re-position)
+        
+        Returns:
+            dict: {"events", "feed", "next" (pass as seq next time), "reload"
+                (True if events the client needs are no longer buffered)}
+        """
+        with self._lock:
+            latest = self._sequence
+            if feed_id is not None and feed_id != self.feed_id:
+                seq = None
+            if seq is None and since_time is None:
+                return {'events': [], 'feed': self.feed_id, 'next': latest, 'reload': False}
+            
+            if seq is None:
+                if self._dropped_time >= since_time:
+                    return {'events': [], 'feed': self.feed_id, 'next': latest, 'reload': True}
+                start = next(
+                    (index for index, published in enumerate(self._times) if published >= since_time),
+                    len(self._times)
+                )
+            else:
+                # Buffered sequence numbers are contiguous, ending at latest
+                oldest = latest - len(self._events) + 1
+                if seq < oldest - 1 or seq > latest:
+                    return {'events': [], 'feed': self.feed_id, 'next': latest, 'reload': True}
+                start = seq - oldest + 1
+            events = list(islice(self._events, start, None))
+        
+        if tables is not None:
+            events = [event for event in events if event['table'] in tables or event['table'] == ALL_TABLES]
+        if limit is not None and len(events) > limit:
+            events = events[:limit]
+            latest = events[-1]['seq']
+        return {'events': events, 'feed': self.feed_id, 'next': latest, 'reload': False}
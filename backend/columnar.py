@@ -0,0 +1,69 @@
+"""
+Columnar Results
+
+This module builds compact result sets for the table and query APIs. A
+columnar result lists the column names and MySQL types once and then one
+array of values per column, so wide or long results do not repeat every
+column name in every row. Results are built straight from a tuple cursor
+(its description and rows) without creating a dict per row, and can also
+be sent as MessagePack when the optional msgpack package is installed.
+"""
+
+from mysql.connector import FieldType
+
+from backend.json_provider import to_json_value
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Response formats accepted in ?format=
+FORMATS = ('json', 'columnar', 'msgpack')
+
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+
+def from_rows(description, rows):
+    """
+    Build a columnar result from a tuple cursor's output
+    
+    Args:
+        description: cursor.description of the statement
+        rows: Row tuples fetched from the cursor (not a dictionary cursor)
+    
+    Returns:
+        dict: {"columns", "types", "values"} with one value list per column
+    """
+    description = description or []
+    if rows:
+        values = [list(column) for column in zip(*rows)]
+    else:
+        values = [[] for _ in description]
+    return {
+        'columns': [column[0] for column in description],
+        'types': [FieldType.get_info(column[1]) for column in description],
+        'values': values
+    }
+
+
+def row_count(result):
+    """Get the number of rows in a columnar result"""
+    return len(result['values'][0]) if result['values'] else 0
+
+
+def head(result, count):
+    """Get a columnar result with only its first count rows"""
+    return {**result, 'values': [column[:count] for column in result['values']]}
+
+
+def column(result, name):
+    """Get the values of one column by name"""
+    return result['values'][result['columns'].index(name)]
+
+
+def packb(obj):
+    """Serialize to MessagePack bytes, converting MySQL values like the JSON provider"""
+    if msgpack is None:
+        raise RuntimeError("MessagePack responses need the msgpack package (pip install msgpack)")
+    return msgpack.packb(obj, default=to_json_value, use_bin_type=True)
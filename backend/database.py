@@ -6,28 +6,131 @@ and provides methods for executing queries and managing the database.
 """
 
 import mysql.connector
-from mysql.connector import Error, pooling
+from mysql.connector import Error
 from pathlib import Path
+import base64
+import functools
+import json
 import logging
+import os
+import re
+import threading
+import time
 from config.config import Config
+from backend.schema import SCHEMA_QUERY, SNAPSHOT_PREFIX, VERSION_TABLE, SchemaCatalog, is_ddl
+from backend.cache import ResultCache, estimate_size, is_cacheable, referenced_tables
+from backend.pool import ConnectionPool
+from backend import statements
+from backend.sql_script import ScriptRunner
+from backend.governor import ER_QUERY_TIMEOUT, QueryGovernor, add_time_limit
+from backend.profiler import QueryProfiler
+from backend import metrics
+from backend import columnar
+from backend.fanout import QueryExecutor
+from backend.changes import ALL_TABLES, ChangeFeed
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+class RowStream:
+    """
+    Iterator over an unbuffered cursor that yields rows in fetchmany chunks
+    
+    The connection stays checked out until the stream is exhausted or
+    closed; close() is safe to call at any point, including before the
+    first chunk is read.
+    """
+    
+    def __init__(self, connection, cursor, chunk_size):
+        self.connection = connection
+        self.cursor = cursor
+        self.chunk_size = chunk_size
+        self.columns = [column[0] for column in cursor.description or []]
+        self._exhausted = False
+        self._closed = False
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        if self._closed:
+            raise StopIteration
+        rows = self.cursor.fetchmany(self.chunk_size)
+        if not rows:
+            self._exhausted = True
+            self.close()
+            raise StopIteration
+        return rows
+    
+    def close(self):
+        """Release the cursor and return the connection to the pool"""
+        if self._closed:
+            return
+        self._closed = True
+        if not self._exhausted:
+            # Abandoned mid-result: dropping the connection is cheaper than draining it
+            self.connection.discard()
+            return
+        try:
+            self.cursor.close()
+        except Error as e:
+            logger.warning(f"Error closing row stream: {e}")
+        finally:
+            self.connection.close()
+
+
 class Database:
     """Database connection manager with connection pooling"""
     
     _pool = None
     
+    # Cached row counts: {table_name: {'total': int, 'exact': bool}}
+    _row_counts = {}
+    _row_counts_lock = threading.Lock()
+    
+    # Schema metadata catalog, loaded lazily and dropped on DDL
+    _schema = None
+    _schema_lock = threading.Lock()
+    
+    # Optional SELECT result cache and the per-table write versions that
+    # keep it fresh. '*' is bumped when the touched tables are unknown.
+    _result_cache = None
+    _table_versions = {'*': 0}
+    _table_versions_lock = threading.Lock()
+    # (pid, token) making in-process versions unique to this process
+    _version_epoch = None
+    # Whether the version triggers are in place (None until checked)
+    _version_triggers_ready = None
+    
+    # Tracks and kills ad-hoc Studio queries; created on first use
+    _governor = None
+    _governor_lock = threading.Lock()
+    
+    # Statement profiler; created when profiling is first turned on
+    _profiler = None
+    _profiler_lock = threading.Lock()
+    
+    # (pid, ChangeFeed) of recent writes for clients following tables;
+    # created per process so forked workers do not share a feed id
+    _changes = None
+    _changes_lock = threading.Lock()
+    
+    # Thread pool for parallel reads; created on first use
+    _executor = None
+    _executor_lock = threading.Lock()
+    
     @classmethod
     def initialize_pool(cls):
         """Initialize the connection pool - now with graceful handling if DB doesn't exist"""
         try:
             pool_config = Config.get_pool_config()
-            cls._pool = pooling.MySQLConnectionPool(**pool_config)
-            logger.info(f"Connection pool created successfully for database: {Config.DB_NAME}")
+            cls._pool = ConnectionPool(**pool_config)
+            logger.info(
+                f"Connection pool created successfully for database: {Config.DB_NAME} "
+                f"(min {pool_config['min_size']}, max {pool_config['max_size']})"
+            )
             return True
         except Error as e:
             logger.error(f"Error creating connection pool: {e}")
@@ -38,13 +141,33 @@ class Database:
     
     @classmethod
     def get_connection(cls):
-        """Get a connection from the pool"""
+        """Get a connection from the pool, waiting up to DB_POOL_TIMEOUT for one"""
         if cls._pool is None:
             success = cls.initialize_pool()
             if not success:
                 raise Error("Database not available. Please use Setup page to create the database.")
         return cls._pool.get_connection()
     
+    @classmethod
+    def close_pool(cls):
+        """Close idle pooled connections and drop the pool"""
+        pool, cls._pool = cls._pool, None
+        if pool is not None:
+            pool.close_all()
+        if cls._governor is not None:
+            cls._governor.close()
+        with cls._executor_lock:
+            executor, cls._executor = cls._executor, None
+        if executor is not None:
+            executor.shutdown()
+    
+    @classmethod
+    def get_pool_stats(cls):
+        """Get connection pool size, usage and checkout wait statistics"""
+        if cls._pool is None:
+            return {'initialized': False}
+        return {'initialized': True, **cls._pool.stats()}
+    
     @classmethod
     def test_connection(cls, host='localhost', user='root', password='', port=3306):
         """Test database connection with provided credentials"""
@@ -63,7 +186,8 @@ class Database:
         return False, "Unknown error occurred"
     
     @classmethod
-    def execute_query(cls, query, params=None, fetch_one=False, fetch_all=True):
+    def execute_query(cls, query, params=None, fetch_one=False, fetch_all=True, use_cache=True, prepared=None,
+                      as_columns=False, timeout_ms=None):
         """
         Execute a SQL query with parameters
         
@@ -72,39 +196,100 @@ class Database:
             params: Query parameters (tuple or dict)
             fetch_one: If True, fetch only one row
             fetch_all: If True, fetch all rows (default)
-            
+            use_cache: If False, bypass the result cache for this query
+            prepared: Use a cached server-side prepared statement (defaults to
+                Config.DB_PREPARED_STATEMENTS; needs tuple/list params)
+            as_columns: Return a SELECT as a columnar result ({"columns",
+                "types", "values"}) read from a tuple cursor
+            timeout_ms: Server-side execution time limit for a SELECT
+        
         Returns:
             tuple: (success, result/error_message)
         """
         connection = None
         cursor = None
         
+        if timeout_ms:
+            query = add_time_limit(query, timeout_ms)
+        
+        if prepared is None:
+            prepared = Config.DB_PREPARED_STATEMENTS
+        # Prepared cursors are dictionary cursors
+        prepared = prepared and not as_columns and statements.can_prepare(query, params)
+        
+        # Serve deterministic reads from the result cache when enabled
+        cache = cls._get_result_cache() if use_cache else None
+        cache_tables = cls._cacheable_tables(query) if cache else None
+        if cache_tables is not None:
+            cache_key = ResultCache.make_key(query, params, (fetch_one, fetch_all, as_columns))
+            hit, cached = cache.get(cache_key, cls._current_versions)
+            if hit:
+                return True, cached
+            # Snapshot versions before reading so a concurrent write makes the entry stale
+            cache_versions = cls._current_versions(cache_tables)
+        
+        profiler = cls._get_profiler()
+        started = None
+        
         try:
+            wait_started = time.monotonic()
             connection = cls.get_connection()
-            cursor = connection.cursor(dictionary=True)
+            pool_wait = time.monotonic() - wait_started
+            started = time.monotonic()
             
-            if params:
-                cursor.execute(query, params)
+            if prepared:
+                # Cached cursors belong to the connection and must stay open
+                statement_cursor = cls._get_statement_cache(connection).execute(query, params)
             else:
-                cursor.execute(query)
+                cursor = connection.cursor(dictionary=not as_columns)
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+                statement_cursor = cursor
             
             # For SELECT queries
             if query.strip().upper().startswith('SELECT') or query.strip().upper().startswith('SHOW'):
-                if fetch_one:
+                if prepared:
+                    # Always drain a prepared result so the statement can be re-executed
+                    rows = statement_cursor.fetchall()
+                    result = (rows[0] if rows else None) if fetch_one else (rows if fetch_all else None)
+                elif as_columns:
+                    result = columnar.from_rows(cursor.description, cursor.fetchall())
+                elif fetch_one:
                     result = cursor.fetchone()
                 elif fetch_all:
                     result = cursor.fetchall()
                 else:
                     result = None
+                cls._record_query(query, started)
+                if profiler:
+                    if as_columns:
+                        rows_returned = columnar.row_count(result)
+                    else:
+                        rows_returned = len(result) if isinstance(result, list) else int(result is not None)
+                    profiler.profile(connection, query, params, started, pool_wait, rows_returned)
+                if cache_tables is not None:
+                    cache.put(cache_key, result, cache_tables, cache_versions)
                 return True, result
             
-            # For INSERT, UPDATE, DELETE queries
+            # For INSERT, UPDATE, DELETE queries (profiled before the commit
+            # so the session's last statement is still this one)
+            cls._record_query(query, started)
+            if profiler:
+                profiler.profile(connection, query, params, started, pool_wait, statement_cursor.rowcount)
             connection.commit()
-            return True, {"affected_rows": cursor.rowcount, "last_id": cursor.lastrowid}
-            
+            cls._note_write(query)
+            return True, {"affected_rows": statement_cursor.rowcount, "last_id": statement_cursor.lastrowid}
+        
         except Error as e:
+            if started is not None:
+                cls._record_query(query, started, failed=True)
+            if profiler and started is not None:
+                profiler.profile(connection, query, params, started, pool_wait, None, error=str(e))
             if connection:
                 connection.rollback()
+                metrics.DB_ROLLBACKS.inc()
             # Check if it's a "database doesn't exist" error
             if 'Unknown database' in str(e) or e.errno == 1049:
                 logger.error(f"Database not available: {e}")
@@ -117,93 +302,1292 @@ class Database:
             if connection:
                 connection.close()
     
+    @staticmethod
+    def _record_query(query, started, failed=False):
+        """Count a statement and its latency for /metrics"""
+        operation = metrics.operation(query)
+        metrics.DB_QUERIES.inc(operation)
+        metrics.DB_QUERY_LATENCY.observe(time.monotonic() - started, operation)
+        if failed:
+            metrics.DB_QUERY_ERRORS.inc(operation)
+    
+    @classmethod
+    def collect_metrics(cls):
+        """Render pool, cache and prepared statement state for /metrics"""
+        lines = []
+        pool = cls.get_pool_stats()
+        if pool['initialized']:
+            label = f'pool="{pool["pool_name"]}"'
+            for name, key, help_text in (
+                ('edudb_db_pool_connections', 'size', 'Open pooled connections'),
+                ('edudb_db_pool_connections_in_use', 'in_use', 'Pooled connections checked out'),
+                ('edudb_db_pool_connections_idle', 'idle', 'Pooled connections idle'),
+                ('edudb_db_pool_waiting', 'waiting', 'Callers waiting for a connection'),
+                ('edudb_db_pool_max_connections', 'max_size', 'Pool size limit')
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name}{{{label}}} {pool[key]}"]
+            for name, key, help_text in (
+                ('edudb_db_pool_checkouts_total', 'checkouts', 'Connections checked out'),
+                ('edudb_db_pool_timeouts_total', 'timeouts', 'Checkouts that timed out'),
+                ('edudb_db_connections_created_total', 'created', 'Connections opened'),
+                ('edudb_db_connections_closed_total', 'closed', 'Connections closed'),
+                ('edudb_db_connections_recycled_total', 'recycled', 'Connections replaced for age'),
+                ('edudb_db_connection_ping_failures_total', 'ping_failures', 'Idle connections that failed a ping'),
+                ('edudb_db_connect_errors_total', 'connect_errors', 'Failed connection attempts')
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter", f"{name}{{{label}}} {pool[key]}"]
+            wait = pool['wait_seconds']
+            lines += metrics.render_histogram(
+                'edudb_db_pool_wait_seconds', 'Time spent waiting to check out a connection',
+                [(bucket['le'], bucket['count']) for bucket in wait['buckets']],
+                wait['sum'], wait['count'], label
+            )
+        
+        cache = cls.get_cache_stats()
+        if cache['enabled']:
+            for name, key in (('edudb_query_cache_hits_total', 'hits'),
+                              ('edudb_query_cache_misses_total', 'misses')):
+                lines += [f"# HELP {name} Result cache {key}", f"# TYPE {name} counter", f"{name} {cache[key]}"]
+        
+        prepared = cls.get_statement_stats()
+        if prepared['enabled']:
+            for name, key in (('edudb_prepared_statement_hits_total', 'hits'),
+                              ('edudb_prepared_statement_misses_total', 'misses')):
+                lines += [f"# HELP {name} Prepared statement cache {key}", f"# TYPE {name} counter", f"{name} {prepared[key]}"]
+        return lines
+    
     @classmethod
-    def execute_many(cls, query, data_list):
-        """Execute a query with multiple data rows"""
+    def _get_governor(cls):
+        """Get the query governor, creating it on first use"""
+        if cls._governor is None:
+            with cls._governor_lock:
+                if cls._governor is None:
+                    cls._governor = QueryGovernor(Config.get_database_config(), Config.QUERY_KILL_GRACE)
+        return cls._governor
+    
+    @classmethod
+    def execute_governed_query(cls, query, params=None, query_id=None, timeout_ms=None, max_rows=None, max_bytes=None,
+                               as_columns=False):
+        """
+        Run an ad-hoc SELECT under time, row and byte limits
+        
+        The server stops the statement at timeout_ms (MAX_EXECUTION_TIME);
+        a watchdog kills it shortly after if the hint did not apply. Rows
+        are read unbuffered and reading stops at max_rows or max_bytes. A
+        query that was cut short is killed and its connection discarded, so
+        it never holds a pooled connection longer than the limits allow.
+        
+        Args:
+            query: SELECT statement
+            params: Query parameters
+            query_id: Client-chosen id for cancel_query (generated if omitted)
+            timeout_ms: Execution time limit (defaults to Config.QUERY_TIMEOUT_MS)
+            max_rows: Row cap (defaults to Config.QUERY_MAX_ROWS)
+            max_bytes: Approximate result size cap (defaults to Config.QUERY_MAX_BYTES)
+            as_columns: Return "data" as a columnar result instead of row dicts
+        
+        Returns:
+            tuple: (success, {"query_id", "data", "row_count", "truncated",
+                "truncated_reason", "elapsed_ms"} or error_message)
+        """
+        timeout_ms = min(timeout_ms or Config.QUERY_TIMEOUT_MS, Config.QUERY_TIMEOUT_MS)
+        max_rows = min(max_rows or Config.QUERY_MAX_ROWS, Config.QUERY_MAX_ROWS)
+        max_bytes = min(max_bytes or Config.QUERY_MAX_BYTES, Config.QUERY_MAX_BYTES)
+        governor = cls._get_governor()
+        profiler = cls._get_profiler()
+        
+        started = time.monotonic()
+        pool_wait = 0.0
         connection = None
         cursor = None
+        entry = None
+        description = None
+        rows = []
+        size = 0
+        truncated_reason = None
+        exhausted = False
         
         try:
             connection = cls.get_connection()
+            pool_wait = time.monotonic() - started
+            entry = governor.start(connection.connection_id, query, timeout_ms, query_id)
+            cursor = connection.cursor(dictionary=not as_columns)
+            cursor.execute(add_time_limit(query, timeout_ms), params)
+            description = cursor.description
+            
+            while truncated_reason is None:
+                # Ask for one row past the cap to know whether there is more
+                chunk = cursor.fetchmany(min(500, max_rows + 1 - len(rows)))
+                if not chunk:
+                    exhausted = True
+                    break
+                for row in chunk:
+                    if len(rows) >= max_rows:
+                        truncated_reason = 'rows'
+                        break
+                    size += estimate_size([row])
+                    if size > max_bytes:
+                        truncated_reason = 'bytes'
+                        break
+                    rows.append(row)
+            
+            cls._record_query(query, started + pool_wait)
+            if profiler:
+                profiler.profile(connection, query, params, started + pool_wait, pool_wait, len(rows))
+            if not exhausted:
+                # Stop the server from producing rows nobody will read
+                governor.kill(connection.connection_id)
+            governor.finish(entry, 'truncated' if truncated_reason else 'completed')
+        except ValueError as e:
+            return False, str(e)
+        except Error as e:
+            message = str(e)
+            outcome = 'failed'
+            if entry and entry['cancelled']:
+                outcome, message = 'cancelled', "Query cancelled"
+            elif e.errno == ER_QUERY_TIMEOUT or (entry and entry['timed_out']):
+                outcome, message = 'timed_out', f"Query exceeded the {timeout_ms} ms time limit"
+            elif e.errno == 1049:
+                message = "Database not available. Please use Setup page to create the database."
+            if entry:
+                governor.finish(entry, outcome)
+                cls._record_query(query, started + pool_wait, failed=True)
+                if profiler:
+                    profiler.profile(connection, query, params, started + pool_wait, pool_wait, len(rows), error=message)
+            logger.warning(f"Governed query {outcome}: {e}")
+            return False, message
+        finally:
+            if entry and not entry['finished']:
+                # Unexpected errors must not leave a kill pointed at the released connection
+                governor.finish(entry, 'failed')
+            if connection:
+                if exhausted or entry is None:
+                    if cursor:
+                        cursor.close()
+                    connection.close()
+                else:
+                    # Unread or interrupted results leave the session unusable
+                    connection.discard()
+        
+        return True, {
+            "query_id": entry['query_id'],
+            "data": columnar.from_rows(description, rows) if as_columns else rows,
+            "row_count": len(rows),
+            "truncated": truncated_reason is not None,
+            "truncated_reason": truncated_reason,
+            "elapsed_ms": int((time.monotonic() - started) * 1000)
+        }
+    
+    @classmethod
+    def _get_executor(cls):
+        """Get the parallel read executor, creating it on first use"""
+        if cls._executor is None:
+            with cls._executor_lock:
+                if cls._executor is None:
+                    # More workers than pooled connections would only queue in the pool
+                    cls._executor = QueryExecutor(min(Config.QUERY_FANOUT_WORKERS, Config.DB_POOL_MAX_SIZE))
+        return cls._executor
+    
+    @classmethod
+    def run_parallel(cls, tasks, timeout_ms=None):
+        """
+        Run independent read tasks at the same time on separate connections
+        
+        Args:
+            tasks: {name: callable returning (success, result)}
+            timeout_ms: How long to wait for the batch (defaults to
+                Config.QUERY_FANOUT_TIMEOUT_MS plus a second for the
+                server to stop statements at their own limit)
+        
+        Returns:
+            dict: {name: (success, result/error_message)}
+        """
+        timeout_ms = timeout_ms or Config.QUERY_FANOUT_TIMEOUT_MS + 1000
+        return cls._get_executor().run(tasks, timeout=timeout_ms / 1000)
+    
+    @classmethod
+    def execute_parallel(cls, queries, timeout_ms=None):
+        """
+        Execute several read queries in parallel
+        
+        Every SELECT runs with a MAX_EXECUTION_TIME hint of timeout_ms, so a
+        slow query is stopped by the server and frees its connection.
+        
+        Args:
+            queries: {name: query} or {name: {"query", "params", ...}} where
+                the extra keys are execute_query arguments
+            timeout_ms: Per-query time limit (defaults to Config.QUERY_FANOUT_TIMEOUT_MS)
+        
+        Returns:
+            dict: {name: (success, result/error_message)}
+        """
+        timeout_ms = timeout_ms or Config.QUERY_FANOUT_TIMEOUT_MS
+        tasks = {}
+        for name, spec in queries.items():
+            kwargs = dict(spec) if isinstance(spec, dict) else {'query': spec}
+            kwargs.setdefault('timeout_ms', timeout_ms)
+            tasks[name] = functools.partial(cls.execute_query, **kwargs)
+        return cls.run_parallel(tasks, timeout_ms + 1000)
+    
+    @classmethod
+    def get_executor_stats(cls):
+        """Get parallel read counters"""
+        if cls._executor is None:
+            return {'initialized': False}
+        return {'initialized': True, **cls._executor.stats()}
+    
+    @classmethod
+    def _get_profiler(cls, create=False):
+        """
+        Get the statement profiler if profiling is on
+        
+        Args:
+            create: Create the profiler even if Config.PROFILE_QUERIES is off
+        """
+        if cls._profiler is None:
+            if not (create or Config.PROFILE_QUERIES):
+                return None
+            with cls._profiler_lock:
+                if cls._profiler is None:
+                    cls._profiler = QueryProfiler(
+                        buffer_size=Config.PROFILE_BUFFER_SIZE,
+                        slow_ms=Config.PROFILE_SLOW_MS,
+                        explain=Config.PROFILE_EXPLAIN,
+                        log_file=Config.PROFILE_LOG_FILE
+                    )
+        if create or cls._profiler.enabled:
+            return cls._profiler
+        return None
+    
+    @classmethod
+    def set_profiling(cls, enabled, slow_ms=None):
+        """Turn statement profiling on or off at runtime"""
+        profiler = cls._get_profiler(create=True)
+        profiler.enabled = bool(enabled)
+        if slow_ms is not None:
+            profiler.slow_ms = slow_ms
+        logger.info(f"Query profiling {'enabled' if profiler.enabled else 'disabled'}")
+        return profiler.stats()
+    
+    @classmethod
+    def get_profile(cls, limit=100, min_ms=0, source=None):
+        """
+        Get recent statement profiles and the most expensive statements
+        
+        Returns:
+            dict: {"profiler", "summary", "entries"}
+        """
+        profiler = cls._profiler
+        if profiler is None:
+            return {'profiler': {'enabled': False}, 'summary': [], 'entries': []}
+        return {
+            'profiler': profiler.stats(),
+            'summary': profiler.summary(),
+            'entries': profiler.entries(limit, min_ms, source)
+        }
+    
+    @classmethod
+    def clear_profile(cls):
+        """Drop buffered statement profiles"""
+        if cls._profiler is not None:
+            cls._profiler.clear()
+    
+    @classmethod
+    def cancel_query(cls, query_id):
+        """
+        Cancel a query started by execute_governed_query
+        
+        Returns:
+            tuple: (success, message)
+        """
+        if cls._get_governor().cancel(query_id):
+            return True, f"Query '{query_id}' cancelled"
+        return False, f"Query '{query_id}' is not running"
+    
+    @classmethod
+    def get_governor_stats(cls):
+        """Get running governed queries and outcome counters"""
+        governor = cls._get_governor()
+        return {**governor.stats(), 'queries': governor.running()}
+    
+    @classmethod
+    def _get_statement_cache(cls, connection):
+        """Get the prepared statement cache of a pooled connection"""
+        cache = connection.attributes.get('statements')
+        if cache is None:
+            cache = statements.StatementCache(connection.raw_connection, Config.DB_STATEMENT_CACHE_SIZE)
+            connection.attributes['statements'] = cache
+        return cache
+    
+    @classmethod
+    def get_statement_stats(cls):
+        """Get prepared statement cache hit/miss statistics"""
+        return {'enabled': Config.DB_PREPARED_STATEMENTS, **statements.get_stats()}
+    
+    @classmethod
+    def stream_query(cls, query, params=None, chunk_size=None):
+        """
+        Execute a query and stream its rows instead of fetching them all
+        
+        The query runs on an unbuffered cursor, so rows are pulled from the
+        server chunk by chunk and memory stays flat regardless of result
+        size. The caller must exhaust or close the returned stream.
+        
+        Args:
+            query: SQL query string
+            params: Query parameters (tuple or dict)
+            chunk_size: Rows per fetchmany call (defaults to Config.EXPORT_CHUNK_SIZE)
+        
+        Returns:
+            tuple: (success, RowStream or error_message)
+        """
+        connection = None
+        cursor = None
+        
+        try:
+            connection = cls.get_connection()
+            cursor = connection.cursor(buffered=False)
+            started = time.monotonic()
+            cursor.execute(query, params)
+            cls._record_query(query, started)
+            return True, RowStream(connection, cursor, int(chunk_size or Config.EXPORT_CHUNK_SIZE))
+        except Error as e:
+            if cursor:
+                metrics.DB_QUERY_ERRORS.inc(metrics.operation(query))
+                try:
+                    cursor.close()
+                except Error:
+                    pass
+            if connection:
+                connection.close()
+            logger.error(f"Database stream error: {e}")
+            return False, str(e)
+    
+    @classmethod
+    def stream_table(cls, table_name, chunk_size=None):
+        """Stream every row of a table in primary key order"""
+        success, schema = cls._validate_table(table_name)
+        if not success:
+            return False, schema
+        
+        pk_columns = schema.primary_key(table_name)
+        order_clause = f" ORDER BY {', '.join(pk_columns)}" if pk_columns else ''
+        return cls.stream_query(f"SELECT * FROM {table_name}{order_clause}", chunk_size=chunk_size)
+    
+    @classmethod
+    def execute_many(cls, query, data_list, connection=None):
+        """
+        Execute a query with multiple data rows
+        
+        INSERT statements are sent as a single multi-row statement by the
+        connector. When a connection is passed in, the query joins the
+        caller's transaction: nothing is committed, rolled back or closed
+        here and the caller is responsible for invalidating caches.
+        
+        Args:
+            query: SQL query string with placeholders
+            data_list: Sequence of parameter tuples
+            connection: Optional connection with an open transaction
+        
+        Returns:
+            tuple: (success, {"affected_rows", "last_id"} or error_message)
+        """
+        owns_connection = connection is None
+        cursor = None
+        
+        try:
+            if owns_connection:
+                connection = cls.get_connection()
             cursor = connection.cursor()
+            started = time.monotonic()
             cursor.executemany(query, data_list)
-            connection.commit()
-            return True, {"affected_rows": cursor.rowcount}
+            cls._record_query(query, started)
+            if owns_connection:
+                connection.commit()
+                cls._note_write(query)
+            return True, {"affected_rows": cursor.rowcount, "last_id": cursor.lastrowid}
         except Error as e:
-            if connection:
+            if cursor:
+                metrics.DB_QUERY_ERRORS.inc(metrics.operation(query))
+            if connection and owns_connection:
                 connection.rollback()
+                metrics.DB_ROLLBACKS.inc()
             logger.error(f"Database executemany error: {e}")
             return False, str(e)
+        finally:
+            if cursor:
+                cursor.close()
+            if connection and owns_connection:
+                connection.close()
+    
+    @classmethod
+    def _get_result_cache(cls):
+        """Get the result cache, or None when it is disabled"""
+        if not Config.QUERY_CACHE_ENABLED:
+            return None
+        if cls._result_cache is None:
+            cls._result_cache = ResultCache(**Config.get_query_cache_config())
+        return cls._result_cache
+    
+    @classmethod
+    def _cacheable_tables(cls, query):
+        """Get the tables a cacheable read depends on, or None if it must not be cached"""
+        schema = cls._schema
+        if schema is None or not is_cacheable(query):
+            return None
+        return referenced_tables(query, schema.table_names())
+    
+    @classmethod
+    def _current_versions(cls, tables):
+        """Get the current write versions of the given tables"""
+        with cls._table_versions_lock:
+            versions = {table: cls._table_versions.get(table, 0) for table in tables}
+            versions['*'] = cls._table_versions['*']
+        return versions
+    
+    @classmethod
+    def bump_table_versions(cls, tables=None):
+        """
+        Record that tables were written so cached reads of them go stale
+        
+        Args:
+            tables: Table names, or None when any table may have changed
+        """
+        with cls._table_versions_lock:
+            if tables is None:
+                cls._table_versions['*'] += 1
+            else:
+                for table in tables:
+                    cls._table_versions[table] = cls._table_versions.get(table, 0) + 1
+        if tables is None and cls._result_cache is not None:
+            cls._result_cache.clear()
+        if tables is None and Config.TABLE_VERSION_TRIGGERS and cls._pool is not None:
+            # TRUNCATE and DDL do not fire the version triggers
+            cls._bump_stored_versions()
+    
+    @classmethod
+    def get_table_version(cls, table_name):
+        """
+        Get a stamp that changes whenever a table is written
+        
+        Without TABLE_VERSION_TRIGGERS the stamp comes from the in-process
+        write versions and costs no query. With it, the stamp is the
+        table's row in _table_versions (one primary key lookup), which also
+        counts writes from other processes.
+        
+        Returns:
+            tuple: (success, stamp or None if the table has no version yet)
+        """
+        success, schema = cls._validate_table(table_name)
+        if not success:
+            return False, schema
+        
+        if not Config.TABLE_VERSION_TRIGGERS:
+            with cls._table_versions_lock:
+                return True, (
+                    f"{cls._process_epoch()}.{cls._table_versions['*']}"
+                    f".{cls._table_versions.get(table_name, 0)}"
+                )
+        
+        if not cls._check_version_triggers():
+            # Stored versions would never change; serve without ETags
+            return True, None
+        
+        success, row = cls.execute_query(
+            f"SELECT version FROM {VERSION_TABLE} WHERE table_name = %s",
+            (table_name,),
+            fetch_one=True,
+            use_cache=False
+        )
+        if not success:
+            if VERSION_TABLE in row and "doesn't exist" in row:
+                # Databases created before the setting was turned on
+                cls.install_version_triggers()
+            return True, None
+        return True, str(row['version']) if row else None
+    
+    @classmethod
+    def _process_epoch(cls):
+        """Token that differs between processes, including forked workers"""
+        pid = os.getpid()
+        if cls._version_epoch is None or cls._version_epoch[0] != pid:
+            cls._version_epoch = (pid, f"{pid:x}{time.time_ns():x}")
+        return cls._version_epoch[1]
+    
+    @classmethod
+    def _change_feed(cls):
+        """This process's change feed, created on first use after a fork"""
+        pid = os.getpid()
+        changes = cls._changes
+        if changes is None or changes[0] != pid:
+            with cls._changes_lock:
+                if cls._changes is None or cls._changes[0] != pid:
+                    cls._changes = (pid, ChangeFeed(Config.CHANGE_FEED_SIZE))
+                changes = cls._changes
+        return changes[1]
+    
+    @classmethod
+    def _check_version_triggers(cls):
+        """Check once per process that every table has its version triggers, installing them if not"""
+        if cls._version_triggers_ready is None:
+            success, schema = cls.get_schema()
+            if not success:
+                return False
+            success, row = cls.execute_query(
+                "SELECT COUNT(*) AS triggers FROM information_schema.TRIGGERS "
+                "WHERE TRIGGER_SCHEMA = DATABASE() AND TRIGGER_NAME LIKE %s",
+                ('%\\_version',),
+                fetch_one=True,
+                use_cache=False
+            )
+            if success and row['triggers'] >= 3 * len(schema.table_names()):
+                cls._version_triggers_ready = True
+            else:
+                cls.install_version_triggers()
+        return cls._version_triggers_ready
+    
+    @classmethod
+    def install_version_triggers(cls):
+        """
+        Create _table_versions and the triggers that keep it current
+        
+        Every insert, update and delete on a catalog table bumps the table's
+        version row, so writes from other workers and from outside EduDB
+        change its ETag too. Versions start at the current time in
+        microseconds, so a re-created database never reuses old stamps.
+        
+        Returns:
+            tuple: (success, message)
+        """
+        success, schema = cls.get_schema()
+        if not success:
+            return False, schema
+        table_names = schema.table_names()
+        
+        connection = None
+        cursor = None
+        try:
+            connection = cls.get_connection()
+            # IF [NOT] EXISTS and INSERT IGNORE report notes for what already exists
+            connection.tolerate_warnings()
+            cursor = connection.cursor()
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {VERSION_TABLE} ("
+                f"table_name VARCHAR(64) NOT NULL PRIMARY KEY, "
+                f"version BIGINT UNSIGNED NOT NULL) ENGINE=InnoDB"
+            )
+            for table_name in table_names:
+                cursor.execute(
+                    f"INSERT IGNORE INTO {VERSION_TABLE} (table_name, version) "
+                    f"VALUES (%s, CAST(UNIX_TIMESTAMP(NOW(6)) * 1000000 AS UNSIGNED))",
+                    (table_name,)
+                )
+                for event in ('INSERT', 'UPDATE', 'DELETE'):
+                    trigger = f"{table_name}_{event.lower()}_version"
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+                    cursor.execute(
+                        f"CREATE TRIGGER {trigger} AFTER {event} ON {table_name} FOR EACH ROW "
+                        f"UPDATE {VERSION_TABLE} SET version = version + 1 WHERE table_name = '{table_name}'"
+                    )
+            connection.commit()
+        except Error as e:
+            cls._version_triggers_ready = False
+            logger.error(f"Could not install version triggers, table ETags are off: {e}")
+            return False, str(e)
         finally:
             if cursor:
                 cursor.close()
             if connection:
                 connection.close()
+        
+        cls._version_triggers_ready = True
+        logger.info(f"Version triggers installed on {len(table_names)} tables")
+        return True, f"Version triggers installed on {len(table_names)} tables"
     
     @classmethod
-    def get_all_tables(cls):
-        """Get list of all tables in the database"""
-        query = "SHOW TABLES"
-        success, result = cls.execute_query(query)
-        if success:
-            table_key = f'Tables_in_{Config.DB_NAME}'
-            return True, [row[table_key] for row in result]
-        return False, result
+    def _bump_stored_versions(cls):
+        """Bump every row of _table_versions"""
+        connection = None
+        cursor = None
+        try:
+            connection = cls.get_connection()
+            cursor = connection.cursor()
+            cursor.execute(f"UPDATE {VERSION_TABLE} SET version = version + 1")
+            connection.commit()
+        except Error as e:
+            logger.warning(f"Could not bump stored table versions: {e}")
+        finally:
+            if cursor:
+                cursor.close()
+            if connection:
+                connection.close()
+    
+    @classmethod
+    def _note_write(cls, query):
+        """Invalidate metadata, cached reads and cached row counts affected by a committed write"""
+        if is_ddl(query):
+            cls.invalidate_schema()
+            cls.bump_table_versions()
+            cls._invalidate_row_counts()
+            cls._change_feed().publish(ALL_TABLES, 'reload')
+            return
+        schema = cls._schema
+        if schema is None:
+            cls.bump_table_versions()
+            cls._invalidate_row_counts()
+        else:
+            tables = referenced_tables(query, schema.table_names())
+            cls.bump_table_versions(tables)
+            for table_name in tables:
+                cls._invalidate_row_counts(table_name)
+    
+    @classmethod
+    def get_cache_stats(cls):
+        """Get result cache statistics"""
+        cache = cls._get_result_cache()
+        if cache is None:
+            return {'enabled': False}
+        return {'enabled': True, **cache.stats()}
+    
+    @classmethod
+    def get_schema(cls, refresh=False):
+        """
+        Get the schema metadata catalog
+        
+        The catalog is loaded from information_schema in a single query on
+        first use and kept until DDL, create_database or reset_database
+        invalidates it.
+        
+        Returns:
+            tuple: (success, SchemaCatalog or error_message)
+        """
+        schema = cls._schema
+        if schema is not None and not refresh:
+            return True, schema
+        
+        with cls._schema_lock:
+            if cls._schema is not None and not refresh:
+                return True, cls._schema
+            
+            success, result = cls.execute_query(SCHEMA_QUERY)
+            if not success:
+                return False, result
+            
+            cls._schema = SchemaCatalog.from_rows(result)
+            logger.info(f"Schema catalog loaded: {len(cls._schema.table_names())} tables")
+            return True, cls._schema
     
     @classmethod
-    def get_table_data(cls, table_name, limit=100, offset=0):
-        """Get data from a specific table with pagination"""
+    def invalidate_schema(cls):
+        """Drop the schema catalog so the next lookup reloads it"""
+        cls._schema = None
+    
+    @classmethod
+    def _validate_table(cls, table_name):
+        """
+        Check that a table exists using the schema catalog
+        
+        Returns:
+            tuple: (success, SchemaCatalog or error_message)
+        """
         # Sanitize table name (basic protection)
         if not table_name.replace('_', '').isalnum():
             return False, "Invalid table name"
         
-        query = f"SELECT * FROM {table_name} LIMIT {int(limit)} OFFSET {int(offset)}"
-        success, result = cls.execute_query(query)
+        success, schema = cls.get_schema()
+        if not success:
+            return False, schema
+        if not schema.has_table(table_name):
+            return False, f"Table '{table_name}' does not exist"
+        return True, schema
+    
+    @classmethod
+    def _validate_columns(cls, schema, table_name, columns):
+        """Check that every column exists in the table"""
+        if not columns:
+            return False, "No columns provided"
+        unknown = schema.unknown_columns(table_name, columns)
+        if unknown:
+            return False, f"Unknown column(s) for table '{table_name}': {', '.join(unknown)}"
+        return True, None
+    
+    @classmethod
+    def _resolve_id_column(cls, schema, table_name, id_column=None):
+        """Get the column used to address single records of a table"""
+        if id_column is not None:
+            if schema.unknown_columns(table_name, [id_column]):
+                return False, f"Unknown column for table '{table_name}': {id_column}"
+            return True, id_column
         
+        pk_columns = schema.primary_key(table_name)
+        if len(pk_columns) != 1:
+            return False, f"Table '{table_name}' has no single-column primary key"
+        return True, pk_columns[0]
+    
+    @classmethod
+    def get_all_tables(cls):
+        """Get list of all tables in the database"""
+        success, schema = cls.get_schema()
         if success:
-            # Also get total count
-            count_query = f"SELECT COUNT(*) as total FROM {table_name}"
-            count_success, count_result = cls.execute_query(count_query, fetch_one=True)
-            
-            return True, {
-                "data": result,
-                "total": count_result['total'] if count_success else len(result)
+            return True, schema.table_names()
+        return False, schema
+    
+    @classmethod
+    def get_overview(cls, limit=None):
+        """
+        Get the row count and first page of every table in one parallel batch
+        
+        Args:
+            limit: Rows per table (defaults to Config.OVERVIEW_PAGE_SIZE)
+        
+        Returns:
+            tuple: (success, {table: {"data", "total", "total_exact"} or
+                {"error"}} or error_message)
+        """
+        success, schema = cls.get_schema()
+        if not success:
+            return False, schema
+        
+        limit = int(limit or Config.OVERVIEW_PAGE_SIZE)
+        timeout_ms = Config.QUERY_FANOUT_TIMEOUT_MS
+        table_names = schema.table_names()
+        counts = {}
+        tasks = {}
+        for table_name in table_names:
+            query = f"SELECT * FROM {table_name} LIMIT {limit}"
+            tasks[(table_name, 'data')] = functools.partial(cls.execute_query, query, timeout_ms=timeout_ms)
+            counts[table_name] = cls._cached_row_count(table_name)
+            if counts[table_name] is None:
+                tasks[(table_name, 'count')] = functools.partial(cls.get_row_count, table_name)
+        
+        results = cls.run_parallel(tasks)
+        overview = {}
+        for table_name in table_names:
+            success, data = results[(table_name, 'data')]
+            if not success:
+                overview[table_name] = {'error': data}
+                continue
+            count_success, count = results.get((table_name, 'count'), (True, counts[table_name]))
+            if not count_success:
+                overview[table_name] = {'error': count}
+                continue
+            overview[table_name] = {
+                'data': data,
+                'total': count['total'],
+                'total_exact': count['exact']
             }
+        return True, overview
+    
+    @classmethod
+    def get_table_data(cls, table_name, limit=100, offset=0, cursor=None, keyset=False, exact_total=False,
+                       as_columns=False):
+        """
+        Get data from a specific table with pagination
+        
+        Offset pagination is kept for compatibility. When a cursor is given
+        (or keyset is True) the page is read with a primary key seek instead,
+        so page N costs the same as page 1. If the row count is not cached,
+        the page and COUNT(*) queries run in parallel.
+        
+        Args:
+            table_name: Table to read
+            limit: Maximum number of rows in the page (clamped to 1..Config.TABLE_MAX_PAGE_SIZE)
+            offset: Rows to skip (offset mode only)
+            cursor: Opaque cursor returned as next_cursor by a previous page
+            keyset: If True, use keyset pagination even without a cursor
+            exact_total: If True, run COUNT(*) instead of using the count cache
+            as_columns: Return the page as a columnar result instead of row dicts
+        
+        Returns:
+            tuple: (success, {"data", "total", "total_exact", "next_cursor"} or error)
+        """
+        success, schema = cls._validate_table(table_name)
+        if not success:
+            return False, schema
+        
+        limit = min(max(int(limit), 1), Config.TABLE_MAX_PAGE_SIZE)
+        offset = max(int(offset), 0)
+        keyset = cursor is not None or keyset
+        timeout_ms = Config.QUERY_FANOUT_TIMEOUT_MS
+        
+        if keyset:
+            page = functools.partial(cls._get_keyset_page, table_name, limit, cursor, as_columns, timeout_ms)
+        else:
+            query = f"SELECT * FROM {table_name} LIMIT {limit} OFFSET {offset}"
+            page = functools.partial(cls.execute_query, query, as_columns=as_columns, timeout_ms=timeout_ms)
+        tasks = {'page': page}
+        
+        # A cached count needs no query of its own
+        count = None if exact_total else cls._cached_row_count(table_name)
+        if count is None:
+            tasks['count'] = functools.partial(cls.get_row_count, table_name, exact=exact_total)
+        
+        results = cls.run_parallel(tasks)
+        success, data = results['page']
+        if not success:
+            return False, data
+        data, next_cursor = data if keyset else (data, None)
+        count_success, count = results['count'] if 'count' in results else (True, count)
         
-        return False, result
+        return True, {
+            "data": data,
+            "total": count['total'] if count_success else (columnar.row_count(data) if as_columns else len(data)),
+            "total_exact": count['exact'] if count_success else False,
+            "next_cursor": next_cursor
+        }
+    
+    @classmethod
+    def _get_keyset_page(cls, table_name, limit, cursor=None, as_columns=False, timeout_ms=None):
+        """Read one page ordered by primary key, seeking past the cursor"""
+        success, pk_columns = cls.get_primary_key(table_name)
+        if not success:
+            return False, pk_columns
+        if not pk_columns:
+            return False, f"Table '{table_name}' has no primary key for cursor pagination"
+        
+        pk_list = ', '.join(pk_columns)
+        where_clause = ''
+        params = None
+        
+        if cursor is not None:
+            success, last_key = cls._decode_cursor(cursor, len(pk_columns))
+            if not success:
+                return False, last_key
+            placeholders = ', '.join(['%s'] * len(pk_columns))
+            # Row constructor comparison keeps composite keys in index order
+            where_clause = f"WHERE ({pk_list}) > ({placeholders})"
+            params = tuple(last_key)
+        
+        # Fetch one extra row to know whether another page exists
+        query = f"SELECT * FROM {table_name} {where_clause} ORDER BY {pk_list} LIMIT {limit + 1}"
+        success, rows = cls.execute_query(query, params, as_columns=as_columns, timeout_ms=timeout_ms)
+        if not success:
+            return False, rows
+        
+        next_cursor = None
+        if as_columns:
+            if columnar.row_count(rows) > limit:
+                rows = columnar.head(rows, limit)
+                next_cursor = cls._encode_cursor([columnar.column(rows, name)[-1] for name in pk_columns])
+        elif len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = cls._encode_cursor([rows[-1][column] for column in pk_columns])
+        
+        return True, (rows, next_cursor)
+    
+    @staticmethod
+    def _encode_cursor(key_values):
+        """Encode primary key values into an opaque URL-safe cursor"""
+        payload = json.dumps(key_values, default=str, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+    
+    @staticmethod
+    def _decode_cursor(cursor, key_length):
+        """Decode a cursor produced by _encode_cursor"""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            key_values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        except (ValueError, TypeError):
+            return False, "Invalid cursor"
+        if not isinstance(key_values, list) or len(key_values) != key_length:
+            return False, "Invalid cursor"
+        return True, key_values
+    
+    @classmethod
+    def get_primary_key(cls, table_name):
+        """Get the primary key columns of a table from the schema catalog"""
+        success, schema = cls._validate_table(table_name)
+        if not success:
+            return False, schema
+        return True, schema.primary_key(table_name)
+    
+    @classmethod
+    def get_row_count(cls, table_name, exact=False):
+        """
+        Get the number of rows in a table
+        
+        Counts are served from an in-process cache that the write paths keep
+        up to date (unless Config.ROW_COUNT_CACHE is off). The first lookup seeds it from the schema catalog: small
+        tables are counted exactly, large ones keep the TABLE_ROWS estimate.
+        
+        Returns:
+            tuple: (success, {"total": int, "exact": bool} or error)
+        """
+        if not exact:
+            cached = cls._cached_row_count(table_name)
+            if cached is not None:
+                return True, cached
+            
+            success, schema = cls.get_schema()
+            if not success:
+                return False, schema
+            table = schema.get_table(table_name)
+            estimate = table['estimated_rows'] if table else 0
+            if estimate >= Config.TABLE_COUNT_EXACT_THRESHOLD:
+                count = {'total': int(estimate), 'exact': False}
+                with cls._row_counts_lock:
+                    cls._row_counts[table_name] = count
+                return True, dict(count)
+        
+        count_query = f"SELECT COUNT(*) as total FROM {table_name}"
+        success, result = cls.execute_query(count_query, fetch_one=True)
+        if not success:
+            return False, result
+        
+        count = {'total': result['total'], 'exact': True}
+        with cls._row_counts_lock:
+            cls._row_counts[table_name] = count
+        return True, dict(count)
+    
+    @classmethod
+    def _cached_row_count(cls, table_name):
+        """Get a copy of the cached count of a table, or None"""
+        if not Config.ROW_COUNT_CACHE:
+            return None
+        with cls._row_counts_lock:
+            cached = cls._row_counts.get(table_name)
+            return dict(cached) if cached is not None else None
+    
+    @classmethod
+    def _adjust_row_count(cls, table_name, delta):
+        """Apply a write's row delta to the cached count of a table"""
+        with cls._row_counts_lock:
+            cached = cls._row_counts.get(table_name)
+            if cached is not None:
+                cached['total'] = max(0, cached['total'] + delta)
+    
+    @classmethod
+    def _invalidate_row_counts(cls, table_name=None):
+        """Drop cached counts so the next lookup reads them again"""
+        with cls._row_counts_lock:
+            if table_name is None:
+                cls._row_counts.clear()
+            else:
+                cls._row_counts.pop(table_name, None)
+    
+    @classmethod
+    def table_changed(cls, table_name, row_delta=None, changes=None, key=None):
+        """
+        Record a write to a table made outside execute_query
+        
+        Args:
+            table_name: Table that was written
+            row_delta: Net rows added (negative for deletes), or None if unknown
+            changes: Row-level change feed events as [(op, record_id, data)];
+                None publishes a reload of the table
+            key: Column the record ids of changes refer to
+        """
+        cls.bump_table_versions([table_name])
+        if row_delta is None:
+            cls._invalidate_row_counts(table_name)
+        else:
+            cls._adjust_row_count(table_name, row_delta)
+        
+        if changes is None or len(changes) > Config.CHANGE_FEED_MAX_ROW_EVENTS:
+            cls._change_feed().publish(table_name, 'reload')
+        elif changes:
+            cls._change_feed().publish_many([(table_name, op, record_id, data, key) for op, record_id, data in changes])
+    
+    @classmethod
+    def get_changes(cls, table_name, cursors=None, limit=None, since_time=None):
+        """
+        Get this process's change feed events of a table after a cursor
+        
+        Args:
+            table_name: Table to get the events of
+            cursors: {feed_id: last seen sequence number}; the entry of this
+                process's feed is used (a None key matches any feed)
+            limit: Maximum number of events
+            since_time: Epoch milliseconds to read from without a cursor
+        
+        Returns:
+            tuple: (success, {"events", "feed", "next", "reload"} or error_message)
+        """
+        success, schema = cls._validate_table(table_name)
+        if not success:
+            return False, schema
+        feed = cls._change_feed()
+        cursors = cursors or {}
+        since = cursors.get(feed.feed_id, cursors.get(None))
+        return True, feed.since(since, tables={table_name}, limit=limit, since_time=since_time)
+    
+    @classmethod
+    def get_change_position(cls):
+        """Get the change feed cursor to read a table's later changes from"""
+        return cls._change_feed().position()
     
     @classmethod
     def insert_record(cls, table_name, data):
         """Insert a new record into a table"""
-        if not table_name.replace('_', '').isalnum():
-            return False, "Invalid table name"
+        success, schema = cls._validate_table(table_name)
+        if not success:
+            return False, schema
+        success, error = cls._validate_columns(schema, table_name, list(data.keys()))
+        if not success:
+            return False, error
         
         columns = ', '.join(data.keys())
         placeholders = ', '.join(['%s'] * len(data))
         query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
         
-        return cls.execute_query(query, tuple(data.values()))
+        success, result = cls.execute_query(query, tuple(data.values()))
+        if success:
+            pk_columns = schema.primary_key(table_name)
+            key = pk_columns[0] if len(pk_columns) == 1 else None
+            record_id = result['last_id'] or (data.get(key) if key else None)
+            cls._change_feed().publish(table_name, 'insert', record_id, data, key)
+        return success, result
     
     @classmethod
-    def update_record(cls, table_name, record_id, data, id_column='id'):
-        """Update an existing record in a table"""
-        if not table_name.replace('_', '').isalnum():
-            return False, "Invalid table name"
+    def update_record(cls, table_name, record_id, data, id_column=None):
+        """Update an existing record in a table (id_column defaults to the primary key)"""
+        success, schema = cls._validate_table(table_name)
+        if not success:
+            return False, schema
+        success, error = cls._validate_columns(schema, table_name, list(data.keys()))
+        if not success:
+            return False, error
+        success, id_column = cls._resolve_id_column(schema, table_name, id_column)
+        if not success:
+            return False, id_column
         
         set_clause = ', '.join([f"{key} = %s" for key in data.keys()])
         query = f"UPDATE {table_name} SET {set_clause} WHERE {id_column} = %s"
         
         values = list(data.values()) + [record_id]
-        return cls.execute_query(query, tuple(values))
+        success, result = cls.execute_query(query, tuple(values))
+        if success and result['affected_rows']:
+            cls._change_feed().publish(table_name, 'update', record_id, data, id_column)
+        return success, result
     
     @classmethod
-    def delete_record(cls, table_name, record_id, id_column='id'):
-        """Delete a record from a table"""
-        if not table_name.replace('_', '').isalnum():
-            return False, "Invalid table name"
+    def delete_record(cls, table_name, record_id, id_column=None):
+        """Delete a record from a table (id_column defaults to the primary key)"""
+        success, schema = cls._validate_table(table_name)
+        if not success:
+            return False, schema
+        success, id_column = cls._resolve_id_column(schema, table_name, id_column)
+        if not success:
+            return False, id_column
         
         query = f"DELETE FROM {table_name} WHERE {id_column} = %s"
-        return cls.execute_query(query, (record_id,))
+        success, result = cls.execute_query(query, (record_id,))
+        if success and result['affected_rows']:
+            cls._change_feed().publish(table_name, 'delete', record_id, key=id_column)
+        return success, result
+    
+    @classmethod
+    def bulk_write(cls, table_name, inserts=None, upserts=None, updates=None, deletes=None, chunk_size=None):
+        """
+        Apply many inserts, upserts, updates and deletes in one transaction
+        
+        Everything runs on one pooled connection and is committed once.
+        Inserts and upserts are sent as chunked multi-row INSERT statements
+        through execute_many; updates and deletes are applied per chunk
+        with a single joined UPDATE or DELETE ... IN statement. If any
+        statement fails the whole batch is rolled back.
+        
+        Args:
+            table_name: Target table
+            inserts: List of {column: value} rows to insert
+            upserts: List of rows for INSERT ... ON DUPLICATE KEY UPDATE
+            updates: List of {"id": key, "data": {column: value}} changes
+            deletes: List of primary key values to delete
+            chunk_size: Rows per statement (defaults to Config.BULK_CHUNK_SIZE)
+        
+        Returns:
+            tuple: (success, {"results": [...], "summary": {...}} or error_message)
+        """
+        inserts = inserts or []
+        upserts = upserts or []
+        updates = updates or []
+        deletes = deletes or []
+        chunk_size = int(chunk_size or Config.BULK_CHUNK_SIZE)
+        
+        total_rows = len(inserts) + len(upserts) + len(updates) + len(deletes)
+        if total_rows == 0:
+            return False, "No rows provided"
+        if total_rows > Config.BULK_MAX_ROWS:
+            return False, f"Too many rows in one request (maximum {Config.BULK_MAX_ROWS})"
+        
+        success, schema = cls._validate_table(table_name)
+        if not success:
+            return False, schema
+        
+        for row in inserts + upserts:
+            if not isinstance(row, dict):
+                return False, "Insert and upsert rows must be objects"
+            success, error = cls._validate_columns(schema, table_name, list(row.keys()))
+            if not success:
+                return False, error
+        for change in updates:
+            if not isinstance(change, dict) or 'id' not in change or not isinstance(change.get('data'), dict):
+                return False, "Updates must be objects with 'id' and 'data'"
+            success, error = cls._validate_columns(schema, table_name, list(change['data'].keys()))
+            if not success:
+                return False, error
+        
+        pk_columns = schema.primary_key(table_name)
+        pk_column = pk_columns[0] if len(pk_columns) == 1 else None
+        if (updates or deletes) and pk_column is None:
+            return False, f"Table '{table_name}' has no single-column primary key"
+        
+        results = []
+        changes = []
+        summary = {'inserted': 0, 'upserted': 0, 'updated': 0, 'deleted': 0}
+        connection = None
+        cursor = None
+        
+        try:
+            connection = cls.get_connection()
+            cursor = connection.cursor()
+            
+            # Inserts: one multi-row INSERT per chunk of rows sharing a column list
+            for columns, indexed_rows in cls._group_by_columns(inserts):
+                column_list = ', '.join(columns)
+                placeholders = ', '.join(['%s'] * len(columns))
+                query = f"INSERT INTO {table_name} ({column_list}) VALUES ({placeholders})"
+                auto_increment = pk_column is not None and pk_column not in columns and \
+                    schema.get_table(table_name)['column_map'][pk_column]['auto_increment']
+                
+                for chunk in cls._chunks(indexed_rows, chunk_size):
+                    success, result = cls.execute_many(
+                        query, [tuple(row[column] for column in columns) for _, row in chunk], connection
+                    )
+                    if not success:
+                        raise Error(f"Insert of row {chunk[0][0]} failed: {result}")
+                    
+                    summary['inserted'] += result['affected_rows']
+                    for position, (index, row) in enumerate(chunk):
+                        if pk_column in columns:
+                            record_id = row[pk_column]
+                        elif auto_increment and result['last_id']:
+                            # A multi-row insert reserves consecutive ids starting at last_id
+                            record_id = result['last_id'] + position
+                        else:
+                            record_id = None
+                        results.append({'op': 'insert', 'index': index, 'success': True, 'id': record_id})
+                        changes.append(('insert', record_id, row))
+            
+            # Upserts: multi-row INSERT ... ON DUPLICATE KEY UPDATE
+            for columns, indexed_rows in cls._group_by_columns(upserts):
+                column_list = ', '.join(columns)
+                placeholders = ', '.join(['%s'] * len(columns))
+                update_columns = [column for column in columns if column not in pk_columns] or list(columns)
+                # Row alias instead of VALUES(), which MySQL 8.0.20+ warns about
+                update_clause = ', '.join(f"{column} = new.{column}" for column in update_columns)
+                query = (
+                    f"INSERT INTO {table_name} ({column_list}) VALUES ({placeholders}) AS new "
+                    f"ON DUPLICATE KEY UPDATE {update_clause}"
+                )
+                
+                for chunk in cls._chunks(indexed_rows, chunk_size):
+                    success, result = cls.execute_many(
+                        query, [tuple(row[column] for column in columns) for _, row in chunk], connection
+                    )
+                    if not success:
+                        raise Error(f"Upsert of row {chunk[0][0]} failed: {result}")
+                    
+                    summary['upserted'] += len(chunk)
+                    for index, row in chunk:
+                        results.append({'op': 'upsert', 'index': index, 'success': True, 'id': row.get(pk_column)})
+                        changes.append(('upsert', row.get(pk_column), row))
+            
+            # Updates: lock the targeted rows, then one joined UPDATE per chunk
+            for columns, indexed_changes in cls._group_by_columns(updates, key=lambda change: change['data']):
+                for chunk in cls._chunks(indexed_changes, chunk_size):
+                    record_ids = [change['id'] for _, change in chunk]
+                    existing = cls._lock_existing_ids(cursor, table_name, pk_column, record_ids)
+                    
+                    selects = []
+                    params = []
+                    for position, (_, change) in enumerate(chunk):
+                        if position == 0:
+                            aliases = ', '.join(['%s AS _bulk_key'] + [f"%s AS {column}" for column in columns])
+                        else:
+                            aliases = ', '.join(['%s'] * (len(columns) + 1))
+                        selects.append(f"SELECT {aliases}")
+                        params.append(change['id'])
+                        params.extend(change['data'][column] for column in columns)
+                    
+                    set_clause = ', '.join(f"t.{column} = v.{column}" for column in columns)
+                    query = (
+                        f"UPDATE {table_name} AS t JOIN ({' UNION ALL '.join(selects)}) AS v "
+                        f"ON t.{pk_column} = v._bulk_key SET {set_clause}"
+                    )
+                    cursor.execute(query, tuple(params))
+                    
+                    for index, change in chunk:
+                        found = str(change['id']) in existing
+                        summary['updated'] += 1 if found else 0
+                        if found:
+                            changes.append(('update', change['id'], change['data']))
+                        results.append({
+                            'op': 'update', 'index': index, 'success': found, 'id': change['id'],
+                            **({} if found else {'error': 'Record not found'})
+                        })
+            
+            # Deletes: lock the targeted rows, then one DELETE ... IN per chunk
+            for chunk in cls._chunks(list(enumerate(deletes)), chunk_size):
+                record_ids = [record_id for _, record_id in chunk]
+                existing = cls._lock_existing_ids(cursor, table_name, pk_column, record_ids)
+                
+                placeholders = ', '.join(['%s'] * len(record_ids))
+                cursor.execute(f"DELETE FROM {table_name} WHERE {pk_column} IN ({placeholders})", tuple(record_ids))
+                summary['deleted'] += cursor.rowcount
+                
+                for index, record_id in chunk:
+                    found = str(record_id) in existing
+                    if found:
+                        changes.append(('delete', record_id, None))
+                    results.append({
+                        'op': 'delete', 'index': index, 'success': found, 'id': record_id,
+                        **({} if found else {'error': 'Record not found'})
+                    })
+            
+            connection.commit()
+        
+        except Error as e:
+            if connection:
+                connection.rollback()
+                metrics.DB_ROLLBACKS.inc()
+            logger.error(f"Bulk write error on {table_name}: {e}")
+            return False, str(e)
+        finally:
+            if cursor:
+                cursor.close()
+            if connection:
+                connection.close()
+        
+        # Upserts do not report how many rows were new, so the count is re-read
+        cls.table_changed(table_name, None if upserts else summary['inserted'] - summary['deleted'], changes, pk_column)
+        
+        logger.info(f"Bulk write on {table_name}: {summary}")
+        return True, {"results": results, "summary": summary}
+    
+    @staticmethod
+    def _group_by_columns(rows, key=None):
+        """Group rows by their column list, keeping each row's original index"""
+        groups = {}
+        for index, row in enumerate(rows):
+            columns = tuple((key(row) if key else row).keys())
+            groups.setdefault(columns, []).append((index, row))
+        return list(groups.items())
+    
+    @staticmethod
+    def _chunks(items, size):
+        """Split a list into consecutive chunks of at most size items"""
+        return [items[start:start + size] for start in range(0, len(items), size)]
+    
+    @staticmethod
+    def _lock_existing_ids(cursor, table_name, pk_column, record_ids):
+        """Lock the rows with the given keys and return the keys that exist (as strings)"""
+        placeholders = ', '.join(['%s'] * len(record_ids))
+        cursor.execute(
+            f"SELECT {pk_column} FROM {table_name} WHERE {pk_column} IN ({placeholders}) FOR UPDATE",
+            tuple(record_ids)
+        )
+        return {str(row[0]) for row in cursor.fetchall()}
     
     @classmethod
     def create_database(cls, host, user, password, port=3306):
@@ -238,138 +1622,41 @@ class Database:
                 password=password,
                 database='edudb'
             )
-            cursor = connection.cursor()
-            
-            # Read initialization script
-            with open(Config.DATABASE_DIR / 'init_db.sql', 'r', encoding='utf-8') as f:
-                sql_script = f.read()
-            
-            # Remove comments and split by semicolon
-            lines = sql_script.split('\n')
-            clean_lines = []
-            for line in lines:
-                # Remove inline comments
-                if '--' in line:
-                    line = line[:line.index('--')]
-                clean_lines.append(line)
-            
-            clean_script = '\n'.join(clean_lines)
-            statements = [s.strip() for s in clean_script.split(';') if s.strip()]
-            
-            logger.info(f"Processing {len(statements)} SQL statements from init_db.sql")
-            
-            for i, statement in enumerate(statements, 1):
-                statement_upper = statement.upper()
-                
-                # Skip CREATE DATABASE and USE statements
-                if statement_upper.startswith('CREATE DATABASE') or statement_upper.startswith('USE '):
-                    logger.info(f"Skipping statement #{i}: {statement[:50]}...")
-                    continue
-                
-                # Skip SELECT statements used for displaying messages
-                if statement_upper.startswith('SELECT') and ('AS STATUS' in statement_upper or 'AS INFO' in statement_upper):
-                    logger.info(f"Skipping info statement #{i}: {statement[:50]}...")
-                    continue
-                
-                try:
-                    cursor.execute(statement)
-                    # Consume any results from SELECT statements
-                    if cursor.with_rows:
-                        cursor.fetchall()
-                    connection.commit()
-                    
-                    # Log successful operations
-                    if 'CREATE TABLE' in statement_upper:
-                        table_name = statement.split('TABLE')[1].split('(')[0].strip().replace('IF NOT EXISTS', '').strip()
-                        logger.info(f"✓ Statement #{i}: Created table '{table_name}'")
-                    elif 'DROP TABLE' in statement_upper:
-                        table_name = statement.split('TABLE')[1].strip().replace('IF EXISTS', '').strip()
-                        logger.info(f"✓ Statement #{i}: Dropped table '{table_name}'")
-                    elif 'INSERT INTO' in statement_upper:
-                        table_name = statement.split('INTO')[1].split('(')[0].strip().split()[0]
-                        logger.info(f"✓ Statement #{i}: Inserted data into '{table_name}'")
-                    elif 'CREATE INDEX' in statement_upper:
-                        index_name = statement.split('INDEX')[1].split('ON')[0].strip()
-                        logger.info(f"✓ Statement #{i}: Created index '{index_name}'")
-                    else:
-                        logger.info(f"✓ Statement #{i}: Executed successfully")
-                        
-                except Error as e:
-                    logger.error(f"✗ Statement #{i} failed: {e}")
-                    logger.error(f"  Statement: {statement[:100]}...")
-                    connection.rollback()
-                    # Continue with other statements
-                    continue
-            
-            logger.info("init_db.sql executed successfully")
-            
-            # Now execute app schema
-            with open(Config.DATABASE_DIR / 'app_schema.sql', 'r', encoding='utf-8') as f:
-                app_schema_script = f.read()
-            
-            # Remove comments and split by semicolon
-            lines = app_schema_script.split('\n')
-            clean_lines = []
-            for line in lines:
-                if '--' in line:
-                    line = line[:line.index('--')]
-                clean_lines.append(line)
-            
-            clean_script = '\n'.join(clean_lines)
-            statements = [s.strip() for s in clean_script.split(';') if s.strip()]
-            
-            logger.info(f"Processing {len(statements)} SQL statements from app_schema.sql")
-            
-            for i, statement in enumerate(statements, 1):
-                statement_upper = statement.upper()
-                
-                # Skip USE and SELECT info statements
-                if statement_upper.startswith('USE '):
-                    continue
-                if statement_upper.startswith('SELECT') and 'AS STATUS' in statement_upper:
-                    continue
-                
-                try:
-                    cursor.execute(statement)
-                    # Consume any results from SELECT statements
-                    if cursor.with_rows:
-                        cursor.fetchall()
-                    connection.commit()
-                    
-                    if 'CREATE TABLE' in statement_upper:
-                        table_name = statement.split('TABLE')[1].split('(')[0].strip().replace('IF NOT EXISTS', '').strip()
-                        logger.info(f"✓ Statement #{i}: Created app table '{table_name}'")
-                    elif 'DROP TABLE' in statement_upper:
-                        table_name = statement.split('TABLE')[1].strip().replace('IF EXISTS', '').strip()
-                        logger.info(f"✓ Statement #{i}: Dropped app table '{table_name}'")
-                    elif 'INSERT INTO' in statement_upper:
-                        table_name = statement.split('INTO')[1].split('(')[0].strip().split()[0]
-                        logger.info(f"✓ Statement #{i}: Inserted data into '{table_name}'")
-                    else:
-                        logger.info(f"✓ Statement #{i}: Executed successfully")
-                        
-                except Error as e:
-                    logger.error(f"✗ App schema statement #{i} failed: {e}")
-                    logger.error(f"  Statement: {statement[:100]}...")
-                    connection.rollback()
-                    continue
+            cursor = None
             
-            logger.info("app_schema.sql executed successfully")
+            # Run both scripts in batched round trips on this connection
+            runner = ScriptRunner(connection)
+            for script in ('init_db.sql', 'app_schema.sql'):
+                report = runner.run_file(Config.DATABASE_DIR / script)
+                logger.info(f"{script} executed with {len(report['failed'])} failed statements")
             
             # Reset the connection pool so it can connect to the new database
-            cls._pool = None
+            cls.close_pool()
+            cls.invalidate_schema()
+            cls._invalidate_row_counts()
+            cls.bump_table_versions()
+            cls._change_feed().publish(ALL_TABLES, 'reload')
             logger.info("Database created successfully. Connection pool reset.")
             
             # Initialize the pool now that database exists
             cls.initialize_pool()
             
-            return True, "Database created successfully with all tables and data!"
+            # Keep pristine copies of the sample data for instant resets
+            success, result = cls.create_snapshot(Config.PRISTINE_SNAPSHOT)
+            if not success:
+                logger.warning(f"Could not take the pristine snapshot: {result}")
             
+            if Config.TABLE_VERSION_TRIGGERS:
+                cls.install_version_triggers()
+            
+            return True, "Database created successfully with all tables and data!"
+        
         except Error as e:
             logger.error(f"Database creation error: {e}")
             if connection:
                 try:
                     connection.rollback()
+                    metrics.DB_ROLLBACKS.inc()
                 except:
                     pass
             return False, f"Failed to create database: {str(e)}"
@@ -387,26 +1674,259 @@ class Database:
     
     @classmethod
     def reset_database(cls):
-        """Reset database to original sample data"""
+        """
+        Reset database to original sample data
+        
+        Restores the snapshot taken at provisioning time. Databases created
+        before snapshots existed replay reset_db.sql once and take the
+        snapshot then.
+        """
+        success, snapshots = cls.list_snapshots()
+        if not success:
+            return False, snapshots
+        
+        if any(snapshot['name'] == Config.PRISTINE_SNAPSHOT for snapshot in snapshots):
+            success, result = cls.restore_snapshot(Config.PRISTINE_SNAPSHOT)
+            if not success:
+                return False, result
+            logger.info(f"Database reset from snapshot in {result['elapsed_seconds']}s")
+            return True, "Database reset to original sample data"
+        
+        connection = None
+        try:
+            connection = cls.get_connection()
+            report = ScriptRunner(connection).run_file(Config.DATABASE_DIR / 'reset_db.sql')
+        except Error as e:
+            logger.error(f"Database reset error: {e}")
+            return False, str(e)
+        finally:
+            if connection:
+                connection.close()
+        
+        cls.invalidate_schema()
+        cls._invalidate_row_counts()
+        cls.bump_table_versions()
+        cls._change_feed().publish(ALL_TABLES, 'reload')
+        if report['failed']:
+            return False, report['failed'][0]['error']
+        
+        success, result = cls.create_snapshot(Config.PRISTINE_SNAPSHOT)
+        if not success:
+            logger.warning(f"Could not take the pristine snapshot: {result}")
+        logger.info("Database reset successfully")
+        return True, "Database reset to original sample data"
+    
+    @staticmethod
+    def _snapshot_table(name, table_name):
+        """Name of the table holding a snapshot's copy of a table"""
+        return f"{SNAPSHOT_PREFIX}{name}__{table_name}"
+    
+    @staticmethod
+    def _validate_snapshot_name(name):
+        """Check a snapshot name (letters, digits and single underscores)"""
+        if not isinstance(name, str) or len(name) > 24 or \
+                not re.fullmatch(r'[A-Za-z0-9]+(_[A-Za-z0-9]+)*', name):
+            return False, "Snapshot names use up to 24 letters, digits and single underscores"
+        return True, name
+    
+    @classmethod
+    def list_snapshots(cls):
+        """
+        Get the snapshots stored in the database
+        
+        Returns:
+            tuple: (success, [{"name", "tables", "created_at"}] or error)
+        """
+        success, rows = cls.execute_query(
+            """SELECT CAST(TABLE_NAME AS CHAR) AS table_name, CREATE_TIME AS created_at
+               FROM information_schema.TABLES
+               WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME LIKE %s
+               ORDER BY TABLE_NAME""",
+            (SNAPSHOT_PREFIX.replace('_', '\\_') + '%',),
+            use_cache=False
+        )
+        if not success:
+            return False, rows
+        
+        snapshots = {}
+        for row in rows:
+            name, _, table_name = row['table_name'][len(SNAPSHOT_PREFIX):].partition('__')
+            snapshot = snapshots.setdefault(name, {'name': name, 'tables': [], 'created_at': row['created_at']})
+            snapshot['tables'].append(table_name)
+        return True, list(snapshots.values())
+    
+    @classmethod
+    def _find_snapshot(cls, name):
+        """
+        Look up a snapshot by name
+        
+        Returns:
+            tuple: (success, snapshot dict or error_message)
+        """
+        success, result = cls._validate_snapshot_name(name)
+        if not success:
+            return False, result
+        success, snapshots = cls.list_snapshots()
+        if not success:
+            return False, snapshots
+        for snapshot in snapshots:
+            if snapshot['name'] == name:
+                return True, snapshot
+        return False, f"Snapshot '{name}' not found"
+    
+    @classmethod
+    def create_snapshot(cls, name, tables=None):
+        """
+        Copy tables into a named snapshot, replacing one with the same name
+        
+        Each table is copied with CREATE TABLE ... LIKE (keeping its indexes)
+        and one INSERT ... SELECT. The copies are filled in one transaction so
+        they are consistent with each other.
+        
+        Args:
+            name: Snapshot name
+            tables: Tables to copy (defaults to Config.SNAPSHOT_TABLES)
+        
+        Returns:
+            tuple: (success, {"name", "tables", "rows"} or error)
+        """
+        success, result = cls._validate_snapshot_name(name)
+        if not success:
+            return False, result
+        success, schema = cls.get_schema()
+        if not success:
+            return False, schema
+        
+        tables = [table for table in (tables or Config.SNAPSHOT_TABLES) if schema.has_table(table)]
+        if not tables:
+            return False, "No tables to snapshot"
+        
+        success, existing = cls._find_snapshot(name)
+        stale = [cls._snapshot_table(name, table) for table in existing['tables']] if success else []
+        
+        connection = None
+        cursor = None
+        rows = {}
         try:
-            with open(Config.DATABASE_DIR / 'reset_db.sql', 'r') as f:
-                sql_script = f.read()
-            
             connection = cls.get_connection()
             cursor = connection.cursor()
             
-            # Execute each statement
-            for statement in sql_script.split(';'):
-                statement = statement.strip()
-                if statement and not statement.startswith('--'):
-                    cursor.execute(statement)
+            if stale:
+                cursor.execute(f"DROP TABLE IF EXISTS {', '.join(stale)}")
+            for table_name in tables:
+                cursor.execute(f"CREATE TABLE {cls._snapshot_table(name, table_name)} LIKE {table_name}")
             
+            for table_name in tables:
+                column_list = ', '.join(cls._snapshot_columns(schema, table_name))
+                cursor.execute(
+                    f"INSERT INTO {cls._snapshot_table(name, table_name)} ({column_list}) "
+                    f"SELECT {column_list} FROM {table_name}"
+                )
+                rows[table_name] = cursor.rowcount
             connection.commit()
-            cursor.close()
-            connection.close()
+        except Error as e:
+            if connection:
+                connection.rollback()
+                metrics.DB_ROLLBACKS.inc()
+            logger.error(f"Snapshot '{name}' failed: {e}")
+            return False, str(e)
+        finally:
+            if cursor:
+                cursor.close()
+            if connection:
+                connection.close()
+        
+        logger.info(f"Snapshot '{name}' taken of {', '.join(tables)}")
+        return True, {"name": name, "tables": tables, "rows": rows}
+    
+    @classmethod
+    def restore_snapshot(cls, name):
+        """
+        Restore the tables of a named snapshot
+        
+        All tables are emptied and refilled with INSERT ... SELECT in a single
+        transaction, so readers keep seeing the old rows until the commit and
+        never a half-empty table. Foreign key checks are off while related
+        tables are refilled together.
+        
+        Returns:
+            tuple: (success, {"name", "tables", "rows", "elapsed_seconds"} or error)
+        """
+        success, snapshot = cls._find_snapshot(name)
+        if not success:
+            return False, snapshot
+        success, schema = cls.get_schema()
+        if not success:
+            return False, schema
+        missing = [table for table in snapshot['tables'] if not schema.has_table(table)]
+        if missing:
+            return False, f"Snapshot tables no longer exist: {', '.join(missing)}"
+        
+        started = time.monotonic()
+        connection = None
+        cursor = None
+        rows = {}
+        try:
+            connection = cls.get_connection()
+            cursor = connection.cursor()
+            cursor.execute("SET SESSION foreign_key_checks = 0")
+            try:
+                for table_name in snapshot['tables']:
+                    column_list = ', '.join(cls._snapshot_columns(schema, table_name))
+                    cursor.execute(f"DELETE FROM {table_name}")
+                    cursor.execute(
+                        f"INSERT INTO {table_name} ({column_list}) "
+                        f"SELECT {column_list} FROM {cls._snapshot_table(name, table_name)}"
+                    )
+                    rows[table_name] = cursor.rowcount
+                connection.commit()
+            finally:
+                cursor.execute("SET SESSION foreign_key_checks = 1")
             
-            logger.info("Database reset successfully")
-            return True, "Database reset to original sample data"
+            # New rows continue after the restored ids (MySQL raises 1 to MAX(id) + 1)
+            for table_name in snapshot['tables']:
+                if any(column['auto_increment'] for column in schema.get_table(table_name)['columns']):
+                    cursor.execute(f"ALTER TABLE {table_name} AUTO_INCREMENT = 1")
         except Error as e:
-            logger.error(f"Database reset error: {e}")
+            if connection:
+                connection.rollback()
+                metrics.DB_ROLLBACKS.inc()
+            logger.error(f"Restore of snapshot '{name}' failed: {e}")
             return False, str(e)
+        finally:
+            if cursor:
+                cursor.close()
+            if connection:
+                connection.close()
+        
+        cls.bump_table_versions(list(rows))
+        with cls._row_counts_lock:
+            for table_name, count in rows.items():
+                cls._row_counts[table_name] = {'total': count, 'exact': True}
+        cls._change_feed().publish_many([(table_name, 'reload', None, None, None) for table_name in rows])
+        
+        return True, {
+            "name": name,
+            "tables": snapshot['tables'],
+            "rows": rows,
+            "elapsed_seconds": round(time.monotonic() - started, 3)
+        }
+    
+    @classmethod
+    def delete_snapshot(cls, name):
+        """Drop a named snapshot"""
+        success, snapshot = cls._find_snapshot(name)
+        if not success:
+            return False, snapshot
+        
+        tables = ', '.join(cls._snapshot_table(name, table) for table in snapshot['tables'])
+        success, result = cls.execute_query(f"DROP TABLE IF EXISTS {tables}", use_cache=False)
+        if not success:
+            return False, result
+        logger.info(f"Snapshot '{name}' deleted")
+        return True, f"Snapshot '{name}' deleted"
+    
+    @staticmethod
+    def _snapshot_columns(schema, table_name):
+        """Columns copied between a table and its snapshot (generated ones are computed)"""
+        return [column['name'] for column in schema.get_table(table_name)['columns'] if not column['generated']]
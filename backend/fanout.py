@@ -0,0 +1,116 @@
+"""
+Parallel Query Fan-Out
+
+This module runs independent read tasks (a page query and its COUNT(*),
+the first page of every table) at the same time on a bounded thread pool.
+Each task checks out its own pooled connection, so a batch takes about as
+long as its slowest query instead of the sum of all of them. The pool is
+shared by every request in the process, which keeps fan-out from taking
+more than its share of database connections.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from backend.profiler import get_source, set_source
+
+logger = logging.getLogger(__name__)
+
+# Set on fan-out worker threads; tasks that fan out again run inline there
+_context = threading.local()
+
+
+class QueryExecutor:
+    """Bounded thread pool running batches of (success, result) tasks"""
+    
+    def __init__(self, max_workers=4):
+        """
+        Args:
+            max_workers: Tasks running at once across all batches (each holds
+                one pooled connection while it runs)
+        """
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='edudb-fanout')
+        self._lock = threading.Lock()
+        self._stats = {'batches': 0, 'tasks': 0, 'inline': 0, 'failed': 0, 'timed_out': 0}
+    
+    def run(self, tasks, timeout=None):
+        """
+        Run tasks in parallel and wait for all of them
+        
+        Tasks are callables returning a (success, result) tuple. A task
+        still running when the timeout expires is reported as failed; it
+        keeps its connection until its statement ends, so statements should
+        carry their own server-side time limit. A single task, or a batch
+        submitted from a fan-out worker, runs inline on the calling thread.
+        
+        Args:
+            tasks: {name: callable}
+            timeout: Seconds to wait for the whole batch (None waits forever)
+        
+        Returns:
+            dict: {name: (success, result/error_message)}
+        """
+        if not tasks:
+            return {}
+        
+        if len(tasks) == 1 or getattr(_context, 'worker', False):
+            self._count(batches=1, tasks=len(tasks), inline=len(tasks))
+            return {name: self._call(task) for name, task in tasks.items()}
+        
+        self._count(batches=1, tasks=len(tasks))
+        source = get_source()
+        started = time.monotonic()
+        futures = {
+            name: self._executor.submit(self._run_task, task, source)
+            for name, task in tasks.items()
+        }
+        done, _ = wait(futures.values(), timeout=timeout)
+        
+        results = {}
+        for name, future in futures.items():
+            if future in done and not future.cancelled():
+                results[name] = future.result()
+            else:
+                # Tasks that never started are dropped; running ones finish unobserved
+                future.cancel()
+                self._count(timed_out=1)
+                waited_ms = int((time.monotonic() - started) * 1000)
+                logger.warning(f"Fan-out task '{name}' did not finish within {waited_ms} ms")
+                results[name] = (False, f"Timed out after {waited_ms} ms")
+        return results
+    
+    def stats(self):
+        """Get batch and task counters"""
+        with self._lock:
+            return {'max_workers': self.max_workers, **self._stats}
+    
+    def shutdown(self):
+        """Stop the worker threads, cancelling tasks that have not started"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _run_task(self, task, source):
+        """Run a task on a worker thread, tagged with the submitting request"""
+        _context.worker = True
+        set_source(source)
+        try:
+            return self._call(task)
+        finally:
+            set_source(None)
+    
+    def _call(self, task):
+        try:
+            result = task()
+        except Exception as e:
+            logger.error(f"Fan-out task failed: {e}")
+            result = (False, str(e))
+        if not result[0]:
+            self._count(failed=1)
+        return result
+    
+    def _count(self, **increments):
+        with self._lock:
+            for name, amount in increments.items():
+                self._stats[name] += amount
@@ -0,0 +1,187 @@
+"""
+Query Governor
+
+This module bounds ad-hoc queries from the Studio. Each query runs with a
+MAX_EXECUTION_TIME hint, a watchdog thread issues KILL QUERY if the server
+has not stopped it shortly after the limit, and running queries are tracked
+by id so a client can cancel its own query. Kills are sent over a separate
+control connection so they work even when the pool is exhausted.
+"""
+
+import logging
+import threading
+import time
+import uuid
+
+import mysql.connector
+from mysql.connector import Error
+
+logger = logging.getLogger(__name__)
+
+# MySQL error numbers for interrupted statements
+ER_QUERY_INTERRUPTED = 1317
+ER_QUERY_TIMEOUT = 3024
+
+
+def add_time_limit(query, timeout_ms):
+    """Add a MAX_EXECUTION_TIME optimizer hint to a SELECT statement"""
+    stripped = query.lstrip()
+    if not stripped[:6].upper() == 'SELECT':
+        return query
+    return f"SELECT /*+ MAX_EXECUTION_TIME({int(timeout_ms)}) */{stripped[6:]}"
+
+
+class QueryGovernor:
+    """Registry of running governed queries with a KILL QUERY watchdog"""
+    
+    def __init__(self, connect_args, kill_grace=1.0):
+        """
+        Args:
+            connect_args: Arguments for mysql.connector.connect (control connection)
+            kill_grace: Seconds past the time limit before the watchdog kills a query
+        """
+        self.connect_args = connect_args
+        self.kill_grace = kill_grace
+        self._running = {}
+        self._lock = threading.Lock()
+        self._control = None
+        self._control_lock = threading.Lock()
+        self._stats = {
+            'started': 0,
+            'completed': 0,
+            'truncated': 0,
+            'timed_out': 0,
+            'cancelled': 0,
+            'failed': 0,
+            'killed': 0
+        }
+    
+    def start(self, connection_id, query, timeout_ms, query_id=None):
+        """
+        Register a query that is about to run on a connection
+        
+        Returns:
+            dict: Entry tracking the query; pass it to finish()
+        """
+        entry = {
+            'query_id': query_id or uuid.uuid4().hex,
+            'connection_id': connection_id,
+            'query': query[:200],
+            'started_at': time.monotonic(),
+            'cancelled': False,
+            'timed_out': False,
+            'finished': False,
+            # Held while killing and while finishing, so a kill never reaches
+            # the connection after it went back to the pool
+            'lock': threading.Lock(),
+            'watchdog': None
+        }
+        with self._lock:
+            if entry['query_id'] in self._running:
+                raise ValueError(f"Query id '{entry['query_id']}' is already running")
+            self._running[entry['query_id']] = entry
+            self._stats['started'] += 1
+        
+        watchdog = threading.Timer(timeout_ms / 1000 + self.kill_grace, self._expire, (entry,))
+        watchdog.daemon = True
+        entry['watchdog'] = watchdog
+        watchdog.start()
+        return entry
+    
+    def finish(self, entry, outcome='completed'):
+        """
+        Stop tracking a query and count how it ended
+        
+        Call before the connection is released; waits for a kill that is
+        being sent for the query.
+        """
+        entry['watchdog'].cancel()
+        with entry['lock']:
+            if entry['finished']:
+                return
+            entry['finished'] = True
+        with self._lock:
+            self._running.pop(entry['query_id'], None)
+            self._stats[outcome] += 1
+    
+    def cancel(self, query_id):
+        """
+        Cancel a running query by id
+        
+        Returns:
+            bool: True if the query was running and a kill was sent
+        """
+        with self._lock:
+            entry = self._running.get(query_id)
+        if entry is None:
+            return False
+        return self._kill_entry(entry, 'cancelled')
+    
+    def kill(self, connection_id):
+        """Stop the statement running on a server connection"""
+        with self._control_lock:
+            for attempt in range(2):
+                try:
+                    if self._control is None or not self._control.is_connected():
+                        self._control = mysql.connector.connect(**self.connect_args)
+                    cursor = self._control.cursor()
+                    cursor.execute(f"KILL QUERY {int(connection_id)}")
+                    cursor.close()
+                    break
+                except Error as e:
+                    # 1094: unknown thread, the query already ended
+                    if e.errno == 1094:
+                        return False
+                    self._close_control()
+                    if attempt:
+                        logger.error(f"Could not kill query on connection {connection_id}: {e}")
+                        return False
+        with self._lock:
+            self._stats['killed'] += 1
+        return True
+    
+    def running(self):
+        """Get the queries currently running"""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    'query_id': entry['query_id'],
+                    'query': entry['query'],
+                    'elapsed_ms': int((now - entry['started_at']) * 1000),
+                    'cancelled': entry['cancelled']
+                }
+                for entry in self._running.values()
+            ]
+    
+    def stats(self):
+        """Get outcome counters and the number of running queries"""
+        with self._lock:
+            return {**self._stats, 'running': len(self._running)}
+    
+    def close(self):
+        """Close the control connection"""
+        with self._control_lock:
+            self._close_control()
+    
+    def _expire(self, entry):
+        """Watchdog callback: the server did not enforce the time limit"""
+        if self._kill_entry(entry, 'timed_out'):
+            logger.warning(f"Killed query {entry['query_id']} past its time limit")
+    
+    def _kill_entry(self, entry, reason):
+        """Kill a tracked query if it has not finished, marking why"""
+        with entry['lock']:
+            if entry['finished']:
+                return False
+            entry[reason] = True
+            return self.kill(entry['connection_id'])
+    
+    def _close_control(self):
+        """Drop the control connection (caller holds the control lock)"""
+        if self._control is not None:
+            try:
+                self._control.close()
+            except Exception:
+                pass
+            self._control = None
@@ -0,0 +1,432 @@
+"""
+Bulk Data Import
+
+This module streams CSV or NDJSON files into a table. Rows are validated
+against the schema catalog and committed in batches of multi-row INSERTs,
+or loaded with LOAD DATA LOCAL INFILE when both the client and the server
+allow it. Run it from the project root as a CLI:
+    
+    python -m backend.importer students students.csv --batch-size 2000
+"""
+
+import argparse
+import csv
+import io
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+from mysql.connector import Error
+
+from config.config import Config
+from backend.database import Database
+
+logger = logging.getLogger(__name__)
+
+INTEGER_TYPES = ('tinyint', 'smallint', 'mediumint', 'int', 'integer', 'bigint', 'year')
+DECIMAL_TYPES = ('decimal', 'numeric')
+FLOAT_TYPES = ('float', 'double', 'real')
+STRING_TYPES = ('char', 'varchar', 'tinytext', 'text', 'mediumtext', 'longtext', 'enum', 'set')
+_LENGTH_PATTERN = re.compile(r'^(?:var)?char\((\d+)\)')
+_WARNING_ROW_PATTERN = re.compile(r'\bat row (\d+)')
+# Warnings for rows LOAD DATA LOCAL skips (duplicate key, missing foreign
+# key, failed check constraint); other warnings are on rows it inserted
+SKIPPED_ROW_WARNINGS = (1062, 1452, 3819)
+
+
+def detect_format(filename, default='csv'):
+    """Guess the import format from a file name"""
+    if filename:
+        extension = os.path.splitext(filename)[1].lower()
+        if extension in ('.ndjson', '.jsonl', '.json'):
+            return 'ndjson'
+        if extension == '.csv':
+            return 'csv'
+    return default
+
+
+def read_rows(stream, file_format):
+    """
+    Lazily read (line_number, row) pairs from a binary stream
+    
+    CSV rows are dicts keyed by the header. A line that cannot be parsed is
+    yielded as (line_number, error_message) so the caller can reject it.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    try:
+        if file_format == 'csv':
+            reader = csv.DictReader(text)
+            for row in reader:
+                if None in row:
+                    yield reader.line_num, "Row has more fields than the header"
+                else:
+                    yield reader.line_num, row
+        else:
+            for line_number, line in enumerate(text, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    yield line_number, f"Invalid JSON: {e}"
+                    continue
+                if not isinstance(row, dict):
+                    yield line_number, "Each line must be a JSON object"
+                else:
+                    yield line_number, row
+    finally:
+        # Leave the underlying stream to its owner
+        text.detach()
+
+
+def coerce_value(column, value, from_csv=False):
+    """
+    Convert a raw value to the Python type of a column
+    
+    Returns:
+        tuple: (success, value or error_message)
+    """
+    data_type = (column['data_type'] or '').lower()
+    name = column['name']
+    
+    if from_csv and value == '' and data_type not in STRING_TYPES:
+        value = None
+    if value is None:
+        if not column['nullable']:
+            return False, f"Column '{name}' cannot be null"
+        return True, None
+    
+    try:
+        if data_type in INTEGER_TYPES:
+            if isinstance(value, bool):
+                return True, int(value)
+            if isinstance(value, float) and not value.is_integer():
+                return False, f"Column '{name}' expects an integer"
+            return True, int(value)
+        if data_type in DECIMAL_TYPES:
+            return True, Decimal(str(value))
+        if data_type in FLOAT_TYPES:
+            return True, float(value)
+        if data_type == 'date':
+            return True, date.fromisoformat(str(value))
+        if data_type in ('datetime', 'timestamp'):
+            return True, datetime.fromisoformat(str(value))
+        if data_type == 'json':
+            return True, value if isinstance(value, str) else json.dumps(value)
+    except (ValueError, TypeError, InvalidOperation):
+        return False, f"Invalid {data_type} value for column '{name}': {value!r}"
+    
+    value = value if isinstance(value, str) else str(value)
+    match = _LENGTH_PATTERN.match(column['column_type'] or '')
+    if match and len(value) > int(match.group(1)):
+        return False, f"Value for column '{name}' is longer than {match.group(1)} characters"
+    return True, value
+
+
+class TableImporter:
+    """Validate and load a stream of rows into one table"""
+    
+    def __init__(self, table_name, batch_size=None, use_load_data=True, max_rejects_reported=None):
+        """
+        Args:
+            table_name: Target table
+            batch_size: Rows per committed batch (defaults to Config.IMPORT_BATCH_SIZE)
+            use_load_data: Try LOAD DATA LOCAL INFILE when the server allows it
+            max_rejects_reported: Rejected rows listed in the report
+        """
+        self.table_name = table_name
+        self.batch_size = int(batch_size or Config.IMPORT_BATCH_SIZE)
+        self.use_load_data = use_load_data and Config.DB_ALLOW_LOCAL_INFILE
+        self.max_rejects_reported = max_rejects_reported or Config.IMPORT_MAX_REJECTS_REPORTED
+        self._report = None
+    
+    def run(self, stream, file_format='csv'):
+        """
+        Import every row of a binary stream
+        
+        Returns:
+            tuple: (success, report or error_message)
+        """
+        success, schema = Database.get_schema()
+        if not success:
+            return False, schema
+        if not schema.has_table(self.table_name):
+            return False, f"Table '{self.table_name}' does not exist"
+        table = schema.get_table(self.table_name)
+        
+        self._report = {
+            'table': self.table_name,
+            'format': file_format,
+            'method': 'insert',
+            'rows_read': 0,
+            'rows_imported': 0,
+            'rows_rejected': 0,
+            'warnings': 0,
+            'batches': 0,
+            'rejected': [],
+            'warned': []
+        }
+        started = time.monotonic()
+        connection = None
+        columns = None
+        batch = []
+        
+        try:
+            connection = Database.get_connection()
+            # LOAD DATA LOCAL reports skipped and adjusted rows as warnings
+            connection.tolerate_warnings()
+            if self.use_load_data and not self._server_allows_local_infile(connection):
+                self.use_load_data = False
+            if self.use_load_data:
+                self._report['method'] = 'load_data'
+            
+            for line_number, row in read_rows(stream, file_format):
+                self._report['rows_read'] += 1
+                if isinstance(row, str):
+                    self._reject(line_number, row)
+                    continue
+                
+                if columns is None:
+                    success, error = self._check_columns(schema, list(row.keys()))
+                    if not success:
+                        return False, error
+                    columns = list(row.keys())
+                
+                success, values = self._validate_row(table, columns, row, file_format == 'csv')
+                if not success:
+                    self._reject(line_number, values)
+                    continue
+                
+                batch.append((line_number, values))
+                if len(batch) >= self.batch_size:
+                    self._flush(connection, columns, batch)
+                    batch = []
+            
+            if batch:
+                self._flush(connection, columns, batch)
+        
+        except (Error, UnicodeDecodeError, csv.Error) as e:
+            if connection:
+                connection.rollback()
+            logger.error(f"Import into {self.table_name} failed: {e}")
+            return False, f"Import failed after {self._report['rows_imported']} rows: {e}"
+        finally:
+            if connection:
+                connection.close()
+            if self._report['rows_imported']:
+                Database.table_changed(self.table_name, self._report['rows_imported'])
+        
+        elapsed = time.monotonic() - started
+        self._report['elapsed_seconds'] = round(elapsed, 3)
+        self._report['rows_per_second'] = round(self._report['rows_imported'] / elapsed, 1) if elapsed else 0.0
+        logger.info(
+            f"Imported {self._report['rows_imported']} rows into {self.table_name} "
+            f"({self._report['rows_rejected']} rejected, {self._report['rows_per_second']} rows/sec)"
+        )
+        return True, self._report
+    
+    def _check_columns(self, schema, columns):
+        """Check the file's columns against the table before loading anything"""
+        unknown = schema.unknown_columns(self.table_name, columns)
+        if unknown:
+            return False, f"Unknown column(s) for table '{self.table_name}': {', '.join(unknown)}"
+        missing = [column for column in schema.required_columns(self.table_name) if column not in columns]
+        if missing:
+            return False, f"Missing required column(s) for table '{self.table_name}': {', '.join(missing)}"
+        return True, None
+    
+    @staticmethod
+    def _validate_row(table, columns, row, from_csv):
+        """Coerce a row to a tuple of column values"""
+        if set(row.keys()) != set(columns):
+            return False, "Row columns do not match the first row"
+        
+        values = []
+        for name in columns:
+            success, value = coerce_value(table['column_map'][name], row[name], from_csv)
+            if not success:
+                return False, value
+            values.append(value)
+        return True, tuple(values)
+    
+    def _reject(self, line_number, error):
+        """Count a rejected row and keep the first few for the report"""
+        self._report['rows_rejected'] += 1
+        if len(self._report['rejected']) < self.max_rejects_reported:
+            self._report['rejected'].append({'line': line_number, 'error': error})
+    
+    def _warn(self, line_number, warning):
+        """Count a warning on an imported row and keep the first few for the report"""
+        self._report['warnings'] += 1
+        if len(self._report['warned']) < self.max_rejects_reported:
+            self._report['warned'].append({'line': line_number, 'warning': warning})
+    
+    def _report_warnings(self, batch, warnings, skipped=0):
+        """
+        Sort a statement's warnings into rejected rows and warnings
+        
+        Args:
+            batch: The (line_number, values) pairs the statement wrote
+            warnings: (level, code, message) rows of SHOW WARNINGS
+            skipped: Rows of the batch the server did not insert
+        """
+        for _, code, message in warnings:
+            match = _WARNING_ROW_PATTERN.search(message)
+            row = int(match.group(1)) if match else 0
+            line_number = batch[row - 1][0] if 0 < row <= len(batch) else None
+            if skipped and code in SKIPPED_ROW_WARNINGS:
+                skipped -= 1
+                self._reject(line_number, f"Skipped by the server: {message}")
+            else:
+                self._warn(line_number, message)
+        # SHOW WARNINGS lists at most max_error_count warnings
+        for _ in range(skipped):
+            self._reject(None, "Skipped by the server")
+    
+    @staticmethod
+    def _warnings(connection):
+        """Get the warnings of the connection's last statement"""
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SHOW WARNINGS")
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+    
+    def _flush(self, connection, columns, batch):
+        """Load and commit one batch, isolating bad rows if the batch fails"""
+        self._report['batches'] += 1
+        rows = [values for _, values in batch]
+        
+        if self.use_load_data:
+            try:
+                loaded, warnings = self._load_data(connection, columns, rows)
+                connection.commit()
+                self._report['rows_imported'] += loaded
+                self._report_warnings(batch, warnings, len(rows) - loaded)
+                return
+            except Error as e:
+                connection.rollback()
+                logger.warning(f"LOAD DATA failed, falling back to INSERT for this batch: {e}")
+        
+        query = (
+            f"INSERT INTO {self.table_name} ({', '.join(columns)}) "
+            f"VALUES ({', '.join(['%s'] * len(columns))})"
+        )
+        success, result = Database.execute_many(query, rows, connection)
+        if success:
+            warnings = self._warnings(connection)
+            connection.commit()
+            self._report['rows_imported'] += len(rows)
+            self._report_warnings(batch, warnings)
+            return
+        
+        # Retry row by row so one bad row does not reject the whole batch
+        connection.rollback()
+        cursor = connection.cursor()
+        try:
+            for line_number, values in batch:
+                try:
+                    cursor.execute(query, values)
+                    self._report['rows_imported'] += 1
+                    for _, _, message in cursor.fetchwarnings() or []:
+                        self._warn(line_number, message)
+                except Error as e:
+                    self._reject(line_number, str(e))
+            connection.commit()
+        finally:
+            cursor.close()
+    
+    def _load_data(self, connection, columns, rows):
+        """
+        Write a batch to a temporary file and LOAD DATA LOCAL INFILE it
+        
+        Returns:
+            tuple: (rows_loaded, warnings as (level, code, message) rows)
+        """
+        handle, path = tempfile.mkstemp(suffix='.csv', prefix='edudb_import_')
+        try:
+            with os.fdopen(handle, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f, lineterminator='\n')
+                for row in rows:
+                    writer.writerow(self._load_data_value(value) for value in row)
+            
+            cursor = connection.cursor()
+            try:
+                cursor.execute(
+                    f"LOAD DATA LOCAL INFILE %s INTO TABLE {self.table_name} "
+                    "CHARACTER SET utf8mb4 "
+                    "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '\\\\' "
+                    f"LINES TERMINATED BY '\\n' ({', '.join(columns)})",
+                    (path,)
+                )
+                return cursor.rowcount, cursor.fetchwarnings() or []
+            finally:
+                cursor.close()
+        finally:
+            os.unlink(path)
+    
+    @staticmethod
+    def _load_data_value(value):
+        """Format a value for the LOAD DATA file (\\N is NULL)"""
+        if value is None:
+            return '\\N'
+        if isinstance(value, (date, datetime)):
+            return value.isoformat(' ') if isinstance(value, datetime) else value.isoformat()
+        return str(value).replace('\\', '\\\\')
+    
+    @staticmethod
+    def _server_allows_local_infile(connection):
+        """Check the server's local_infile setting"""
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT @@GLOBAL.local_infile")
+            row = cursor.fetchone()
+            return bool(row and int(row[0]))
+        except Error:
+            return False
+        finally:
+            cursor.close()
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Import a CSV or NDJSON file into an EduDB table')
+    parser.add_argument('table', help='Target table name')
+    parser.add_argument('file', help='Path to a .csv or .ndjson file')
+    parser.add_argument('--format', choices=['csv', 'ndjson'], help='File format (default: from extension)')
+    parser.add_argument('--batch-size', type=int, default=Config.IMPORT_BATCH_SIZE, help='Rows per committed batch')
+    parser.add_argument('--no-load-data', action='store_true', help='Never use LOAD DATA LOCAL INFILE')
+    args = parser.parse_args(argv)
+    
+    importer = TableImporter(args.table, batch_size=args.batch_size, use_load_data=not args.no_load_data)
+    with open(args.file, 'rb') as f:
+        success, result = importer.run(f, args.format or detect_format(args.file))
+    
+    if not success:
+        print(f"Import failed: {result}", file=sys.stderr)
+        return 1
+    
+    print(
+        f"Imported {result['rows_imported']} of {result['rows_read']} rows into {result['table']} "
+        f"in {result['elapsed_seconds']}s ({result['rows_per_second']} rows/sec, {result['method']})"
+    )
+    for rejected in result['rejected']:
+        print(f"  line {rejected['line']}: {rejected['error']}")
+    if result['rows_rejected'] > len(result['rejected']):
+        print(f"  ... and {result['rows_rejected'] - len(result['rejected'])} more rejected rows")
+    for warned in result['warned']:
+        print(f"  line {warned['line']} (imported): {warned['warning']}")
+    if result['warnings'] > len(result['warned']):
+        print(f"  ... and {result['warnings'] - len(result['warned'])} more warnings")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+JSON Provider
+
+This module provides the Flask JSON provider used for every response.
+MySQL values that the standard encoder cannot handle (dates, times,
+DECIMAL, BINARY/BLOB) are converted while encoding, in the same pass, so routes
+can return rows exactly as the connector produced them. orjson is used
+when it is installed; otherwise the standard library encoder is used with
+the same conversions.
+"""
+
+import base64
+import json
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def to_json_value(value):
+    """
+    Convert a value the JSON encoders do not support natively
+    
+    Dates and times become ISO 8601 strings, TIME columns (timedelta) and
+    DECIMAL become strings so no precision is lost. Binary columns holding
+    UTF-8 text become strings; other binary values become
+    {"$base64": "<base64 of the bytes>"} so no byte is lost.
+    """
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return str(value)
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (bytes, bytearray)):
+        try:
+            return value.decode('utf-8')
+        except UnicodeDecodeError:
+            return {'$base64': base64.b64encode(value).decode('ascii')}
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class EduDBJSONProvider(JSONProvider):
+    """Flask JSON provider with MySQL type conversion and optional orjson"""
+    
+    # Set to False to force the standard library encoder
+    use_orjson = orjson is not None
+    
+    def dumps(self, obj, **kwargs):
+        """Serialize to a JSON string"""
+        return self._encode(obj).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        """Parse a JSON string or bytes"""
+        if self.use_orjson:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+    
+    def response(self, *args, **kwargs):
+        """Build a JSON response without an intermediate str"""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._encode(obj) + b'\n', mimetype='application/json')
+    
+    def _encode(self, obj):
+        """Serialize to UTF-8 JSON bytes"""
+        if self.use_orjson:
+            return orjson.dumps(obj, default=to_json_value, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(
+            obj, default=to_json_value, ensure_ascii=False, separators=(',', ':')
+        ).encode('utf-8')
@@ -0,0 +1,203 @@
+"""
+Prometheus Metrics
+
+This module keeps request and database counters, gauges and histograms in
+process and renders them in the Prometheus text exposition format. Updates
+take one small lock per metric, so the metrics can stay on permanently.
+Values that other components already track (pool usage, cache hits) are
+read by collectors at scrape time instead of being counted twice.
+"""
+
+import bisect
+import math
+import threading
+
+# Default latency buckets in seconds
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Statement verbs reported as their own label value; everything else is 'other'
+OPERATIONS = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE', 'SHOW', 'CREATE', 'ALTER', 'DROP')
+
+
+def operation(query):
+    """Get the low-cardinality operation label for a SQL statement"""
+    words = query.strip().split(None, 1)
+    verb = words[0].upper() if words else ''
+    return verb.lower() if verb in OPERATIONS else 'other'
+
+
+def _escape(value):
+    """Escape a label value for the text format"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=None):
+    """Render {name="value",...} for a sample"""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    """Render a sample value"""
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def render_histogram(name, help_text, buckets, total, count, labels=''):
+    """
+    Render a histogram from cumulative bucket counts
+    
+    Args:
+        buckets: [(upper_bound, cumulative_count)] ending with +Inf
+        total: Sum of observed values
+        count: Number of observations
+        labels: Extra label pairs for every sample (e.g. 'pool="edudb_pool"')
+    """
+    prefix = labels + ',' if labels else ''
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for bound, cumulative in buckets:
+        lines.append(f'{name}_bucket{{{prefix}le="{_format_value(float(bound))}"}} {cumulative}')
+    suffix = '{' + labels + '}' if labels else ''
+    lines.append(f"{name}_sum{suffix} {_format_value(float(total))}")
+    lines.append(f"{name}_count{suffix} {count}")
+    return lines
+
+
+class _Metric:
+    """Base class for labelled metrics"""
+    
+    kind = None
+    
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        if not self.label_names and self.kind != 'histogram':
+            # Unlabelled series are exported from the start
+            self._values[()] = 0
+    
+    def _key(self, labels):
+        if len(labels) != len(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}")
+        return tuple(str(value) for value in labels)
+    
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+    
+    kind = 'counter'
+    
+    def inc(self, *labels, amount=1):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that goes up and down"""
+    
+    kind = 'gauge'
+    
+    def inc(self, *labels, amount=1):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in fixed buckets"""
+    
+    kind = 'histogram'
+    
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+    
+    def observe(self, value, *labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+    
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Metrics and scrape-time collectors rendered together"""
+    
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+    
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+    
+    def add_collector(self, collector):
+        """Add a callable returning extra exposition lines at scrape time"""
+        self._collectors.append(collector)
+    
+    def render(self):
+        """Render every metric in the text exposition format"""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+# HTTP
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    'edudb_http_requests_total', 'HTTP requests by route and status code', ('method', 'route', 'status')))
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    'edudb_http_request_duration_seconds', 'HTTP request latency by route', ('method', 'route')))
+HTTP_IN_FLIGHT = REGISTRY.register(Gauge(
+    'edudb_http_requests_in_flight', 'HTTP requests being served'))
+
+# Database
+DB_QUERIES = REGISTRY.register(Counter(
+    'edudb_db_queries_total', 'SQL statements executed by operation', ('operation',)))
+DB_QUERY_ERRORS = REGISTRY.register(Counter(
+    'edudb_db_query_errors_total', 'SQL statements that failed by operation', ('operation',)))
+DB_QUERY_LATENCY = REGISTRY.register(Histogram(
+    'edudb_db_query_duration_seconds', 'SQL statement latency by operation', ('operation',)))
+DB_ROLLBACKS = REGISTRY.register(Counter(
+    'edudb_db_rollbacks_total', 'Transactions rolled back after an error'))
@@ -3,10 +3,19 @@ Data Models and Business Logic
 """
 
 from backend.database import Database
+from backend.certificate_pdf import CertificateRenderer
+from backend.write_behind import WriteBehindBuffer
+from config.config import Config
+from mysql.connector import Error
+import atexit
 import json
-from datetime import datetime, date
+import logging
+import threading
+from datetime import datetime, date, timedelta
 import secrets
 
+logger = logging.getLogger(__name__)
+
 
 class Student:
     """Student model"""
@@ -155,65 +164,337 @@ class Enrollment:
 
 
 class Progress:
-    """User progress tracking"""
+    """Per-learner progress tracking"""
     
-    @staticmethod
-    def get_progress():
-        """Get user progress"""
-        query = "SELECT * FROM user_progress LIMIT 1"
-        success, result = Database.execute_query(query)
-        if success and result:
-            return True, result[0]
-        return False, "No progress found"
+    # Columns a learner's progress is saved in
+    FIELDS = (
+        'module_completed',
+        'beginner_score',
+        'intermediate_score',
+        'advanced_score',
+        'total_time_spent'
+    )
+    # Quiz levels; each has a <level>_score column kept up to date by record_answer
+    LEVELS = ('beginner', 'intermediate', 'advanced')
     
-    @staticmethod
-    def update_progress(data):
-        """Update user progress"""
-        query = """
-            UPDATE user_progress 
-            SET module_completed = %s,
-                beginner_score = %s,
-                intermediate_score = %s,
-                advanced_score = %s,
-                beginner_answers = %s,
-                intermediate_answers = %s,
-                advanced_answers = %s,
-                total_time_spent = %s
-            WHERE id = 1
+    # Write-behind buffer for saves; created on first save
+    _buffer = None
+    _buffer_lock = threading.Lock()
+    
+    @classmethod
+    def _get_buffer(cls):
+        """Get the save buffer if write-behind is on"""
+        if not Config.PROGRESS_WRITE_BEHIND:
+            return None
+        if cls._buffer is None:
+            with cls._buffer_lock:
+                if cls._buffer is None:
+                    cls._buffer = WriteBehindBuffer(
+                        cls.write_batch,
+                        interval=Config.PROGRESS_FLUSH_INTERVAL,
+                        max_pending=Config.PROGRESS_FLUSH_MAX_PENDING,
+                        name='progress-flush'
+                    )
+                    # Development server and scripts; gunicorn workers also flush in worker_exit
+                    atexit.register(cls._buffer.close)
+        return cls._buffer
+    
+    @classmethod
+    def flush(cls):
+        """Write buffered saves now and stop the flush thread (on shutdown)"""
+        with cls._buffer_lock:
+            buffer, cls._buffer = cls._buffer, None
+        if buffer is not None:
+            buffer.close()
+    
+    @classmethod
+    def get_buffer_stats(cls):
+        """Get write-behind counters"""
+        if cls._buffer is None:
+            return {'enabled': Config.PROGRESS_WRITE_BEHIND, 'initialized': False}
+        return {'enabled': True, 'initialized': True, **cls._buffer.stats()}
+    
+    @classmethod
+    def get_progress(cls, learner_id):
+        """Get a learner's progress (zeroed if nothing was saved yet), including unflushed saves"""
+        # Primary key lookup; not worth caching since every save invalidates the table
+        query = "SELECT * FROM learner_progress WHERE learner_id = %s"
+        success, result = Database.execute_query(query, (learner_id,), fetch_one=True, use_cache=False)
+        if not success:
+            return False, result
+        if result is None:
+            result = cls.empty(learner_id)
+        
+        # Read your own writes: saves still in the buffer override the row
+        buffer = cls._buffer
+        pending = buffer.get(learner_id) if buffer is not None else None
+        if pending:
+            result.update(pending)
+        return True, result
+    
+    @classmethod
+    def empty(cls, learner_id):
+        """Progress of a learner who has not saved anything"""
+        progress = {field: 0 for field in cls.FIELDS}
+        progress.update({'learner_id': learner_id, 'created_at': None, 'last_activity': None})
+        return progress
+    
+    @classmethod
+    def update_progress(cls, learner_id, data):
         """
-        params = (
-            data.get('module_completed', 0),
-            data.get('beginner_score', 0),
-            data.get('intermediate_score', 0),
-            data.get('advanced_score', 0),
-            json.dumps(data.get('beginner_answers', {})),
-            json.dumps(data.get('intermediate_answers', {})),
-            json.dumps(data.get('advanced_answers', {})),
-            data.get('total_time_spent', 0)
-        )
-        return Database.execute_query(query, params, fetch=False)
+        Save a learner's progress
+        
+        Only the fields present in data are written; the learner's row is
+        created on first save. Each learner has their own row, so saves from
+        different learners never wait on each other's row locks. With
+        write-behind on, the save is merged into the learner's buffered
+        state and written with the next batch.
+        """
+        fields = {field: data[field] for field in cls.FIELDS if field in data}
+        if not fields:
+            return False, "No progress fields provided"
+        
+        buffer = cls._get_buffer()
+        if buffer is not None:
+            buffer.put(learner_id, fields)
+            return True, {"buffered": True}
+        return cls.write_batch({learner_id: fields})
     
-    @staticmethod
-    def reset_progress():
-        """Reset user progress"""
-        query = """
-            UPDATE user_progress 
-            SET module_completed = 0,
-                beginner_score = 0,
-                intermediate_score = 0,
-                advanced_score = 0,
-                beginner_answers = NULL,
-                intermediate_answers = NULL,
-                advanced_answers = NULL,
-                total_time_spent = 0
-            WHERE id = 1
+    @classmethod
+    def write_batch(cls, batch):
+        """
+        Write several learners' progress fields
+        
+        Learners saving the same fields share one multi-row INSERT ... ON
+        DUPLICATE KEY UPDATE. Rows are sent in learner_id order so that
+        concurrent batches lock rows in the same order.
+        
+        Args:
+            batch: {learner_id: {field: value}}
+        
+        Returns:
+            tuple: (success, {"affected_rows"} or error_message)
+        """
+        groups = {}
+        for learner_id in sorted(batch):
+            fields = batch[learner_id]
+            groups.setdefault(tuple(field for field in cls.FIELDS if field in fields), []).append(
+                (learner_id, fields)
+            )
+        
+        affected_rows = 0
+        for columns, learners in groups.items():
+            placeholders = ', '.join(['%s'] * (len(columns) + 1))
+            # Row alias instead of VALUES(), which MySQL 8.0.20+ warns about
+            update_clause = ', '.join(f"{column} = new.{column}" for column in columns)
+            query = (
+                f"INSERT INTO learner_progress (learner_id, {', '.join(columns)}) "
+                f"VALUES ({placeholders}) AS new "
+                f"ON DUPLICATE KEY UPDATE {update_clause}"
+            )
+            rows = [(learner_id, *(fields[column] for column in columns)) for learner_id, fields in learners]
+            success, result = Database.execute_many(query, rows)
+            if not success:
+                return False, result
+            affected_rows += result['affected_rows']
+        return True, {"affected_rows": affected_rows}
+    
+    @classmethod
+    def get_answers(cls, learner_id, level=None):
+        """
+        Get a learner's latest answer to each question
+        
+        Returns:
+            tuple: (success, {level: {question_id: {"answer", "correct",
+                "attempts", "answered_at"}}} or error_message)
+        """
+        query = "SELECT level, question_id, answer, is_correct, attempts, answered_at FROM learner_answers WHERE learner_id = %s"
+        params = (learner_id,)
+        if level is not None:
+            query += " AND level = %s"
+            params += (level,)
+        success, rows = Database.execute_query(query, params, use_cache=False)
+        if not success:
+            return False, rows
+        
+        answers = {name: {} for name in ((level,) if level is not None else cls.LEVELS)}
+        for row in rows:
+            answers[row['level']][row['question_id']] = {
+                'answer': json.loads(row['answer']) if row['answer'] is not None else None,
+                'correct': bool(row['is_correct']),
+                'attempts': row['attempts'],
+                'answered_at': row['answered_at']
+            }
+        return True, answers
+    
+    @classmethod
+    def record_answer(cls, learner_id, level, question_id, answer, correct):
+        """
+        Record a learner's answer to one question
+        
+        The answer replaces the learner's previous answer to the question
+        and the level's score moves by the change in correctness, so each
+        answer writes one small row and one counter however long the quiz
+        is. Both happen in one transaction with the answer row locked.
+        
+        Returns:
+            tuple: (success, {"score", "delta"} or error_message)
         """
-        return Database.execute_query(query, fetch=False)
+        if level not in cls.LEVELS:
+            return False, f"Unknown level '{level}'"
+        score_column = f"{level}_score"
+        
+        # Saves still buffered would overwrite the score later
+        buffer = cls._buffer
+        if buffer is not None and buffer.get(learner_id) is not None:
+            buffer.flush()
+        
+        connection = None
+        cursor = None
+        try:
+            connection = Database.get_connection()
+            cursor = connection.cursor()
+            cursor.execute(
+                "SELECT is_correct FROM learner_answers "
+                "WHERE learner_id = %s AND level = %s AND question_id = %s FOR UPDATE",
+                (learner_id, level, question_id)
+            )
+            previous = cursor.fetchone()
+            delta = int(correct) - (int(previous[0]) if previous else 0)
+            
+            cursor.execute(
+                "INSERT INTO learner_answers (learner_id, level, question_id, answer, is_correct) "
+                "VALUES (%s, %s, %s, %s, %s) AS new "
+                "ON DUPLICATE KEY UPDATE answer = new.answer, is_correct = new.is_correct, "
+                "attempts = attempts + 1",
+                (learner_id, level, question_id, json.dumps(answer), bool(correct))
+            )
+            cursor.execute(
+                f"INSERT INTO learner_progress (learner_id, {score_column}) VALUES (%s, GREATEST(%s, 0)) "
+                f"ON DUPLICATE KEY UPDATE {score_column} = GREATEST({score_column} + %s, 0)",
+                (learner_id, delta, delta)
+            )
+            cursor.execute(f"SELECT {score_column} FROM learner_progress WHERE learner_id = %s", (learner_id,))
+            score = cursor.fetchone()[0]
+            connection.commit()
+        except Error as e:
+            if connection:
+                connection.rollback()
+            logger.error(f"Recording answer for {learner_id} failed: {e}")
+            return False, str(e)
+        finally:
+            if cursor:
+                cursor.close()
+            if connection:
+                connection.close()
+        
+        Database.bump_table_versions(['learner_answers', 'learner_progress'])
+        for table_name in ('learner_answers', 'learner_progress'):
+            Database._invalidate_row_counts(table_name)
+        return True, {"score": score, "delta": delta}
+    
+    @classmethod
+    def reset_progress(cls, learner_id):
+        """Reset a learner's progress and answers"""
+        buffer = cls._buffer
+        if buffer is not None:
+            # Otherwise a later flush would bring the old progress back
+            buffer.discard(learner_id)
+        success, result = Database.execute_query("DELETE FROM learner_answers WHERE learner_id = %s", (learner_id,))
+        if not success:
+            return False, result
+        return Database.execute_query("DELETE FROM learner_progress WHERE learner_id = %s", (learner_id,))
 
 
 class Certificate:
     """Certificate management"""
     
+    # PDF renderer; created on first download
+    _renderer = None
+    _renderer_lock = threading.Lock()
+    
+    @classmethod
+    def _get_renderer(cls):
+        """Get the PDF renderer"""
+        if cls._renderer is None:
+            with cls._renderer_lock:
+                if cls._renderer is None:
+                    cls._renderer = CertificateRenderer(
+                        Config.CERTIFICATE_PDF_DIR,
+                        max_workers=Config.CERTIFICATE_RENDER_WORKERS,
+                        max_bytes=Config.CERTIFICATE_PDF_CACHE_BYTES,
+                        timeout=Config.CERTIFICATE_RENDER_TIMEOUT
+                    )
+        return cls._renderer
+    
+    @classmethod
+    def shutdown_renderer(cls):
+        """Stop the PDF rendering processes (on shutdown)"""
+        with cls._renderer_lock:
+            renderer, cls._renderer = cls._renderer, None
+        if renderer is not None:
+            renderer.shutdown()
+    
+    @classmethod
+    def get_renderer_stats(cls):
+        """Get PDF cache and render counters"""
+        if cls._renderer is None:
+            return {'initialized': False}
+        return {'initialized': True, **cls._renderer.stats()}
+    
+    @staticmethod
+    def pdf_etag(certificate_id):
+        """ETag of a certificate's PDF (known without rendering it)"""
+        return CertificateRenderer.cache_key(certificate_id)
+    
+    @classmethod
+    def get_pdf(cls, certificate):
+        """
+        Get a certificate as a PDF, rendered once and then served from cache
+        
+        Args:
+            certificate: Row of the certificates table (from get_by_id)
+        
+        Returns:
+            tuple: (success, pdf_bytes or error_message)
+        """
+        return cls._get_renderer().get(certificate)
+    
+    @classmethod
+    def get_archive(cls, certificate_ids=None, date_from=None, date_to=None, name_prefix=None):
+        """
+        Render a cohort's certificates into one ZIP archive
+        
+        The cohort is either a list of certificate ids or the certificates
+        matching the search filters. Missing PDFs are rendered in parallel.
+        
+        Returns:
+            tuple: (success, zip_bytes or error_message)
+        """
+        if certificate_ids is not None:
+            if len(certificate_ids) > Config.CERTIFICATE_ARCHIVE_MAX:
+                return False, f"At most {Config.CERTIFICATE_ARCHIVE_MAX} certificates per archive"
+            placeholders = ', '.join(['%s'] * len(certificate_ids))
+            success, certificates = Database.execute_query(
+                f"SELECT * FROM certificates WHERE certificate_id IN ({placeholders}) ORDER BY created_at, id",
+                tuple(certificate_ids)
+            )
+            if not success:
+                return False, certificates
+        else:
+            success, page = cls.search(
+                limit=Config.CERTIFICATE_ARCHIVE_MAX, date_from=date_from, date_to=date_to, name_prefix=name_prefix
+            )
+            if not success:
+                return False, page
+            if page['next_cursor'] is not None:
+                return False, f"More than {len(page['certificates'])} certificates match; narrow the filters"
+            certificates = page['certificates']
+        
+        if not certificates:
+            return False, "No certificates found"
+        return cls._get_renderer().archive(certificates)
+    
     @staticmethod
     def generate_certificate_id():
         """Generate unique certificate ID"""
@@ -250,7 +531,7 @@ class Certificate:
             data.get('total_time', 0)
         )
         
-        success, result = Database.execute_query(query, params, fetch=False)
+        success, result = Database.execute_query(query, params)
         if success:
             return True, {'certificate_id': cert_id}
         return False, result
@@ -262,7 +543,74 @@ class Certificate:
         return Database.execute_query(query, (certificate_id,))
     
     @staticmethod
-    def get_all():
-        """Get all certificates"""
-        query = "SELECT * FROM certificates ORDER BY created_at DESC"
-        return Database.execute_query(query)
+    def _filters(date_from=None, date_to=None, name_prefix=None):
+        """Build the WHERE conditions shared by search and count"""
+        conditions = []
+        params = []
+        if date_from is not None:
+            conditions.append("created_at >= %s")
+            params.append(date_from)
+        if date_to is not None:
+            # date_to is inclusive
+            conditions.append("created_at < %s")
+            params.append(date_to + timedelta(days=1))
+        if name_prefix:
+            escaped = name_prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            conditions.append("student_name LIKE %s")
+            params.append(escaped + '%')
+        return conditions, params
+    
+    @staticmethod
+    def search(limit=None, cursor=None, date_from=None, date_to=None, name_prefix=None):
+        """
+        Get one page of certificates, newest first
+        
+        Pages are read by seeking past the last (created_at, id) of the
+        previous page on idx_created, so every page costs the same however
+        deep it is. Name prefixes are served by idx_student_name.
+        
+        Args:
+            limit: Page size (default Config.CERTIFICATE_PAGE_SIZE, capped at
+                Config.CERTIFICATE_MAX_PAGE_SIZE)
+            cursor: next_cursor from the previous page
+            date_from: Only certificates created on or after this date
+            date_to: Only certificates created on or before this date
+            name_prefix: Only certificates whose student name starts with this
+        
+        Returns:
+            tuple: (success, {"certificates", "next_cursor"} or error_message)
+        """
+        limit = min(max(int(limit or Config.CERTIFICATE_PAGE_SIZE), 1), Config.CERTIFICATE_MAX_PAGE_SIZE)
+        conditions, params = Certificate._filters(date_from, date_to, name_prefix)
+        
+        if cursor is not None:
+            success, last_key = Database._decode_cursor(cursor, 2)
+            if not success:
+                return False, last_key
+            conditions.append("(created_at, id) < (%s, %s)")
+            params.extend(last_key)
+        
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        # Fetch one extra row to know whether another page exists
+        query = f"SELECT * FROM certificates {where_clause} ORDER BY created_at DESC, id DESC LIMIT {limit + 1}"
+        success, rows = Database.execute_query(query, tuple(params) or None)
+        if not success:
+            return False, rows
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = Database._encode_cursor([rows[-1]['created_at'], rows[-1]['id']])
+        return True, {'certificates': rows, 'next_cursor': next_cursor}
+    
+    @staticmethod
+    def count(date_from=None, date_to=None, name_prefix=None):
+        """Count the certificates matching the search filters"""
+        conditions, params = Certificate._filters(date_from, date_to, name_prefix)
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        success, result = Database.execute_query(
+            f"SELECT COUNT(*) AS total FROM certificates {where_clause}", tuple(params) or None, fetch_one=True
+        )
+        if not success:
+            return False, result
+        return True, result['total']
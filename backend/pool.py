@@ -0,0 +1,322 @@
+"""
+Adaptive Connection Pool
+
+This module replaces mysql.connector's fixed-size pool, which raises
+"pool exhausted" as soon as every connection is checked out. The pool here
+grows on demand between a minimum and a maximum size, makes callers wait
+(up to a timeout) for a connection to come back, pings connections that sat
+idle too long, recycles connections by age and keeps usage counters.
+"""
+
+import bisect
+import logging
+import threading
+import time
+from collections import deque
+
+import mysql.connector
+from mysql.connector import Error
+from mysql.connector.errors import PoolError
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PooledConnection:
+    """
+    A checked-out connection
+    
+    Attribute access is forwarded to the underlying MySQL connection, so it
+    can be used like one. close() hands it back to the pool instead of
+    closing the socket.
+    """
+    
+    def __init__(self, pool, connection, created_at, attributes):
+        self._pool = pool
+        self._connection = connection
+        self.created_at = created_at
+        # Per-connection state (e.g. prepared statements) that survives checkouts
+        self.attributes = attributes
+        self.checked_out_at = time.monotonic()
+        self._released = False
+        # (raise_on_warnings, get_warnings) to restore on release, if changed
+        self._warning_settings = None
+    
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+    
+    def tolerate_warnings(self):
+        """
+        Collect warnings in cursor.warnings instead of raising them
+        
+        For statements whose notes are expected (IF [NOT] EXISTS DDL,
+        INSERT IGNORE, LOAD DATA). The pool's setting is restored when the
+        connection is returned.
+        """
+        if self._warning_settings is None:
+            self._warning_settings = (self._connection.raise_on_warnings, self._connection.get_warnings)
+        self._connection.raise_on_warnings = False
+        self._connection.get_warnings = True
+    
+    @property
+    def raw_connection(self):
+        """The underlying MySQL connection"""
+        return self._connection
+    
+    def close(self):
+        """Return the connection to the pool"""
+        if not self._released:
+            self._released = True
+            self._pool.release(self)
+    
+    def discard(self):
+        """Close the underlying connection and free its pool slot"""
+        if not self._released:
+            self._released = True
+            self._pool.discard(self)
+
+
+class ConnectionPool:
+    """Thread-safe MySQL connection pool with a bounded checkout wait"""
+    
+    def __init__(self, pool_name='edudb_pool', min_size=1, max_size=5, timeout=10.0,
+                 pre_ping_idle=30.0, recycle=3600.0, idle_timeout=300.0,
+                 reset_session=True, **connect_args):
+        """
+        Args:
+            pool_name: Name used in log messages
+            min_size: Connections opened up front and kept while idle
+            max_size: Hard limit on open connections
+            timeout: Seconds a checkout waits for a free connection
+            pre_ping_idle: Ping connections idle longer than this before use
+            recycle: Reconnect connections older than this (0 disables)
+            idle_timeout: Close idle connections above min_size after this
+            reset_session: Reset session state when a connection comes back
+            connect_args: Arguments for mysql.connector.connect
+        """
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise PoolError(f"Invalid pool size: min={min_size}, max={max_size}")
+        
+        self.pool_name = pool_name
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.pre_ping_idle = pre_ping_idle
+        self.recycle = recycle
+        self.idle_timeout = idle_timeout
+        self.reset_session = reset_session
+        self._connect_args = connect_args
+        
+        # Idle connections as (connection, created_at, idle_since, attributes), newest last
+        self._idle = deque()
+        self._size = 0
+        self._waiting = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        
+        self._stats = {
+            'checkouts': 0,
+            'timeouts': 0,
+            'created': 0,
+            'closed': 0,
+            'recycled': 0,
+            'ping_failures': 0,
+            'connect_errors': 0
+        }
+        self._wait_counts = [0] * (len(WAIT_BUCKETS) + 1)
+        self._wait_sum = 0.0
+        
+        # Warm up; a failure here means the database is not reachable
+        try:
+            for _ in range(min_size):
+                connection = self._connect()
+                with self._condition:
+                    self._size += 1
+                    self._idle.append((connection, time.monotonic(), time.monotonic(), {}))
+        except Error:
+            self.close_all()
+            raise
+    
+    def get_connection(self, timeout=None):
+        """
+        Check out a connection, waiting up to timeout seconds for one
+        
+        Raises:
+            PoolError: If no connection became available in time
+        """
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise PoolError(f"Connection pool '{self.pool_name}' is closed")
+                if self._idle:
+                    # Most recently used first, so surplus connections go idle and age out
+                    connection, created_at, idle_since, attributes = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    connection, created_at, idle_since, attributes = None, None, None, None
+                    break
+                
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    self._record_wait(time.monotonic() - started)
+                    raise PoolError(
+                        f"Connection pool '{self.pool_name}' exhausted: no connection "
+                        f"available after {timeout:.1f}s ({self.max_size} in use)"
+                    )
+                self._waiting += 1
+                try:
+                    self._condition.wait(remaining)
+                finally:
+                    self._waiting -= 1
+        
+        # Connect, ping or recycle outside the lock; the slot is already reserved
+        try:
+            replacement = self._prepare(connection, created_at, idle_since)
+            if replacement is not None:
+                # A new connection starts without the old one's state
+                connection, created_at, attributes = replacement, time.monotonic(), {}
+        except Error:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        
+        with self._condition:
+            self._stats['checkouts'] += 1
+            self._record_wait(time.monotonic() - started)
+        return PooledConnection(self, connection, created_at, attributes)
+    
+    def release(self, pooled):
+        """Take back a connection checked out with get_connection"""
+        connection = pooled._connection
+        try:
+            if pooled._warning_settings is not None:
+                connection.raise_on_warnings, connection.get_warnings = pooled._warning_settings
+            if connection.unread_result:
+                connection.consume_results()
+            if connection.in_transaction:
+                connection.rollback()
+            if self.reset_session:
+                connection.reset_session()
+        except Error as e:
+            logger.warning(f"Discarding connection that failed to reset: {e}")
+            self.discard(pooled)
+            return
+        
+        now = time.monotonic()
+        with self._condition:
+            if self._closed:
+                self._size -= 1
+                self._close_quietly(connection)
+                return
+            self._idle.append((connection, pooled.created_at, now, pooled.attributes))
+            self._prune_idle(now)
+            self._condition.notify()
+    
+    def discard(self, pooled):
+        """Close a checked-out connection instead of returning it"""
+        self._close_quietly(pooled._connection)
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+    
+    def close_all(self):
+        """Close idle connections and refuse new checkouts"""
+        with self._condition:
+            self._closed = True
+            while self._idle:
+                connection = self._idle.popleft()[0]
+                self._size -= 1
+                self._close_quietly(connection)
+            self._condition.notify_all()
+    
+    def stats(self):
+        """Get pool size, usage counters and the checkout wait histogram"""
+        with self._condition:
+            idle = len(self._idle)
+            cumulative = 0
+            buckets = []
+            # The overflow bucket is '+Inf' as in Prometheus; JSON has no infinity
+            for bound, count in zip(WAIT_BUCKETS + ('+Inf',), self._wait_counts):
+                cumulative += count
+                buckets.append({'le': bound, 'count': cumulative})
+            return {
+                'pool_name': self.pool_name,
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'size': self._size,
+                'in_use': self._size - idle,
+                'idle': idle,
+                'waiting': self._waiting,
+                **self._stats,
+                'wait_seconds': {
+                    'count': cumulative,
+                    'sum': round(self._wait_sum, 6),
+                    'buckets': buckets
+                }
+            }
+    
+    def _prepare(self, connection, created_at, idle_since):
+        """Check a connection before handing it out; return a new one if it must be replaced"""
+        now = time.monotonic()
+        if connection is not None and self.recycle and now - created_at > self.recycle:
+            self._close_quietly(connection)
+            with self._condition:
+                self._stats['recycled'] += 1
+            connection = None
+        elif connection is not None and now - idle_since > self.pre_ping_idle:
+            try:
+                connection.ping(reconnect=False)
+            except Error:
+                self._close_quietly(connection)
+                with self._condition:
+                    self._stats['ping_failures'] += 1
+                connection = None
+        
+        if connection is None:
+            return self._connect()
+        return None
+    
+    def _connect(self):
+        """Open a new MySQL connection"""
+        try:
+            connection = mysql.connector.connect(**self._connect_args)
+        except Error:
+            with self._condition:
+                self._stats['connect_errors'] += 1
+            raise
+        with self._condition:
+            self._stats['created'] += 1
+        return connection
+    
+    def _prune_idle(self, now):
+        """Close connections idle past idle_timeout while above min_size (caller holds the lock)"""
+        while self._size > self.min_size and self._idle:
+            connection, _, idle_since, _ = self._idle[0]
+            if now - idle_since <= self.idle_timeout:
+                break
+            self._idle.popleft()
+            self._size -= 1
+            self._close_quietly(connection)
+    
+    def _record_wait(self, seconds):
+        """Add a checkout wait to the histogram (caller holds the lock)"""
+        self._wait_counts[bisect.bisect_left(WAIT_BUCKETS, seconds)] += 1
+        self._wait_sum += seconds
+    
+    def _close_quietly(self, connection):
+        """Close a connection, ignoring errors from dead sockets"""
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self._condition:
+            self._stats['closed'] += 1
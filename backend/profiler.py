@@ -0,0 +1,223 @@
+"""
+Query Profiler
+
+This module records how long statements take and where the time goes:
+wall time, pool wait, rows returned and examined, the server connection
+and the request that issued the statement. Entries are kept in a bounded
+ring buffer; statements over the slow threshold also get their EXPLAIN
+FORMAT=JSON plan and are appended to a slow-query log file (one JSON
+object per line).
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from mysql.connector import Error
+
+from backend.cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+# Statements EXPLAIN accepts
+EXPLAINABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+# Rows examined by the last finished statement of this session
+ROWS_EXAMINED_QUERY = """
+    SELECT ROWS_EXAMINED
+    FROM performance_schema.events_statements_history
+    WHERE THREAD_ID = PS_CURRENT_THREAD_ID()
+    ORDER BY EVENT_ID DESC
+    LIMIT 1
+"""
+
+# Which request issued the statements running on this thread
+_context = threading.local()
+
+
+def set_source(source):
+    """Tag statements issued by the current thread (e.g. with the Flask endpoint)"""
+    _context.source = source
+
+
+def get_source():
+    """Get the tag set by set_source for the current thread"""
+    return getattr(_context, 'source', None)
+
+
+class QueryProfiler:
+    """Thread-safe ring buffer of statement profiles with a slow-query log"""
+    
+    def __init__(self, buffer_size=1000, slow_ms=200, explain=True, log_file=None):
+        """
+        Args:
+            buffer_size: Number of recent statements kept in memory
+            slow_ms: Statements at or above this wall time count as slow
+            explain: Capture EXPLAIN FORMAT=JSON for slow statements
+            log_file: Path of the append-only slow-query log (None disables it)
+        """
+        self.slow_ms = slow_ms
+        self.explain = explain
+        self.log_file = log_file
+        self.enabled = True
+        self._entries = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self._sequence = 0
+        # Cleared if the server has no performance_schema statement history
+        self._rows_examined_available = True
+    
+    def profile(self, connection, query, params, started, pool_wait, rows_returned, error=None):
+        """
+        Record a statement that ran on a connection
+        
+        The connection must have no unread result. Rows examined and the
+        plan are read from the same session, so this runs before the
+        connection goes back to the pool (and before a commit, which would
+        become the session's last statement).
+        
+        Args:
+            connection: Connection the statement ran on
+            query: SQL text
+            params: Statement parameters
+            started: time.monotonic() when the statement was sent
+            pool_wait: Seconds spent waiting for the connection
+            rows_returned: Rows fetched or affected
+            error: Error message if the statement failed
+        """
+        elapsed_ms = (time.monotonic() - started) * 1000
+        usable = error is None and not connection.unread_result
+        slow = elapsed_ms >= self.slow_ms
+        
+        entry = {
+            'timestamp': datetime.now().isoformat(timespec='milliseconds'),
+            'source': get_source(),
+            'query': normalize_query(query),
+            'params': repr(params) if params else None,
+            'elapsed_ms': round(elapsed_ms, 3),
+            'pool_wait_ms': round(pool_wait * 1000, 3),
+            'rows_returned': rows_returned,
+            'rows_examined': self._rows_examined(connection) if usable else None,
+            'connection_id': connection.connection_id,
+            'slow': slow,
+            'error': error
+        }
+        if slow and usable and self.explain:
+            entry['plan'] = self._explain(connection, query, params)
+        self.record(entry)
+    
+    def record(self, entry):
+        """Add an entry to the ring buffer and log it if slow"""
+        with self._lock:
+            self._sequence += 1
+            entry['seq'] = self._sequence
+            self._entries.append(entry)
+        if entry['slow'] and self.log_file:
+            line = json.dumps(entry, default=str)
+            with self._log_lock:
+                try:
+                    with open(self.log_file, 'a', encoding='utf-8') as f:
+                        f.write(line + '\n')
+                except OSError as e:
+                    logger.warning(f"Could not write slow-query log: {e}")
+    
+    def entries(self, limit=100, min_ms=0, source=None):
+        """Get the most recent entries, newest first"""
+        with self._lock:
+            entries = list(self._entries)
+        selected = []
+        for entry in reversed(entries):
+            if entry['elapsed_ms'] < min_ms or (source and entry['source'] != source):
+                continue
+            selected.append(entry)
+            if len(selected) >= limit:
+                break
+        return selected
+    
+    def summary(self, limit=20):
+        """
+        Aggregate the buffered entries by statement text
+        
+        Returns:
+            list: Statements with count, total/avg/max time and rows, by total time
+        """
+        with self._lock:
+            entries = list(self._entries)
+        groups = {}
+        for entry in entries:
+            group = groups.setdefault(entry['query'], {
+                'query': entry['query'],
+                'sources': set(),
+                'count': 0,
+                'errors': 0,
+                'total_ms': 0.0,
+                'max_ms': 0.0,
+                'rows_returned': 0,
+                'rows_examined': 0
+            })
+            group['count'] += 1
+            group['errors'] += 1 if entry['error'] else 0
+            group['total_ms'] += entry['elapsed_ms']
+            group['max_ms'] = max(group['max_ms'], entry['elapsed_ms'])
+            group['rows_returned'] += entry['rows_returned'] or 0
+            group['rows_examined'] += entry['rows_examined'] or 0
+            if entry['source']:
+                group['sources'].add(entry['source'])
+        ranked = sorted(groups.values(), key=lambda group: group['total_ms'], reverse=True)[:limit]
+        for group in ranked:
+            group['sources'] = sorted(group['sources'])
+            group['total_ms'] = round(group['total_ms'], 3)
+            group['avg_ms'] = round(group['total_ms'] / group['count'], 3)
+        return ranked
+    
+    def clear(self):
+        """Drop the buffered entries (the slow-query log is kept)"""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self):
+        """Get profiler settings and buffer usage"""
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'buffer_size': self._entries.maxlen,
+                'recorded': self._sequence,
+                'slow_ms': self.slow_ms,
+                'explain': self.explain,
+                'log_file': str(self.log_file) if self.log_file else None
+            }
+    
+    def _rows_examined(self, connection):
+        """Read rows examined by the session's last statement"""
+        if not self._rows_examined_available:
+            return None
+        cursor = connection.cursor()
+        try:
+            cursor.execute(ROWS_EXAMINED_QUERY)
+            row = cursor.fetchone()
+            return int(row[0]) if row else None
+        except Error as e:
+            logger.warning(f"Rows examined not available ({e}); no longer reading them")
+            self._rows_examined_available = False
+            return None
+        finally:
+            cursor.close()
+    
+    def _explain(self, connection, query, params):
+        """Get the EXPLAIN FORMAT=JSON plan of a statement"""
+        words = query.strip().split(None, 1)
+        if not words or words[0].upper() not in EXPLAINABLE:
+            return None
+        cursor = connection.cursor()
+        try:
+            cursor.execute(f"EXPLAIN FORMAT=JSON {query}", params)
+            row = cursor.fetchone()
+            return json.loads(row[0]) if row else None
+        except (Error, ValueError) as e:
+            return {'error': str(e)}
+        finally:
+            cursor.close()
@@ -0,0 +1,205 @@
+"""
+Schema Metadata Catalog
+
+This module holds table, column, primary key, index and foreign key
+metadata for the application database. The catalog is built from a single
+batched information_schema query so request paths can answer metadata
+questions with dictionary lookups instead of database round trips.
+"""
+
+# One round trip for everything: each row is tagged with the kind of object
+# it describes. String columns are CAST so the UNION does not mix the
+# different information_schema collations.
+SCHEMA_QUERY = """
+    SELECT 'table' AS kind,
+           CAST(t.TABLE_NAME AS CHAR) AS table_name,
+           NULL AS name,
+           0 AS position,
+           NULL AS column_name,
+           NULL AS data_type,
+           NULL AS column_type,
+           NULL AS is_nullable,
+           NULL AS column_default,
+           NULL AS extra,
+           NULL AS non_unique,
+           NULL AS ref_table,
+           NULL AS ref_column,
+           t.TABLE_ROWS AS table_rows
+    FROM information_schema.TABLES t
+    WHERE t.TABLE_SCHEMA = DATABASE() AND t.TABLE_TYPE = 'BASE TABLE'
+    UNION ALL
+    SELECT 'column',
+           CAST(c.TABLE_NAME AS CHAR),
+           CAST(c.COLUMN_NAME AS CHAR),
+           c.ORDINAL_POSITION,
+           CAST(c.COLUMN_NAME AS CHAR),
+           CAST(c.DATA_TYPE AS CHAR),
+           CAST(c.COLUMN_TYPE AS CHAR),
+           CAST(c.IS_NULLABLE AS CHAR),
+           CAST(c.COLUMN_DEFAULT AS CHAR),
+           CAST(c.EXTRA AS CHAR),
+           NULL, NULL, NULL, NULL
+    FROM information_schema.COLUMNS c
+    WHERE c.TABLE_SCHEMA = DATABASE()
+    UNION ALL
+    SELECT 'index',
+           CAST(s.TABLE_NAME AS CHAR),
+           CAST(s.INDEX_NAME AS CHAR),
+           s.SEQ_IN_INDEX,
+           CAST(s.COLUMN_NAME AS CHAR),
+           NULL, NULL, NULL, NULL, NULL,
+           s.NON_UNIQUE,
+           NULL, NULL, NULL
+    FROM information_schema.STATISTICS s
+    WHERE s.TABLE_SCHEMA = DATABASE()
+    UNION ALL
+    SELECT 'foreign_key',
+           CAST(k.TABLE_NAME AS CHAR),
+           CAST(k.CONSTRAINT_NAME AS CHAR),
+           k.ORDINAL_POSITION,
+           CAST(k.COLUMN_NAME AS CHAR),
+           NULL, NULL, NULL, NULL, NULL, NULL,
+           CAST(k.REFERENCED_TABLE_NAME AS CHAR),
+           CAST(k.REFERENCED_COLUMN_NAME AS CHAR),
+           NULL
+    FROM information_schema.KEY_COLUMN_USAGE k
+    WHERE k.TABLE_SCHEMA = DATABASE() AND k.REFERENCED_TABLE_NAME IS NOT NULL
+    ORDER BY table_name, kind, position, name
+"""
+
+# Snapshot copies live next to the tables they copy but are not part of the catalog
+SNAPSHOT_PREFIX = '_snapshot_'
+
+# Trigger-maintained write counters per table (see Database.install_version_triggers)
+VERSION_TABLE = '_table_versions'
+
+# Statements that change table definitions and must invalidate the catalog
+DDL_KEYWORDS = ('CREATE', 'ALTER', 'DROP', 'RENAME', 'TRUNCATE')
+
+
+def is_ddl(query):
+    """Check whether a SQL statement is DDL"""
+    words = query.strip().split(None, 1)
+    return bool(words) and words[0].upper() in DDL_KEYWORDS
+
+
+class SchemaCatalog:
+    """Immutable snapshot of the database schema"""
+    
+    def __init__(self, tables):
+        """
+        Args:
+            tables: {table_name: table_info} as built by from_rows
+        """
+        self._tables = tables
+        self._table_names = sorted(tables)
+    
+    @classmethod
+    def from_rows(cls, rows):
+        """Build a catalog from the rows returned by SCHEMA_QUERY"""
+        tables = {}
+        
+        def table_info(name):
+            return tables.setdefault(name, {
+                'name': name,
+                'columns': [],
+                'primary_key': [],
+                'indexes': {},
+                'foreign_keys': {},
+                'estimated_rows': 0
+            })
+        
+        for row in rows:
+            if row['table_name'].startswith(SNAPSHOT_PREFIX) or row['table_name'] == VERSION_TABLE:
+                continue
+            table = table_info(row['table_name'])
+            kind = row['kind']
+            
+            if kind == 'table':
+                table['estimated_rows'] = int(row['table_rows'] or 0)
+            elif kind == 'column':
+                extra = (row['extra'] or '').lower()
+                table['columns'].append({
+                    'name': row['column_name'],
+                    'data_type': row['data_type'],
+                    'column_type': row['column_type'],
+                    'nullable': row['is_nullable'] == 'YES',
+                    'default': row['column_default'],
+                    'auto_increment': 'auto_increment' in extra,
+                    'generated': 'virtual generated' in extra or 'stored generated' in extra
+                })
+            elif kind == 'index':
+                index = table['indexes'].setdefault(row['name'], {
+                    'name': row['name'],
+                    'unique': not int(row['non_unique']),
+                    'columns': []
+                })
+                index['columns'].append(row['column_name'])
+                if row['name'] == 'PRIMARY':
+                    table['primary_key'].append(row['column_name'])
+            elif kind == 'foreign_key':
+                foreign_key = table['foreign_keys'].setdefault(row['name'], {
+                    'name': row['name'],
+                    'columns': [],
+                    'ref_table': row['ref_table'],
+                    'ref_columns': []
+                })
+                foreign_key['columns'].append(row['column_name'])
+                foreign_key['ref_columns'].append(row['ref_column'])
+        
+        for table in tables.values():
+            table['column_map'] = {column['name']: column for column in table['columns']}
+        
+        return cls(tables)
+    
+    def table_names(self):
+        """Get the sorted list of table names"""
+        return list(self._table_names)
+    
+    def has_table(self, table_name):
+        """Check whether a table exists"""
+        return table_name in self._tables
+    
+    def get_table(self, table_name):
+        """Get the metadata of a table, or None if it does not exist"""
+        return self._tables.get(table_name)
+    
+    def column_names(self, table_name):
+        """Get the column names of a table in ordinal order"""
+        table = self._tables.get(table_name)
+        return [column['name'] for column in table['columns']] if table else []
+    
+    def primary_key(self, table_name):
+        """Get the primary key columns of a table"""
+        table = self._tables.get(table_name)
+        return list(table['primary_key']) if table else []
+    
+    def unknown_columns(self, table_name, columns):
+        """Get the given column names that do not exist in a table"""
+        table = self._tables.get(table_name)
+        if table is None:
+            return list(columns)
+        return [column for column in columns if column not in table['column_map']]
+    
+    def required_columns(self, table_name):
+        """Get columns that must be provided on INSERT"""
+        table = self._tables.get(table_name)
+        if table is None:
+            return []
+        return [
+            column['name'] for column in table['columns']
+            if not column['nullable'] and column['default'] is None
+            and not column['auto_increment'] and not column['generated']
+        ]
+    
+    def to_dict(self):
+        """Get a JSON-serializable view of the catalog"""
+        return {
+            name: {
+                'columns': [dict(column) for column in table['columns']],
+                'primary_key': list(table['primary_key']),
+                'indexes': list(table['indexes'].values()),
+                'foreign_keys': list(table['foreign_keys'].values())
+            }
+            for name, table in self._tables.items()
+        }
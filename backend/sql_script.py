@@ -0,0 +1,381 @@
+"""
+SQL Script Runner
+
+This module splits MySQL scripts into statements with a tokenizer that
+understands quoted strings, identifiers, comments and DELIMITER changes,
+and runs them in a few round trips. Statements keep the script's order:
+consecutive statements are sent as multi-statement batches, consecutive
+data changes run in one transaction with foreign key checks off, and
+CREATE INDEX statements are deferred past the data loaded after them, up
+to the next schema change. Run it from the project root as a CLI:
+    
+    python -m backend.sql_script database/init_db.sql --password secret
+"""
+
+import argparse
+import getpass
+import logging
+import re
+import sys
+import time
+
+import mysql.connector
+from mysql.connector import Error
+
+from config.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Statements that only make sense in the mysql client or are handled by the caller
+SKIPPED_PREFIXES = ('USE ', 'CREATE DATABASE', 'CREATE SCHEMA')
+DML_PREFIXES = ('INSERT', 'REPLACE', 'UPDATE', 'DELETE', 'LOAD DATA')
+INDEX_PREFIXES = ('CREATE INDEX', 'CREATE UNIQUE INDEX', 'CREATE FULLTEXT INDEX')
+_ALTER_TABLE_PATTERN = re.compile(r'^ALTER TABLE [^ ]+ (.*)$')
+_ADD_INDEX_PATTERN = re.compile(r'^ADD (UNIQUE |FULLTEXT |SPATIAL )?(INDEX|KEY)\b')
+
+# Limits for one multi-statement round trip
+MAX_BATCH_STATEMENTS = 200
+MAX_BATCH_BYTES = 1024 * 1024
+
+
+def split_statements(script):
+    """
+    Split a SQL script into statements
+    
+    Quoted strings ('...', "...", `...`) may contain delimiters, comment
+    markers and escaped quotes. Comments (-- , # and /* */) are dropped,
+    except /*! ... */ version comments, which MySQL executes. DELIMITER
+    lines change the statement terminator as in the mysql client.
+    
+    Returns:
+        list: Statement strings without the trailing delimiter
+    """
+    statements = []
+    current = []
+    delimiter = ';'
+    i = 0
+    length = len(script)
+    at_line_start = True
+    
+    while i < length:
+        char = script[i]
+        
+        # DELIMITER is a client command and only valid at the start of a line
+        if at_line_start and script[i:i + 10].upper() == 'DELIMITER ' and not ''.join(current).strip():
+            end = script.find('\n', i)
+            end = length if end == -1 else end
+            delimiter = script[i + 10:end].strip() or ';'
+            current = []
+            i = end + 1
+            continue
+        
+        if char in ('\'', '"', '`'):
+            end = i + 1
+            while end < length:
+                if script[end] == '\\' and char != '`':
+                    end += 2
+                    continue
+                if script[end] == char:
+                    if end + 1 < length and script[end + 1] == char:
+                        end += 2
+                        continue
+                    break
+                end += 1
+            current.append(script[i:end + 1])
+            i = end + 1
+            at_line_start = False
+            continue
+        
+        if script.startswith('--', i) and (i + 2 >= length or script[i + 2] in ' \t\r\n'):
+            end = script.find('\n', i)
+            i = length if end == -1 else end
+            continue
+        
+        if char == '#':
+            end = script.find('\n', i)
+            i = length if end == -1 else end
+            continue
+        
+        if script.startswith('/*', i):
+            end = script.find('*/', i + 2)
+            end = length if end == -1 else end + 2
+            if script.startswith('/*!', i):
+                current.append(script[i:end])
+            else:
+                current.append(' ')
+            i = end
+            continue
+        
+        if script.startswith(delimiter, i):
+            statement = ''.join(current).strip()
+            if statement:
+                statements.append(statement)
+            current = []
+            i += len(delimiter)
+            at_line_start = False
+            continue
+        
+        current.append(char)
+        if char == '\n':
+            at_line_start = True
+        elif not char.isspace():
+            at_line_start = False
+        i += 1
+    
+    statement = ''.join(current).strip()
+    if statement:
+        statements.append(statement)
+    return statements
+
+
+def classify(statement):
+    """
+    Sort a statement into the kind of step it runs in
+    
+    'index' is CREATE INDEX or an ALTER TABLE that only adds indexes.
+    
+    Returns:
+        str: 'skip', 'ddl', 'dml' or 'index'
+    """
+    upper = ' '.join(statement.upper().split())
+    if upper.startswith(SKIPPED_PREFIXES):
+        return 'skip'
+    # SELECT without FROM only prints a message in the mysql client
+    if upper.startswith('SELECT') and ' FROM ' not in upper:
+        return 'skip'
+    if upper.startswith(INDEX_PREFIXES) or _only_adds_indexes(upper):
+        return 'index'
+    if upper.startswith(DML_PREFIXES):
+        return 'dml'
+    return 'ddl'
+
+
+def _only_adds_indexes(upper):
+    """Check whether a normalized ALTER TABLE statement does nothing but ADD INDEX/KEY"""
+    match = _ALTER_TABLE_PATTERN.match(upper)
+    if not match:
+        return False
+    clauses = []
+    depth = 0
+    start = 0
+    text = match.group(1)
+    for i, char in enumerate(text):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            clauses.append(text[start:i])
+            start = i + 1
+    clauses.append(text[start:])
+    return all(_ADD_INDEX_PATTERN.match(clause.strip()) for clause in clauses)
+
+
+class ScriptRunner:
+    """Execute SQL scripts on one connection in batched steps"""
+    
+    def __init__(self, connection, batch_statements=MAX_BATCH_STATEMENTS, batch_bytes=MAX_BATCH_BYTES):
+        """
+        Args:
+            connection: Open MySQL connection to run the scripts on
+            batch_statements: Maximum statements per round trip
+            batch_bytes: Maximum SQL bytes per round trip
+        """
+        self.connection = connection
+        self.batch_statements = batch_statements
+        self.batch_bytes = batch_bytes
+    
+    def run_file(self, path):
+        """Run a script file; see run()"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return self.run(f.read(), name=str(path))
+    
+    def run(self, script, name='script'):
+        """
+        Run a SQL script
+        
+        Statements run in script order. Runs of consecutive data changes
+        share one transaction with foreign key checks off. Index statements
+        are held back until the next schema change or the end of the script,
+        so indexes are built once over the data loaded in between. A failing
+        statement is logged and skipped without losing the rest; executed
+        only counts statements whose effects were kept.
+        
+        Returns:
+            dict: Counts of executed, skipped and failed statements
+        """
+        started = time.monotonic()
+        steps = []
+        indexes = []
+        skipped = 0
+        statements = split_statements(script)
+        for statement in statements:
+            kind = classify(statement)
+            if kind == 'skip':
+                skipped += 1
+                continue
+            if kind == 'index':
+                indexes.append(statement)
+                continue
+            if kind == 'ddl' and indexes:
+                steps.append(('index', indexes))
+                indexes = []
+            if steps and steps[-1][0] == kind:
+                steps[-1][1].append(statement)
+            else:
+                steps.append((kind, [statement]))
+        if indexes:
+            steps.append(('index', indexes))
+        
+        report = {
+            'script': name,
+            'statements': len(statements),
+            'executed': 0,
+            'skipped': skipped,
+            'failed': [],
+            'round_trips': 0
+        }
+        
+        for kind, step in steps:
+            if kind != 'dml':
+                self._run_step(step, report)
+                continue
+            self._run_statements(["SET SESSION foreign_key_checks = 0"])
+            try:
+                self._run_step(step, report, transactional=True)
+                self.connection.commit()
+            finally:
+                self._run_statements(["SET SESSION foreign_key_checks = 1"])
+        
+        report['elapsed_seconds'] = round(time.monotonic() - started, 3)
+        logger.info(
+            f"{name}: {report['executed']} statements in {report['round_trips']} round trips, "
+            f"{report['skipped']} skipped, {len(report['failed'])} failed ({report['elapsed_seconds']}s)"
+        )
+        return report
+    
+    def _run_step(self, statements, report, transactional=False):
+        """
+        Run statements in multi-statement batches
+        
+        MySQL stops a batch at its first failing statement. Outside a
+        transaction the statements before it have taken effect; in one, the
+        batch runs under a savepoint and is rolled back to it, so the
+        statements before the failure are sent again. Either way the failing
+        statement is recorded and the batch continues without it.
+        """
+        prefix = ["SAVEPOINT script_batch"] if transactional else []
+        for batch in self._batches(statements):
+            remaining = batch
+            while remaining:
+                report['round_trips'] += 1
+                completed, error = self._try_statements(prefix + remaining)
+                if error is None:
+                    report['executed'] += len(remaining)
+                    break
+                
+                completed -= len(prefix)
+                if completed < 0:
+                    raise error
+                if transactional:
+                    # Raises if the transaction itself was lost (e.g. a deadlock)
+                    self._run_statements(["ROLLBACK TO SAVEPOINT script_batch"])
+                else:
+                    report['executed'] += completed
+                
+                statement = remaining[completed]
+                logger.error(f"Statement failed: {error}")
+                logger.error(f"  Statement: {statement[:100]}...")
+                report['failed'].append({'statement': statement[:200], 'error': str(error)})
+                remaining = (remaining[:completed] if transactional else []) + remaining[completed + 1:]
+    
+    def _try_statements(self, batch):
+        """
+        Send statements in one round trip and drain every result
+        
+        Returns:
+            tuple: (statements completed, Error that stopped the batch or None)
+        """
+        cursor = self.connection.cursor()
+        completed = 0
+        try:
+            if len(batch) == 1:
+                cursor.execute(batch[0])
+                if cursor.with_rows:
+                    cursor.fetchall()
+                completed = 1
+            else:
+                for result in cursor.execute(';\n'.join(batch), multi=True):
+                    if result.with_rows:
+                        result.fetchall()
+                    completed += 1
+            return completed, None
+        except Error as e:
+            return completed, e
+        finally:
+            cursor.close()
+    
+    def _run_statements(self, batch):
+        """Send statements in one round trip, raising the first error"""
+        _, error = self._try_statements(batch)
+        if error is not None:
+            raise error
+    
+    def _batches(self, statements):
+        """Group statements under the statement and byte limits"""
+        batch = []
+        size = 0
+        for statement in statements:
+            statement_size = len(statement.encode('utf-8'))
+            if batch and (len(batch) >= self.batch_statements or size + statement_size > self.batch_bytes):
+                yield batch
+                batch = []
+                size = 0
+            batch.append(statement)
+            size += statement_size
+        if batch:
+            yield batch
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Run SQL scripts against an EduDB MySQL server')
+    parser.add_argument('scripts', nargs='+', help='SQL script files, run in order')
+    parser.add_argument('--host', default=Config.DB_HOST)
+    parser.add_argument('--port', type=int, default=Config.DB_PORT)
+    parser.add_argument('--user', default=Config.DB_USER)
+    parser.add_argument('--password', help='MySQL password (prompted if omitted)')
+    parser.add_argument('--database', default=Config.DB_NAME, help='Database to create and use')
+    args = parser.parse_args(argv)
+    
+    password = args.password if args.password is not None else getpass.getpass('MySQL password: ')
+    logging.basicConfig(level=logging.INFO)
+    
+    try:
+        connection = mysql.connector.connect(host=args.host, port=args.port, user=args.user, password=password)
+    except Error as e:
+        print(f"Connection failed: {e}", file=sys.stderr)
+        return 1
+    
+    failed = 0
+    try:
+        cursor = connection.cursor()
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{args.database}`")
+        cursor.execute(f"USE `{args.database}`")
+        cursor.close()
+        
+        runner = ScriptRunner(connection)
+        for path in args.scripts:
+            report = runner.run_file(path)
+            failed += len(report['failed'])
+            print(
+                f"{path}: {report['executed']} executed, {report['skipped']} skipped, "
+                f"{len(report['failed'])} failed in {report['elapsed_seconds']}s"
+            )
+    finally:
+        connection.close()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Prepared Statement Cache
+
+This module keeps server-side prepared statements open per connection so
+hot parameterized queries are parsed and planned once per connection and
+then executed over the binary protocol. Each pooled connection carries its
+own LRU of prepared cursors, which lives as long as the connection does.
+"""
+
+import threading
+from collections import OrderedDict
+
+from mysql.connector import Error
+
+# Aggregated over every connection so the hit rate can be measured
+_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'errors': 0}
+_stats_lock = threading.Lock()
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def get_stats():
+    """Get prepared statement cache counters for all connections"""
+    with _stats_lock:
+        lookups = _stats['hits'] + _stats['misses']
+        return {
+            **_stats,
+            'hit_rate': round(_stats['hits'] / lookups, 4) if lookups else 0.0
+        }
+
+
+def can_prepare(query, params):
+    """Check whether a query should use a prepared statement"""
+    if not params or not isinstance(params, (tuple, list)):
+        # Dict params are rewritten on every call, so they never hit the cache
+        return False
+    words = query.strip().split(None, 1)
+    return bool(words) and words[0].upper() in ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+
+class StatementCache:
+    """LRU of prepared cursors bound to one MySQL connection"""
+    
+    def __init__(self, connection, max_size=64):
+        """
+        Args:
+            connection: Underlying MySQL connection (not the pool wrapper)
+            max_size: Maximum number of statements kept prepared
+        """
+        self.connection = connection
+        self.max_size = max_size
+        self._cursors = OrderedDict()
+    
+    def execute(self, query, params):
+        """
+        Execute a query on its cached prepared cursor
+        
+        The connector only skips re-preparing when it is handed the very
+        same string object, so the object stored with the cursor is the one
+        passed on every call.
+        
+        Returns:
+            Cursor holding the statement's result
+        """
+        entry = self._cursors.get(query)
+        if entry is not None:
+            self._cursors.move_to_end(query)
+            _count('hits')
+        else:
+            _count('misses')
+            entry = (query, self.connection.cursor(prepared=True, dictionary=True))
+            self._cursors[query] = entry
+            while len(self._cursors) > self.max_size:
+                _, (_, evicted) = self._cursors.popitem(last=False)
+                self._close_cursor(evicted)
+                _count('evictions')
+        
+        statement, cursor = entry
+        try:
+            cursor.execute(statement, tuple(params))
+        except Error:
+            # Drop the statement; it is re-prepared on next use
+            _count('errors')
+            self._cursors.pop(query, None)
+            self._close_cursor(cursor)
+            raise
+        return cursor
+    
+    def clear(self):
+        """Close every prepared statement"""
+        while self._cursors:
+            _, (_, cursor) = self._cursors.popitem()
+            self._close_cursor(cursor)
+    
+    def __len__(self):
+        return len(self._cursors)
+    
+    @staticmethod
+    def _close_cursor(cursor):
+        """Deallocate a prepared statement, ignoring dead connections"""
+        try:
+            cursor.close()
+        except Error:
+            pass
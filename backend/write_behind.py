@@ -0,0 +1,123 @@
+"""
+Write-Behind Buffer
+
+This module keeps the latest unsaved fields per key in memory and writes
+them out in batches from a background thread. Repeated saves of the same
+key between flushes are merged, so the database takes one write per key
+per flush window no matter how often it was saved. Batches are flushed on
+an interval, as soon as enough keys are dirty, and on shutdown; a failed
+batch is merged back and retried on the next flush.
+"""
+
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """Per-key field buffer flushed in batches by a background thread"""
+    
+    def __init__(self, flush_batch, interval=2.0, max_pending=500, name='write-behind'):
+        """
+        Args:
+            flush_batch: Callable taking {key: {field: value}} and returning
+                (success, result/error_message)
+            interval: Seconds between flushes
+            max_pending: Dirty keys that trigger a flush before the interval
+            name: Name of the flush thread (also used in log messages)
+        """
+        self.flush_batch = flush_batch
+        self.interval = interval
+        self.max_pending = max_pending
+        self.name = name
+        self._pending = {}
+        self._lock = threading.Lock()
+        # Held while a batch is written so discard() can wait for it
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._stats = {'saves': 0, 'flushes': 0, 'rows_written': 0, 'failed_flushes': 0}
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+    
+    def put(self, key, fields):
+        """Merge fields into the key's unsaved state"""
+        with self._lock:
+            self._pending.setdefault(key, {}).update(fields)
+            self._stats['saves'] += 1
+            full = len(self._pending) >= self.max_pending
+        if full:
+            self._wakeup.set()
+    
+    def get(self, key):
+        """Get a copy of the key's unsaved fields, or None"""
+        with self._lock:
+            fields = self._pending.get(key)
+            return dict(fields) if fields is not None else None
+    
+    def discard(self, key):
+        """Drop a key's unsaved fields, waiting for a flush that may be writing them"""
+        with self._flush_lock:
+            with self._lock:
+                self._pending.pop(key, None)
+    
+    def flush(self):
+        """
+        Write every dirty key now
+        
+        Returns:
+            int: Number of keys written
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            
+            try:
+                success, result = self.flush_batch(batch)
+            except Exception as e:
+                success, result = False, str(e)
+            
+            with self._lock:
+                self._stats['flushes'] += 1
+                if success:
+                    self._stats['rows_written'] += len(batch)
+                    return len(batch)
+                # Keep the batch; fields saved since it was taken win
+                self._stats['failed_flushes'] += 1
+                for key, fields in batch.items():
+                    self._pending[key] = {**fields, **self._pending.get(key, {})}
+            logger.error(f"{self.name}: flush of {len(batch)} entries failed, will retry: {result}")
+            return 0
+    
+    def close(self):
+        """Stop the flush thread and write what is left"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join(timeout=self.interval + 5)
+        self.flush()
+    
+    def stats(self):
+        """Get save, flush and pending counters"""
+        with self._lock:
+            saves = self._stats['saves']
+            return {
+                **self._stats,
+                'pending': len(self._pending),
+                'interval': self.interval,
+                'max_pending': self.max_pending,
+                # Saves absorbed in memory per row written
+                'coalescing_ratio': round(saves / self._stats['rows_written'], 2) if self._stats['rows_written'] else 0.0
+            }
+    
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            if self._closed:
+                return
+            self.flush()
@@ -19,6 +19,15 @@ class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'edudb-secret-key-change-in-production')
     PORT = int(os.getenv('PORT', 5000))
     HOST = os.getenv('HOST', '127.0.0.1')
+    OPEN_BROWSER = True
+    
+    # Production Server Settings (python run.py --production)
+    # Every worker process has its own connection pool, so the database sees
+    # up to SERVER_WORKERS * DB_POOL_MAX_SIZE connections
+    SERVER_WORKERS = int(os.getenv('SERVER_WORKERS', min(os.cpu_count() or 1, 8)))
+    SERVER_THREADS = int(os.getenv('SERVER_THREADS', 8))  # per worker
+    SERVER_TIMEOUT = int(os.getenv('SERVER_TIMEOUT', 120))  # seconds before a stuck worker is restarted
+    SERVER_GRACEFUL_TIMEOUT = int(os.getenv('SERVER_GRACEFUL_TIMEOUT', 30))  # seconds to finish requests on shutdown
     
     # Database Settings
     DB_HOST = os.getenv('DB_HOST', 'localhost')
@@ -26,12 +35,99 @@ class Config:
     DB_USER = os.getenv('DB_USER', 'root')
     DB_PASSWORD = os.getenv('DB_PASSWORD', '1234')
     DB_NAME = os.getenv('DB_NAME', 'edudb')
+    # Lets the client send files for LOAD DATA LOCAL INFILE (bulk import)
+    DB_ALLOW_LOCAL_INFILE = os.getenv('DB_ALLOW_LOCAL_INFILE', 'false').lower() in ('1', 'true', 'yes')
     
     # Database Connection Pool Settings
-    DB_POOL_SIZE = 5
+    DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', 2))
+    DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 20))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))  # seconds to wait for a connection
+    DB_POOL_PRE_PING_IDLE = float(os.getenv('DB_POOL_PRE_PING_IDLE', 30))  # ping if idle longer
+    DB_POOL_RECYCLE = float(os.getenv('DB_POOL_RECYCLE', 3600))  # reconnect after this age
+    DB_POOL_IDLE_TIMEOUT = float(os.getenv('DB_POOL_IDLE_TIMEOUT', 300))  # shrink towards min size
     DB_POOL_NAME = 'edudb_pool'
     DB_POOL_RESET_SESSION = True
     
+    # Prepared Statement Settings
+    # Parameterized queries run as server-side prepared statements cached per
+    # connection. Session reset would deallocate them, so the pool only rolls
+    # back returned connections while this is on.
+    DB_PREPARED_STATEMENTS = os.getenv('DB_PREPARED_STATEMENTS', 'false').lower() in ('1', 'true', 'yes')
+    DB_STATEMENT_CACHE_SIZE = int(os.getenv('DB_STATEMENT_CACHE_SIZE', 64))  # per connection
+    
+    # Table Pagination Settings
+    # Tables estimated below this many rows get an exact COUNT(*) once;
+    # larger ones keep the information_schema estimate until asked for exact.
+    # Counts are cached per process (off with several production workers)
+    ROW_COUNT_CACHE = os.getenv('ROW_COUNT_CACHE', 'true').lower() in ('1', 'true', 'yes')
+    TABLE_COUNT_EXACT_THRESHOLD = int(os.getenv('TABLE_COUNT_EXACT_THRESHOLD', 100000))
+    TABLE_MAX_PAGE_SIZE = int(os.getenv('TABLE_MAX_PAGE_SIZE', 1000))  # largest limit of /api/tables/<table>
+    
+    # Query Result Cache Settings (off unless QUERY_CACHE_ENABLED is set)
+    QUERY_CACHE_ENABLED = os.getenv('QUERY_CACHE_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+    QUERY_CACHE_MAX_ENTRIES = int(os.getenv('QUERY_CACHE_MAX_ENTRIES', 1024))
+    QUERY_CACHE_MAX_BYTES = int(os.getenv('QUERY_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+    QUERY_CACHE_TTL = int(os.getenv('QUERY_CACHE_TTL', 60))  # seconds
+    
+    # Bulk Write Settings
+    BULK_CHUNK_SIZE = int(os.getenv('BULK_CHUNK_SIZE', 500))  # rows per statement
+    BULK_MAX_ROWS = int(os.getenv('BULK_MAX_ROWS', 10000))  # rows per request
+    
+    # Export Settings
+    EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 1000))  # rows per fetch
+    
+    # Import Settings
+    IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', 1000))  # rows per commit
+    IMPORT_MAX_REJECTS_REPORTED = 100
+    
+    # Studio Query Limits (/api/execute-query)
+    QUERY_TIMEOUT_MS = int(os.getenv('QUERY_TIMEOUT_MS', 5000))
+    QUERY_MAX_ROWS = int(os.getenv('QUERY_MAX_ROWS', 1000))
+    QUERY_MAX_BYTES = int(os.getenv('QUERY_MAX_BYTES', 4 * 1024 * 1024))
+    QUERY_KILL_GRACE = float(os.getenv('QUERY_KILL_GRACE', 1.0))  # seconds past the limit before KILL QUERY
+    
+    # Parallel Read Settings (table page + count, /api/overview)
+    QUERY_FANOUT_WORKERS = int(os.getenv('QUERY_FANOUT_WORKERS', 4))  # connections used at once, per process
+    QUERY_FANOUT_TIMEOUT_MS = int(os.getenv('QUERY_FANOUT_TIMEOUT_MS', 5000))  # per-query limit
+    OVERVIEW_PAGE_SIZE = int(os.getenv('OVERVIEW_PAGE_SIZE', 10))  # rows per table in /api/overview
+    
+    # Certificate Listing Settings (/api/certificates)
+    CERTIFICATE_PAGE_SIZE = int(os.getenv('CERTIFICATE_PAGE_SIZE', 50))
+    CERTIFICATE_MAX_PAGE_SIZE = int(os.getenv('CERTIFICATE_MAX_PAGE_SIZE', 500))
+    
+    # Certificate PDF Settings (/api/certificate/<id>/pdf, /api/certificates/archive)
+    CERTIFICATE_RENDER_WORKERS = int(os.getenv('CERTIFICATE_RENDER_WORKERS', 2))  # processes, per server process
+    CERTIFICATE_RENDER_TIMEOUT = float(os.getenv('CERTIFICATE_RENDER_TIMEOUT', 30))  # seconds
+    CERTIFICATE_PDF_DIR = Path(os.getenv('CERTIFICATE_PDF_DIR', BASE_DIR / 'certificate_pdfs'))
+    CERTIFICATE_PDF_CACHE_BYTES = int(os.getenv('CERTIFICATE_PDF_CACHE_BYTES', 32 * 1024 * 1024))
+    CERTIFICATE_ARCHIVE_MAX = int(os.getenv('CERTIFICATE_ARCHIVE_MAX', 500))  # certificates per archive
+    
+    # Query Profiler Settings (off unless PROFILE_QUERIES is set; can be
+    # switched at runtime through /api/profile)
+    PROFILE_QUERIES = os.getenv('PROFILE_QUERIES', 'false').lower() in ('1', 'true', 'yes')
+    PROFILE_BUFFER_SIZE = int(os.getenv('PROFILE_BUFFER_SIZE', 1000))  # statements kept in memory
+    PROFILE_SLOW_MS = float(os.getenv('PROFILE_SLOW_MS', 200))
+    PROFILE_EXPLAIN = True  # capture EXPLAIN FORMAT=JSON for slow statements
+    PROFILE_LOG_FILE = BASE_DIR / 'slow_queries.log'
+    
+    # Snapshot Settings
+    # Sample data tables captured when the database is provisioned; a reset
+    # restores them from the 'pristine' snapshot
+    SNAPSHOT_TABLES = ['students', 'teachers', 'courses', 'enrollments']
+    PRISTINE_SNAPSHOT = 'pristine'
+    
+    # Table Version Settings
+    # Table GETs carry an ETag built from a per-table write version and
+    # answer If-None-Match with 304 without querying the table. Versions are
+    # kept in process unless TABLE_VERSION_TRIGGERS is set, in which case
+    # triggers count every write (other workers and external clients too)
+    TABLE_ETAGS = os.getenv('TABLE_ETAGS', 'true').lower() in ('1', 'true', 'yes')
+    TABLE_VERSION_TRIGGERS = os.getenv('TABLE_VERSION_TRIGGERS', 'false').lower() in ('1', 'true', 'yes')
+    
+    # Change Feed Settings (/api/tables/<table>/changes)
+    CHANGE_FEED_SIZE = int(os.getenv('CHANGE_FEED_SIZE', 1000))  # events kept in memory
+    CHANGE_FEED_MAX_ROW_EVENTS = 100  # bulk writes above this publish one reload event
+    
     # Exercise Settings
     PASSING_SCORE = 80  # Minimum percentage to pass each level
     HINTS_PER_QUESTION = 3
@@ -49,6 +145,10 @@ class Config:
     PAGES_DIR = FRONTEND_DIR / 'pages'
     DATABASE_DIR = BASE_DIR / 'database'
     
+    # Asset Settings
+    # Re-read pages and static files when they change on disk (development)
+    ASSET_RELOAD = os.getenv('ASSET_RELOAD', str(DEBUG)).lower() in ('1', 'true', 'yes')
+    
     # Logging Settings
     LOG_LEVEL = 'INFO'
     LOG_FILE = BASE_DIR / 'edudb.log'
@@ -57,6 +157,16 @@ class Config:
     SESSION_TYPE = 'filesystem'
     PERMANENT_SESSION_LIFETIME = 3600  # 1 hour
     
+    # Learner Settings: progress is stored per learner id, taken from the
+    # X-Learner-ID header or this cookie (set on first use)
+    LEARNER_COOKIE = 'edudb_learner'
+    LEARNER_COOKIE_MAX_AGE = 365 * 24 * 3600  # 1 year
+    # Buffer progress saves in memory and write them in batches; the last
+    # interval of saves is lost if a worker is killed without shutting down
+    PROGRESS_WRITE_BEHIND = os.getenv('PROGRESS_WRITE_BEHIND', 'true').lower() in ('1', 'true', 'yes')
+    PROGRESS_FLUSH_INTERVAL = float(os.getenv('PROGRESS_FLUSH_INTERVAL', 2.0))  # seconds
+    PROGRESS_FLUSH_MAX_PENDING = int(os.getenv('PROGRESS_FLUSH_MAX_PENDING', 500))  # learners
+    
     @classmethod
     def get_database_config(cls):
         """Returns database configuration dictionary"""
@@ -69,7 +179,8 @@ class Config:
             'charset': 'utf8mb4',
             'collation': 'utf8mb4_unicode_ci',
             'autocommit': False,
-            'raise_on_warnings': True
+            'raise_on_warnings': True,
+            'allow_local_infile': cls.DB_ALLOW_LOCAL_INFILE
         }
     
     @classmethod
@@ -77,10 +188,24 @@ class Config:
         """Returns connection pool configuration"""
         return {
             'pool_name': cls.DB_POOL_NAME,
-            'pool_size': cls.DB_POOL_SIZE,
-            'pool_reset_session': cls.DB_POOL_RESET_SESSION,
+            'min_size': cls.DB_POOL_MIN_SIZE,
+            'max_size': cls.DB_POOL_MAX_SIZE,
+            'timeout': cls.DB_POOL_TIMEOUT,
+            'pre_ping_idle': cls.DB_POOL_PRE_PING_IDLE,
+            'recycle': cls.DB_POOL_RECYCLE,
+            'idle_timeout': cls.DB_POOL_IDLE_TIMEOUT,
+            'reset_session': cls.DB_POOL_RESET_SESSION and not cls.DB_PREPARED_STATEMENTS,
             **cls.get_database_config()
         }
+    
+    @classmethod
+    def get_query_cache_config(cls):
+        """Returns query result cache configuration"""
+        return {
+            'max_entries': cls.QUERY_CACHE_MAX_ENTRIES,
+            'max_bytes': cls.QUERY_CACHE_MAX_BYTES,
+            'ttl': cls.QUERY_CACHE_TTL
+        }
 
 
 class DevelopmentConfig(Config):
@@ -93,6 +218,8 @@ class ProductionConfig(Config):
     """Production configuration"""
     DEBUG = False
     TESTING = False
+    OPEN_BROWSER = False
+    ASSET_RELOAD = False
     # In production, these should come from environment variables
     SECRET_KEY = os.getenv('SECRET_KEY')
 
@@ -3,20 +3,37 @@ USE edudb;
 
 -- Drop tables if they exist
 DROP TABLE IF EXISTS certificates;
+DROP TABLE IF EXISTS learner_answers;
+DROP TABLE IF EXISTS learner_progress;
+-- Single-row progress table used before progress was kept per learner
 DROP TABLE IF EXISTS user_progress;
 
--- User progress table
-CREATE TABLE user_progress (
-    id INT PRIMARY KEY AUTO_INCREMENT,
-    module_completed INT DEFAULT 0,
-    beginner_score INT DEFAULT 0,
-    intermediate_score INT DEFAULT 0,
-    advanced_score INT DEFAULT 0,
-    beginner_answers JSON,
-    intermediate_answers JSON,
-    advanced_answers JSON,
-    total_time_spent INT DEFAULT 0,
-    last_activity TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+-- Learner progress table: one row per learner, keyed by the learner id
+-- (browser cookie or X-Learner-ID header), so learners never write the same row
+CREATE TABLE learner_progress (
+    learner_id VARCHAR(64) NOT NULL,
+    module_completed INT NOT NULL DEFAULT 0,
+    beginner_score INT NOT NULL DEFAULT 0,
+    intermediate_score INT NOT NULL DEFAULT 0,
+    advanced_score INT NOT NULL DEFAULT 0,
+    total_time_spent INT NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_activity TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (learner_id),
+    INDEX idx_last_activity (last_activity)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Learner answers table: a learner's latest answer to each question, one row
+-- per question, so recording an answer never rewrites the others
+CREATE TABLE learner_answers (
+    learner_id VARCHAR(64) NOT NULL,
+    level ENUM('beginner', 'intermediate', 'advanced') NOT NULL,
+    question_id INT NOT NULL,
+    answer JSON,
+    is_correct BOOLEAN NOT NULL DEFAULT FALSE,
+    attempts INT NOT NULL DEFAULT 1,
+    answered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (learner_id, level, question_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Certificates table
@@ -30,12 +47,12 @@ CREATE TABLE certificates (
     advanced_score INT NOT NULL,
     overall_score DECIMAL(5,2) NOT NULL,
     total_time INT NOT NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    -- Newest-first listing and date ranges seek on (created_at, id)
+    INDEX idx_created (created_at, id),
+    -- Student name prefix search
+    INDEX idx_student_name (student_name, created_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
--- Initialize user progress with a default record
-INSERT INTO user_progress (module_completed, beginner_score, intermediate_score, advanced_score, total_time_spent) 
-VALUES (0, 0, 0, 0, 0);
-
 -- Display success message
 SELECT 'Application tables created successfully!' AS Status;
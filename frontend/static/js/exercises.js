@@ -19,6 +19,14 @@ let progress = {
     advanced: { score: 0, completed: false }
 };
 
+// Every level has 15 questions; a level is passed at 80%
+const QUESTIONS_PER_LEVEL = 15;
+const PASSING_PERCENTAGE = 80;
+
+function isPassingScore(levelScore, total = QUESTIONS_PER_LEVEL) {
+    return Math.round((levelScore / total) * 100) >= PASSING_PERCENTAGE;
+}
+
 // Initialize
 document.addEventListener('DOMContentLoaded', () => {
     loadProgress();
@@ -66,23 +74,63 @@ function setupEventListeners() {
     document.getElementById('generate-certificate').addEventListener('click', generateCertificate);
 }
 
-// Load progress from localStorage or API
-function loadProgress() {
+// Load progress from localStorage, then from this learner's saved progress on the server
+async function loadProgress() {
     const saved = localStorage.getItem('edudb_progress');
     if (saved) {
         progress = JSON.parse(saved);
         updateLevelButtons();
         displayScores();
     }
+    
+    try {
+        const response = await fetch('/api/progress');
+        const result = await response.json();
+        if (result.success) {
+            ['beginner', 'intermediate', 'advanced'].forEach(level => {
+                const serverScore = result.progress[`${level}_score`] || 0;
+                if (serverScore > progress[level].score) {
+                    progress[level] = { score: serverScore, completed: isPassingScore(serverScore) };
+                }
+            });
+            localStorage.setItem('edudb_progress', JSON.stringify(progress));
+            updateLevelButtons();
+            displayScores();
+        }
+    } catch (error) {
+        // Offline: keep the local copy
+    }
 }
 
-// Save progress
+// Save progress locally (the server keeps its scores from recorded answers)
 function saveProgress() {
     localStorage.setItem('edudb_progress', JSON.stringify(progress));
     updateLevelButtons();
     displayScores();
 }
 
+// Record one answer for this learner on the server
+async function recordAnswer(question, answer, correct) {
+    try {
+        const response = await fetch('/api/progress/answers', {
+            method: 'PATCH',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                level: currentLevel,
+                question_id: question.id,
+                answer: answer,
+                correct: correct
+            })
+        });
+        const result = await response.json();
+        if (!result.success) {
+            showToast(`Your answer was not saved: ${result.error}`, 'error');
+        }
+    } catch (error) {
+        showToast('Your answer was not saved (server unreachable)', 'error');
+    }
+}
+
 // Update level button states
 function updateLevelButtons() {
     // Beginner always available
@@ -347,6 +395,7 @@ function submitAnswer() {
         answer: userAnswer,
         correct: isCorrect
     };
+    recordAnswer(question, userAnswer, isCorrect);
     
     isAnswerSubmitted = true;
     
@@ -494,6 +543,7 @@ function skipQuestion() {
         answer: null,
         correct: false
     };
+    recordAnswer(questions[currentQuestionIndex], null, false);
     
     isAnswerSubmitted = true;
     updateProgressCounts();
@@ -533,17 +583,16 @@ function showResults() {
     if (timerInterval) clearInterval(timerInterval);
     
     // Update progress
+    const percentage = Math.round((score / questions.length) * 100);
+    const passed = isPassingScore(score, questions.length);
     progress[currentLevel].score = score;
-    progress[currentLevel].completed = true;
+    progress[currentLevel].completed = passed;
     saveProgress();
     
     // Hide quiz, show results
     document.getElementById('quiz-area').classList.add('hidden');
     document.getElementById('results-screen').classList.remove('hidden');
     
-    const percentage = Math.round((score / questions.length) * 100);
-    const passed = percentage >= 80;
-    
     // Update results screen
     document.getElementById('results-icon').textContent = passed ? '🎉' : '📚';
     document.getElementById('results-title').textContent = passed ? 
@@ -601,8 +650,9 @@ async function generateCertificate() {
         const result = await response.json();
         
         if (result.success) {
-            alert(`Certificate generated! ID: ${result.certificate_id}\n\nNote: In a full implementation, this would download a PDF certificate.`);
             document.getElementById('certificate-modal').classList.add('hidden');
+            // Rendered on the server; later downloads come from its cache
+            window.open(`/api/certificate/${encodeURIComponent(result.certificate_id)}/pdf`, '_blank');
         } else {
             alert('Error generating certificate: ' + result.error);
         }
@@ -7,15 +7,83 @@
 let currentModule = 1;
 let currentTable = 'students';
 let tableData = {};
+let tableTotals = {};
 let currentRecord = null;
 
+// Tables with at least this many rows are fetched in the compact columnar format
+const COLUMNAR_THRESHOLD = 500;
+
 // Load initial data
 document.addEventListener('DOMContentLoaded', () => {
     loadModule(1);
     loadTableData('students');
     setupEventListeners();
+    followChanges();
 });
 
+// Apply other learners' writes to the table shown by polling its change feed
+const CHANGE_POLL_MS = 3000;
+// {table, time, feeds: {feedId: next}}: each worker process has its own feed
+let changeCursor = null;
+
+function followChanges() {
+    setInterval(pollChanges, CHANGE_POLL_MS);
+}
+
+async function pollChanges() {
+    const cursor = changeCursor;
+    if (document.hidden || !cursor || cursor.table !== currentTable) {
+        return;
+    }
+    try {
+        const cursors = Object.entries(cursor.feeds).map(([feed, next]) => `${feed}:${next}`).join(',');
+        const response = await fetch(`/api/tables/${cursor.table}/changes?cursors=${cursors}&time=${cursor.time}`);
+        const result = await response.json();
+        // A table load or another poll moved the cursor meanwhile
+        if (!result.success || changeCursor !== cursor) {
+            return;
+        }
+        changeCursor = { ...cursor, feeds: { ...cursor.feeds, [result.feed]: result.next } };
+        if (result.reload) {
+            // Fell behind the server's buffer: the table must be fetched again
+            loadTableData(cursor.table, true);
+            return;
+        }
+        result.events.forEach(applyChange);
+    } catch (error) {
+        // Try again on the next poll
+    }
+}
+
+function applyChange(change) {
+    if (change.op === 'reload' || change.key === null) {
+        // Also without a single-column key: there is nothing to match rows on
+        if (change.table === '*' || change.table === currentTable) {
+            loadTableData(currentTable, true);
+        }
+        return;
+    }
+    
+    const rows = tableData[change.table];
+    if (!rows) {
+        return;
+    }
+    const index = rows.findIndex(row => String(row[change.key]) === String(change.id));
+    if (change.op === 'delete') {
+        if (index !== -1) {
+            rows.splice(index, 1);
+        }
+    } else if (index !== -1) {
+        Object.assign(rows[index], change.data);
+    } else if (change.op !== 'update') {
+        // Columns filled by defaults appear after the next full load
+        rows.push({ [change.key]: change.id, ...change.data });
+    }
+    if (change.table === currentTable) {
+        renderTable(currentTable, rows);
+    }
+}
+
 // Setup event listeners
 function setupEventListeners() {
     // Content tabs (Database Basics, Python, SQL, Output)
@@ -212,12 +280,16 @@ async function loadTableData(tableName, skipCodeUpdate = false) {
     container.innerHTML = '<div class="text-center py-8"><div class="spinner mx-auto mb-3"></div><p class="text-gray-500">Loading...</p></div>';
     
     try {
-        const response = await fetch(`/api/tables/${tableName}`);
+        const columnar = (tableTotals[tableName] || 0) >= COLUMNAR_THRESHOLD;
+        const response = await fetch(`/api/tables/${tableName}${columnar ? '?format=columnar' : ''}`);
         const data = await response.json();
         
         if (data.success) {
-            tableData[tableName] = data.data;
-            renderTable(tableName, data.data);
+            const rows = data.format === 'columnar' ? rowsFromColumnar(data.data) : data.data;
+            tableTotals[tableName] = data.total;
+            tableData[tableName] = rows;
+            changeCursor = { table: tableName, time: data.changes.time, feeds: { [data.changes.feed]: data.changes.next } };
+            renderTable(tableName, rows);
             
             // Only update code if skipCodeUpdate is false (not in live coding mode)
             if (!skipCodeUpdate) {
@@ -229,7 +301,7 @@ async function loadTableData(tableName, skipCodeUpdate = false) {
                 document.getElementById('output-result').innerHTML = `
                     <div class="bg-green-50 border border-green-200 p-3 rounded">
                         <p class="text-green-800 font-semibold">✓ Query executed successfully</p>
-                        <p class="text-sm text-gray-600 mt-1">Retrieved ${data.data.length} records from ${tableName} table</p>
+                        <p class="text-sm text-gray-600 mt-1">Retrieved ${rows.length} records from ${tableName} table</p>
                     </div>
                 `;
             }
@@ -264,6 +336,20 @@ async function loadTableData(tableName, skipCodeUpdate = false) {
     }
 }
 
+// Turn a columnar result ({columns, types, values}) back into row objects
+function rowsFromColumnar(result) {
+    const count = result.values.length ? result.values[0].length : 0;
+    const rows = new Array(count);
+    for (let i = 0; i < count; i++) {
+        const row = {};
+        result.columns.forEach((col, j) => {
+            row[col] = result.values[j][i];
+        });
+        rows[i] = row;
+    }
+    return rows;
+}
+
 // Render table
 function renderTable(tableName, data) {
     if (!data || data.length === 0) {
@@ -523,7 +609,7 @@ async function resetDatabase() {
 // Execute custom query (for module demonstrations)
 async function executeCustomQuery(query) {
     try {
-        const response = await fetch('/api/execute-query', {
+        const response = await fetch('/api/execute-query?format=columnar', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ query })
@@ -535,8 +621,8 @@ async function executeCustomQuery(query) {
             showPythonCode('SELECT', 'custom', null, null, query);
             
             // Display results
-            if (result.data.length > 0) {
-                const columns = Object.keys(result.data[0]);
+            if (result.row_count > 0) {
+                const columns = result.data.columns;
                 let html = '<div class="overflow-x-auto"><table class="min-w-full text-sm border">';
                 html += '<thead class="bg-gray-100"><tr>';
                 columns.forEach(col => {
@@ -544,15 +630,19 @@ async function executeCustomQuery(query) {
                 });
                 html += '</tr></thead><tbody>';
                 
-                result.data.forEach(row => {
+                for (let i = 0; i < result.row_count; i++) {
                     html += '<tr>';
-                    columns.forEach(col => {
-                        html += `<td class="px-3 py-2 border">${row[col] !== null ? row[col] : '<span class="text-gray-400 italic">NULL</span>'}</td>`;
+                    result.data.values.forEach(values => {
+                        html += `<td class="px-3 py-2 border">${values[i] !== null ? values[i] : '<span class="text-gray-400 italic">NULL</span>'}</td>`;
                     });
                     html += '</tr>';
-                });
+                }
                 
                 html += '</tbody></table></div>';
+                if (result.truncated) {
+                    const limit = result.truncated_reason === 'bytes' ? 'size' : 'row';
+                    html += `<p class="text-amber-600 text-sm mt-2">Showing the first ${result.row_count} rows (result ${limit} limit reached)</p>`;
+                }
                 document.getElementById('output-result').innerHTML = html;
             } else {
                 document.getElementById('output-result').innerHTML = 
@@ -812,7 +902,7 @@ async function viewTableStructure(tableName) {
 }
 
 // Show all tables
-function showAllTables() {
+async function showAllTables() {
     showSQL('SHOW TABLES;');
     
     const code = `import mysql.connector
@@ -839,14 +929,30 @@ connection.close()`;
     document.querySelector('#python-code code').textContent = code;
     hljs.highlightElement(document.querySelector('#python-code code'));
     
+    let items = ['students', 'teachers', 'courses', 'enrollments'].map(name => `<li>${name}</li>`);
+    try {
+        // Counts and first rows of every table in one request
+        const response = await fetch('/api/overview');
+        const data = await response.json();
+        if (data.success) {
+            items = Object.entries(data.tables).map(([name, table]) => {
+                if (table.error) {
+                    return `<li>${name}</li>`;
+                }
+                tableTotals[name] = table.total;
+                const approx = table.total_exact ? '' : '~';
+                return `<li>${name} <span class="text-gray-500">(${approx}${table.total} rows)</span></li>`;
+            });
+        }
+    } catch (error) {
+        // Keep the static list
+    }
+    
     document.getElementById('output-result').innerHTML = `
         <div>
             <h4 class="font-bold mb-2">Tables in edudb:</h4>
             <ul class="list-disc pl-6 space-y-1">
-                <li>students</li>
-                <li>teachers</li>
-                <li>courses</li>
-                <li>enrollments</li>
+                ${items.join('')}
             </ul>
         </div>
     `;
@@ -2,8 +2,12 @@
 """
 EduDB Application Entry Point
 Run this file to start the server
+    
+    python run.py                  Development server, opens a browser
+    python run.py --production     Multi-process gunicorn server
 """
 
+import argparse
 import sys
 import os
 import webbrowser
@@ -13,26 +17,114 @@ from threading import Timer
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from backend.app import app
-from config.config import Config
+from backend.database import Database
+from backend.models import Certificate, Progress
+from config.config import Config, ProductionConfig
 
-def open_browser():
+def open_browser(host, port):
     """Open browser after a short delay"""
-    webbrowser.open(f'http://{Config.HOST}:{Config.PORT}')
+    webbrowser.open(f'http://{host}:{port}')
+
+def post_fork(server, worker):
+    """Give each worker its own connection pool and warm it up"""
+    # Never share sockets inherited from the master process
+    Database.close_pool()
+    if Database.initialize_pool():
+        # Load the schema catalog so the first requests skip that round trip
+        Database.get_schema()
+
+def worker_exit(server, worker):
+    """Write buffered progress and close the worker's connections once in-flight requests are done"""
+    Progress.flush()
+    Certificate.shutdown_renderer()
+    Database.close_pool()
+
+def configure_workers(workers):
+    """Turn off what is only correct within one process when there are several workers"""
+    if workers <= 1:
+        return
+    # The result and row count caches are invalidated by this process's
+    # writes only, so another worker's write would leave them stale
+    if Config.QUERY_CACHE_ENABLED or Config.ROW_COUNT_CACHE:
+        print(" Query result and row count caches off: they are per worker")
+    Config.QUERY_CACHE_ENABLED = False
+    Config.ROW_COUNT_CACHE = False
+    if not Config.TABLE_VERSION_TRIGGERS:
+        # In-process versions miss writes made by the other workers
+        app.config['TABLE_ETAGS'] = False
+        print(" Table ETags off: set TABLE_VERSION_TRIGGERS=true to share versions between workers")
+
+def run_production(host, port, workers, threads):
+    """Serve the app with gunicorn worker processes and threads"""
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        print("Production mode needs gunicorn (pip install gunicorn; not available on Windows)", file=sys.stderr)
+        return 1
+    
+    class EduDBServer(BaseApplication):
+        """Embedded gunicorn application serving the Flask app"""
+        
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+        
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+        
+        def load(self):
+            return self.application
+    
+    app.config.from_object(ProductionConfig)
+    configure_workers(workers)
+    options = {
+        'bind': f'{host}:{port}',
+        'workers': workers,
+        'threads': threads,
+        'worker_class': 'gthread',
+        'timeout': Config.SERVER_TIMEOUT,
+        'graceful_timeout': Config.SERVER_GRACEFUL_TIMEOUT,
+        # Import the app once in the master; workers fork from it
+        'preload_app': True,
+        'post_fork': post_fork,
+        'worker_exit': worker_exit
+    }
+    
+    print(f" Production server on http://{host}:{port} ({workers} workers x {threads} threads)")
+    EduDBServer(app, options).run()
+    return 0
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Start the EduDB server')
+    parser.add_argument('--production', action='store_true',
+                        default=os.getenv('EDUDB_ENV') == 'production',
+                        help='Run under gunicorn with several worker processes')
+    parser.add_argument('--host', default=Config.HOST)
+    parser.add_argument('--port', type=int, default=Config.PORT)
+    parser.add_argument('--workers', type=int, default=Config.SERVER_WORKERS)
+    parser.add_argument('--threads', type=int, default=Config.SERVER_THREADS)
+    args = parser.parse_args()
+    
     print("=" * 60)
     print(" EduDB - Learn MySQL with Python")
     print("=" * 60)
-    print(f" Server starting on: http://{Config.HOST}:{Config.PORT}")
+    
+    if args.production:
+        sys.exit(run_production(args.host, args.port, args.workers, args.threads))
+    
+    print(f" Server starting on: http://{args.host}:{args.port}")
     print(" Press CTRL+C to stop the server")
     print("=" * 60)
     print()
     
-    Timer(1.0, open_browser).start()
+    if Config.OPEN_BROWSER:
+        Timer(1.0, open_browser, (args.host, args.port)).start()
     
     app.run(
-        host=Config.HOST,
-        port=Config.PORT,
+        host=args.host,
+        port=args.port,
         debug=Config.DEBUG,
-        use_reloader=False  
+        use_reloader=False
     )
@@ -0,0 +1,48 @@
+"""Tests for the table-versioned result cache"""
+
+from backend.cache import ResultCache, is_cacheable, referenced_tables
+from backend.database import Database
+
+
+def test_entries_go_stale_when_a_table_they_read_is_written():
+    cache = ResultCache(ttl=0)
+    key = ResultCache.make_key("SELECT * FROM students WHERE id = %s", (1,))
+    tables = referenced_tables("SELECT * FROM students WHERE id = %s", ['students', 'courses'])
+    cache.put(key, [{'id': 1}], tables, Database._current_versions(tables))
+    
+    assert cache.get(key, Database._current_versions) == (True, [{'id': 1}])
+    
+    Database.bump_table_versions(['courses'])
+    assert cache.get(key, Database._current_versions)[0] is True
+    
+    Database.bump_table_versions(['students'])
+    assert cache.get(key, Database._current_versions) == (False, None)
+    assert cache.stats()['stale'] == 1
+
+
+def test_a_write_of_unknown_tables_makes_every_entry_stale():
+    cache = ResultCache(ttl=0)
+    key = ResultCache.make_key("SELECT COUNT(*) FROM courses")
+    cache.put(key, {'total': 3}, ['courses'], Database._current_versions(['courses']))
+    
+    Database.bump_table_versions()
+    
+    assert cache.get(key, Database._current_versions) == (False, None)
+
+
+def test_equivalent_queries_share_a_key_and_hits_are_copies():
+    cache = ResultCache(ttl=0)
+    cache.put(ResultCache.make_key("SELECT *  FROM students;"), [{'id': 1}], [], {})
+    
+    hit, rows = cache.get(ResultCache.make_key("SELECT * FROM students"), lambda tables: {})
+    rows[0]['id'] = 2
+    
+    assert hit
+    assert cache.get(ResultCache.make_key("SELECT * FROM students"), lambda tables: {})[1] == [{'id': 1}]
+
+
+def test_volatile_and_locking_reads_are_not_cacheable():
+    assert is_cacheable("SELECT * FROM students")
+    assert not is_cacheable("SELECT NOW()")
+    assert not is_cacheable("SELECT * FROM students FOR UPDATE")
+    assert not is_cacheable("UPDATE students SET name = 'x'")
@@ -0,0 +1,45 @@
+"""Tests for conditional certificate PDF downloads"""
+
+import pytest
+
+from backend.app import app
+from backend.models import Certificate
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Test client with one issued certificate, 'abc', whose renders are counted"""
+    renders = []
+    
+    def get_by_id(certificate_id):
+        return True, [{'certificate_id': certificate_id}] if certificate_id == 'abc' else []
+    
+    def get_pdf(certificate):
+        renders.append(certificate['certificate_id'])
+        return True, b'%PDF-1.4'
+    
+    monkeypatch.setattr(Certificate, 'get_by_id', get_by_id)
+    monkeypatch.setattr(Certificate, 'get_pdf', get_pdf)
+    client = app.test_client()
+    client.renders = renders
+    return client
+
+
+def test_a_matching_etag_is_answered_without_rendering(client):
+    first = client.get('/api/certificate/abc/pdf')
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    
+    second = client.get('/api/certificate/abc/pdf', headers={'If-None-Match': etag})
+    
+    assert second.status_code == 304
+    assert client.renders == ['abc']
+
+
+def test_a_missing_certificate_is_not_found_even_with_a_matching_etag(client):
+    etag = '"%s"' % Certificate.pdf_etag('gone')
+    
+    response = client.get('/api/certificate/gone/pdf', headers={'If-None-Match': etag})
+    
+    assert response.status_code == 404
+    assert client.renders == []
@@ -0,0 +1,97 @@
+"""Tests for the change feed"""
+
+import os
+
+from backend.changes import ALL_TABLES, ChangeFeed
+from backend.database import Database
+
+
+def test_events_after_a_cursor_are_returned_in_order():
+    feed = ChangeFeed(10)
+    start = feed.position()
+    feed.publish('students', 'insert', 1, {'name': 'Ada'}, 'id')
+    feed.publish('courses', 'update', 7, {'title': 'SQL'}, 'course_id')
+    feed.publish('students', 'delete', 1, key='id')
+    
+    result = feed.since(start['next'], feed_id=start['feed'])
+    
+    assert [event['op'] for event in result['events']] == ['insert', 'update', 'delete']
+    assert result['events'][1]['key'] == 'course_id'
+    assert result['next'] == start['next'] + 3
+    assert result['reload'] is False
+    assert feed.since(result['next'])['events'] == []
+
+
+def test_events_are_filtered_by_table_and_limited():
+    feed = ChangeFeed(10)
+    start = feed.position()['next']
+    feed.publish('courses', 'insert', 1)
+    feed.publish('students', 'insert', 2)
+    feed.publish(ALL_TABLES, 'reload')
+    feed.publish('students', 'insert', 3)
+    
+    result = feed.since(start, tables={'students'}, limit=2)
+    
+    assert [(event['table'], event['id']) for event in result['events']] == [('students', 2), (ALL_TABLES, None)]
+    # The next poll continues after the last event sent
+    assert result['next'] == start + 3
+    assert [event['id'] for event in feed.since(result['next'], tables={'students'})['events']] == [3]
+
+
+def test_a_cursor_older_than_the_buffer_gets_a_reload():
+    feed = ChangeFeed(3)
+    start = feed.position()['next']
+    for record_id in range(5):
+        feed.publish('students', 'insert', record_id)
+    
+    result = feed.since(start)
+    
+    assert result['reload'] is True
+    assert result['events'] == []
+    assert result['next'] == start + 5
+    assert feed.since(start + 2)['reload'] is False
+
+
+def test_a_cursor_of_another_feed_only_repositions():
+    feed = ChangeFeed(10)
+    other = ChangeFeed(10)
+    feed.publish('students', 'insert', 1)
+    
+    result = feed.since(other.position()['next'], feed_id=other.feed_id)
+    
+    assert result == {'events': [], 'feed': feed.feed_id, 'next': feed.position()['next'], 'reload': False}
+
+
+def test_a_feed_without_a_cursor_sends_the_events_since_the_load_time():
+    feed = ChangeFeed(10)
+    feed.publish('students', 'insert', 1)
+    loaded = feed.position()['time'] + 1
+    feed._times[0] = loaded - 10
+    feed.publish('students', 'insert', 2)
+    feed._times[1] = loaded
+    
+    result = feed.since(None, feed_id='other', since_time=loaded)
+    
+    assert [event['id'] for event in result['events']] == [2]
+    assert result['reload'] is False
+
+
+def test_events_since_a_time_that_left_the_buffer_get_a_reload():
+    feed = ChangeFeed(2)
+    loaded = feed.position()['time']
+    for record_id in range(3):
+        feed.publish('students', 'insert', record_id)
+    
+    assert feed.since(None, since_time=loaded)['reload'] is True
+
+
+def test_each_process_gets_its_own_feed(monkeypatch):
+    parent = Database._change_feed()
+    assert Database._change_feed() is parent
+    
+    # A forked worker has another pid
+    monkeypatch.setattr(os, 'getpid', lambda: -1)
+    child = Database._change_feed()
+    
+    assert child is not parent
+    assert child.feed_id != parent.feed_id
@@ -0,0 +1,37 @@
+"""Tests for columnar result sets"""
+
+from mysql.connector import FieldType
+
+from backend import columnar
+
+DESCRIPTION = [('id', FieldType.LONG), ('name', FieldType.VAR_STRING)]
+
+
+def test_rows_become_one_value_list_per_column():
+    result = columnar.from_rows(DESCRIPTION, [(1, 'Ada'), (2, 'Grace'), (3, 'Linus')])
+    
+    assert result == {
+        'columns': ['id', 'name'],
+        'types': ['LONG', 'VAR_STRING'],
+        'values': [[1, 2, 3], ['Ada', 'Grace', 'Linus']]
+    }
+    assert columnar.row_count(result) == 3
+    assert columnar.column(result, 'name') == ['Ada', 'Grace', 'Linus']
+
+
+def test_head_keeps_the_first_rows_of_every_column():
+    result = columnar.from_rows(DESCRIPTION, [(1, 'Ada'), (2, 'Grace'), (3, 'Linus')])
+    
+    first = columnar.head(result, 2)
+    
+    assert first['values'] == [[1, 2], ['Ada', 'Grace']]
+    assert first['columns'] == result['columns']
+    assert columnar.row_count(result) == 3
+
+
+def test_empty_results_keep_their_columns():
+    result = columnar.from_rows(DESCRIPTION, [])
+    
+    assert result['values'] == [[], []]
+    assert columnar.row_count(result) == 0
+    assert columnar.row_count(columnar.from_rows(None, [])) == 0
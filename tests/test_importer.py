@@ -0,0 +1,44 @@
+"""Tests for sorting LOAD DATA and INSERT warnings in the import report"""
+
+import pytest
+
+from backend.importer import TableImporter
+
+
+@pytest.fixture
+def importer():
+    importer = TableImporter('students', batch_size=10, use_load_data=False, max_rejects_reported=10)
+    importer._report = {'rows_rejected': 0, 'warnings': 0, 'rejected': [], 'warned': []}
+    return importer
+
+
+BATCH = [(2, ('a',)), (3, ('b',)), (5, ('c',))]
+
+
+def test_skipped_rows_are_rejected_and_other_warnings_are_not(importer):
+    warnings = [
+        ('Warning', 1062, "Duplicate entry 'a' for key 'students.PRIMARY'"),
+        ('Warning', 1265, "Data truncated for column 'name' at row 3")
+    ]
+    importer._report_warnings(BATCH, warnings, skipped=1)
+    
+    assert importer._report['rows_rejected'] == 1
+    assert importer._report['rejected'] == [
+        {'line': None, 'error': "Skipped by the server: Duplicate entry 'a' for key 'students.PRIMARY'"}
+    ]
+    assert importer._report['warnings'] == 1
+    assert importer._report['warned'] == [{'line': 5, 'warning': "Data truncated for column 'name' at row 3"}]
+
+
+def test_inserted_rows_with_warnings_are_not_rejected(importer):
+    importer._report_warnings(BATCH, [('Warning', 1366, "Incorrect integer value at row 1")])
+    
+    assert importer._report['rows_rejected'] == 0
+    assert importer._report['warned'] == [{'line': 2, 'warning': "Incorrect integer value at row 1"}]
+
+
+def test_skipped_rows_without_a_listed_warning_are_still_rejected(importer):
+    importer._report_warnings(BATCH, [], skipped=2)
+    
+    assert importer._report['rows_rejected'] == 2
+    assert importer._report['rejected'] == [{'line': None, 'error': "Skipped by the server"}] * 2
@@ -0,0 +1,63 @@
+"""Tests for the MySQL value conversions of the JSON provider"""
+
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+import pytest
+from flask import Flask
+
+from backend.json_provider import EduDBJSONProvider, orjson, to_json_value
+
+ENCODERS = [False] + ([True] if orjson is not None else [])
+
+
+@pytest.fixture(params=ENCODERS, ids=lambda use_orjson: 'orjson' if use_orjson else 'json')
+def app(request):
+    app = Flask(__name__)
+    app.json = EduDBJSONProvider(app)
+    app.json.use_orjson = request.param
+    return app
+
+
+@pytest.fixture
+def provider(app):
+    return app.json
+
+
+def test_decimals_and_times_keep_their_precision(provider):
+    row = {
+        'price': Decimal('12345678901234567890.125'),
+        'duration': timedelta(hours=26, minutes=3, seconds=4),
+        'starts': time(9, 30),
+        'day': date(2024, 2, 29)
+    }
+    
+    assert provider.loads(provider.dumps(row)) == {
+        'price': '12345678901234567890.125',
+        'duration': '1 day, 2:03:04',
+        'starts': '09:30:00',
+        'day': '2024-02-29'
+    }
+
+
+def test_datetimes_are_iso_8601(provider):
+    assert provider.loads(provider.dumps([datetime(2024, 1, 2, 3, 4, 5)])) == ['2024-01-02T03:04:05']
+
+
+def test_utf8_bytes_are_text_and_other_bytes_are_base64(provider):
+    row = {'text': 'héllo'.encode('utf-8'), 'blob': bytearray(b'\x89PNG\x00\xff')}
+    
+    assert provider.loads(provider.dumps(row)) == {'text': 'héllo', 'blob': {'$base64': 'iVBORwD/'}}
+
+
+def test_unsupported_values_fail_loudly():
+    with pytest.raises(TypeError):
+        to_json_value(object())
+
+
+def test_responses_are_json(app, provider):
+    with app.app_context():
+        response = provider.response({'total': Decimal('1.50')})
+    
+    assert response.mimetype == 'application/json'
+    assert provider.loads(response.get_data()) == {'total': '1.50'}
@@ -0,0 +1,68 @@
+"""Tests for the Prometheus text exposition rendering"""
+
+from backend import metrics
+
+
+def test_counters_render_labelled_samples_sorted_and_escaped():
+    counter = metrics.Counter('requests_total', 'Requests', ('route', 'status'))
+    counter.inc('/b', 200)
+    counter.inc('/a "x"\n', 500, amount=2)
+    counter.inc('/b', 200)
+    
+    assert counter.render() == [
+        '# HELP requests_total Requests',
+        '# TYPE requests_total counter',
+        'requests_total{route="/a \\"x\\"\\n",status="500"} 2',
+        'requests_total{route="/b",status="200"} 2'
+    ]
+
+
+def test_unlabelled_gauges_are_exported_from_the_start():
+    gauge = metrics.Gauge('in_flight', 'Requests being served')
+    assert gauge.render()[-1] == 'in_flight 0'
+    
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+    assert gauge.render()[-1] == 'in_flight 1'
+
+
+def test_histograms_render_cumulative_buckets_sum_and_count():
+    histogram = metrics.Histogram('latency_seconds', 'Latency', ('route',), buckets=(0.1, 1))
+    histogram.observe(0.05, '/a')
+    histogram.observe(0.1, '/a')
+    histogram.observe(0.5, '/a')
+    histogram.observe(3, '/a')
+    
+    assert histogram.render()[2:] == [
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="1"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a"} 3.65',
+        'latency_seconds_count{route="/a"} 4'
+    ]
+
+
+def test_render_histogram_from_collected_buckets():
+    lines = metrics.render_histogram('wait_seconds', 'Wait', [(0.5, 1), (float('inf'), 3)], 2.0, 3, 'pool="p"')
+    
+    assert lines[2:] == [
+        'wait_seconds_bucket{pool="p",le="0.5"} 1',
+        'wait_seconds_bucket{pool="p",le="+Inf"} 3',
+        'wait_seconds_sum{pool="p"} 2',
+        'wait_seconds_count{pool="p"} 3'
+    ]
+
+
+def test_registry_renders_metrics_then_collectors():
+    registry = metrics.Registry()
+    registry.register(metrics.Counter('a_total', 'A'))
+    registry.add_collector(lambda: ['# TYPE b gauge', 'b 5'])
+    
+    assert registry.render() == '# HELP a_total A\n# TYPE a_total counter\na_total 0\n# TYPE b gauge\nb 5\n'
+
+
+def test_operation_labels_have_low_cardinality():
+    assert metrics.operation("  select * from t") == 'select'
+    assert metrics.operation("CALL proc()") == 'other'
+    assert metrics.operation("") == 'other'
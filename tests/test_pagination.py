@@ -0,0 +1,98 @@
+"""Tests for keyset cursors, page limits and the row-count cache"""
+
+import pytest
+
+from backend.database import Database
+
+
+class SchemaStub:
+    """Schema catalog that only knows table names"""
+    
+    def __init__(self, table_names):
+        self._table_names = table_names
+    
+    def table_names(self):
+        return self._table_names
+
+
+@pytest.fixture
+def table(monkeypatch):
+    """Table 'students' with primary key id and rows 1..5, read without a server"""
+    rows = [{'id': record_id, 'name': f"s{record_id}"} for record_id in range(1, 6)]
+    queries = []
+    
+    def execute_query(query, params=None, **kwargs):
+        queries.append((query, params))
+        after = params[0] if params else 0
+        limit = int(query.rsplit('LIMIT', 1)[1].split()[0])
+        return True, [row for row in rows if row['id'] > after][:limit]
+    
+    monkeypatch.setattr(Database, '_validate_table', classmethod(lambda cls, table_name: (True, None)))
+    monkeypatch.setattr(Database, 'get_primary_key', classmethod(lambda cls, table_name: (True, ['id'])))
+    monkeypatch.setattr(Database, 'execute_query', execute_query)
+    monkeypatch.setattr(Database, 'run_parallel', lambda tasks, timeout_ms=None: {name: run() for name, run in tasks.items()})
+    monkeypatch.setattr(Database, '_row_counts', {'students': {'total': len(rows), 'exact': True}})
+    return queries
+
+
+def test_cursors_round_trip_composite_keys():
+    cursor = Database._encode_cursor([42, '2024-01-01 10:00:00'])
+    
+    assert '=' not in cursor
+    assert Database._decode_cursor(cursor, 2) == (True, [42, '2024-01-01 10:00:00'])
+
+
+@pytest.mark.parametrize('cursor', ['not base64!', Database._encode_cursor({'id': 1}), Database._encode_cursor([1])])
+def test_invalid_cursors_are_rejected(cursor):
+    assert Database._decode_cursor(cursor, 2) == (False, "Invalid cursor")
+
+
+def test_keyset_pages_follow_the_cursor_to_the_last_page(table):
+    success, first = Database.get_table_data('students', limit=2, keyset=True)
+    assert success
+    assert [row['id'] for row in first['data']] == [1, 2]
+    assert first['total'] == 5 and first['total_exact']
+    
+    pages = [first]
+    while pages[-1]['next_cursor']:
+        success, page = Database.get_table_data('students', limit=2, cursor=pages[-1]['next_cursor'])
+        assert success
+        pages.append(page)
+    
+    assert [[row['id'] for row in page['data']] for page in pages] == [[1, 2], [3, 4], [5]]
+    # The last page is known from the extra row, not from an empty page
+    assert pages[-1]['next_cursor'] is None
+
+
+def test_a_full_last_page_has_no_cursor(table):
+    success, page = Database.get_table_data('students', limit=5, keyset=True)
+    
+    assert success
+    assert len(page['data']) == 5
+    assert page['next_cursor'] is None
+
+
+@pytest.mark.parametrize('limit, expected', [(0, 'LIMIT 2'), (-5, 'LIMIT 2'), (10 ** 9, 'LIMIT 1001')])
+def test_keyset_limits_are_clamped(table, monkeypatch, limit, expected):
+    monkeypatch.setattr('config.config.Config.TABLE_MAX_PAGE_SIZE', 1000)
+    success, page = Database.get_table_data('students', limit=limit, keyset=True)
+    
+    assert success
+    assert table[0][0].endswith(expected)
+
+
+def test_offset_limits_and_offsets_are_clamped(table):
+    Database.get_table_data('students', limit=-1, offset=-10)
+    
+    assert table[0][0] == "SELECT * FROM students LIMIT 1 OFFSET 0"
+
+
+def test_writes_through_execute_query_drop_the_cached_count(monkeypatch):
+    counts = {'students': {'total': 5, 'exact': True}, 'courses': {'total': 2, 'exact': True}}
+    monkeypatch.setattr(Database, '_row_counts', counts)
+    monkeypatch.setattr(Database, '_schema', SchemaStub(['students', 'courses']))
+    
+    Database._note_write("DELETE FROM students WHERE id = 1")
+    
+    assert Database._cached_row_count('students') is None
+    assert Database._cached_row_count('courses') == {'total': 2, 'exact': True}
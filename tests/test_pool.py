@@ -0,0 +1,22 @@
+"""Tests for the connection pool's checkout wait histogram"""
+
+import json
+
+from backend.metrics import render_histogram
+from backend.pool import ConnectionPool
+
+
+def test_wait_histogram_is_valid_json_and_renders_as_metrics():
+    pool = ConnectionPool(min_size=0, max_size=1)
+    with pool._condition:
+        pool._record_wait(0.002)
+        pool._record_wait(30.0)
+    
+    wait = pool.stats()['wait_seconds']
+    
+    assert json.loads(json.dumps(wait, allow_nan=False)) == wait
+    assert wait['buckets'][-1] == {'le': '+Inf', 'count': 2}
+    lines = render_histogram('wait', 'Wait', [(b['le'], b['count']) for b in wait['buckets']],
+                             wait['sum'], wait['count'])
+    assert 'wait_bucket{le="0.005"} 1' in lines
+    assert 'wait_bucket{le="+Inf"} 2' in lines
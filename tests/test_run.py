@@ -0,0 +1,39 @@
+"""Tests for the production server settings"""
+
+import pytest
+
+import run
+from config.config import Config
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    monkeypatch.setattr(Config, 'QUERY_CACHE_ENABLED', True)
+    monkeypatch.setattr(Config, 'ROW_COUNT_CACHE', True)
+    monkeypatch.setattr(Config, 'TABLE_VERSION_TRIGGERS', False)
+    monkeypatch.setitem(run.app.config, 'TABLE_ETAGS', True)
+
+
+def test_one_worker_keeps_the_per_process_caches(settings):
+    run.configure_workers(1)
+    
+    assert Config.QUERY_CACHE_ENABLED and Config.ROW_COUNT_CACHE
+    assert run.app.config['TABLE_ETAGS']
+
+
+def test_several_workers_turn_off_per_process_caches_and_etags(settings):
+    run.configure_workers(4)
+    
+    assert not Config.QUERY_CACHE_ENABLED
+    assert not Config.ROW_COUNT_CACHE
+    assert not run.app.config['TABLE_ETAGS']
+
+
+def test_version_triggers_keep_etags_but_not_the_caches(settings, monkeypatch):
+    monkeypatch.setattr(Config, 'TABLE_VERSION_TRIGGERS', True)
+    
+    run.configure_workers(4)
+    
+    assert run.app.config['TABLE_ETAGS']
+    assert not Config.QUERY_CACHE_ENABLED
+    assert not Config.ROW_COUNT_CACHE
@@ -0,0 +1,186 @@
+"""Tests for the SQL script tokenizer, statement phases and batch failure handling"""
+
+from mysql.connector import Error
+
+from backend.sql_script import ScriptRunner, classify, split_statements
+
+
+def test_splits_on_semicolons_and_drops_empty_statements():
+    assert split_statements("SELECT 1;\n\n;SELECT 2") == ["SELECT 1", "SELECT 2"]
+
+
+def test_delimiters_inside_quotes_are_not_split():
+    script = "INSERT INTO t VALUES ('a;b', \"c;d\");\nSELECT `x;y` FROM t;"
+    assert split_statements(script) == [
+        "INSERT INTO t VALUES ('a;b', \"c;d\")",
+        "SELECT `x;y` FROM t"
+    ]
+
+
+def test_escaped_and_doubled_quotes_stay_inside_the_string():
+    script = "INSERT INTO t VALUES ('it\\'s; ok', 'say ''hi;''');SELECT 1;"
+    assert split_statements(script) == [
+        "INSERT INTO t VALUES ('it\\'s; ok', 'say ''hi;''')",
+        "SELECT 1"
+    ]
+
+
+def test_comments_are_dropped():
+    script = (
+        "-- a comment; with a semicolon\n"
+        "SELECT 1; # trailing; comment\n"
+        "SELECT /* inline; */ 2;"
+    )
+    assert split_statements(script) == ["SELECT 1", "SELECT   2"]
+
+
+def test_double_dash_without_space_is_not_a_comment():
+    assert split_statements("SELECT 5--1;") == ["SELECT 5--1"]
+
+
+def test_comment_markers_inside_strings_are_kept():
+    assert split_statements("SELECT '-- not # a /* comment */';") == ["SELECT '-- not # a /* comment */'"]
+
+
+def test_version_comments_are_kept():
+    assert split_statements("/*!40101 SET NAMES utf8 */;") == ["/*!40101 SET NAMES utf8 */"]
+
+
+def test_delimiter_changes_allow_semicolons_in_bodies():
+    script = (
+        "CREATE TABLE t (id INT);\n"
+        "DELIMITER $$\n"
+        "CREATE TRIGGER t_bi BEFORE INSERT ON t FOR EACH ROW\n"
+        "BEGIN\n"
+        "    SET NEW.id = NEW.id + 1;\n"
+        "END$$\n"
+        "DELIMITER ;\n"
+        "INSERT INTO t VALUES (1);\n"
+    )
+    assert split_statements(script) == [
+        "CREATE TABLE t (id INT)",
+        "CREATE TRIGGER t_bi BEFORE INSERT ON t FOR EACH ROW\nBEGIN\n    SET NEW.id = NEW.id + 1;\nEND",
+        "INSERT INTO t VALUES (1)"
+    ]
+
+
+def test_delimiter_is_only_a_command_at_line_start():
+    assert split_statements("SELECT 'DELIMITER $$';") == ["SELECT 'DELIMITER $$'"]
+
+
+def test_classify_phases():
+    assert classify("USE edudb") == 'skip'
+    assert classify("CREATE DATABASE edudb") == 'skip'
+    assert classify("SELECT 'done' AS Status") == 'skip'
+    assert classify("SELECT * FROM students") == 'ddl'
+    assert classify("CREATE TABLE t (id INT)") == 'ddl'
+    assert classify("create  unique index idx ON t (id)") == 'index'
+    assert classify("INSERT INTO t VALUES (1)") == 'dml'
+    assert classify("DELETE FROM t") == 'dml'
+    assert classify("ALTER TABLE t ADD INDEX idx (a, b), ADD UNIQUE KEY uk (c)") == 'index'
+    assert classify("ALTER TABLE t ADD COLUMN c INT, ADD INDEX idx (c)") == 'ddl'
+    assert classify("ALTER TABLE t ADD CONSTRAINT fk FOREIGN KEY (a) REFERENCES u (id)") == 'ddl'
+
+
+class FakeConnection:
+    """Connection that applies DML in a transaction with savepoints; statements containing BAD fail"""
+    
+    def __init__(self):
+        self.committed = []
+        self.transaction = []
+        self.savepoint = 0
+        self.log = []
+    
+    def cursor(self):
+        return FakeCursor(self)
+    
+    def commit(self):
+        self.committed.extend(self.transaction)
+        self.transaction = []
+    
+    def rollback(self):
+        self.transaction = []
+    
+    def apply(self, statement):
+        if 'BAD' in statement:
+            raise Error(msg=f"Failed: {statement}")
+        if not statement.startswith(('SAVEPOINT', 'ROLLBACK', 'SET')):
+            self.log.append(statement)
+        if statement.startswith('SAVEPOINT'):
+            self.savepoint = len(self.transaction)
+        elif statement.startswith('ROLLBACK TO SAVEPOINT'):
+            del self.transaction[self.savepoint:]
+        elif statement.startswith(('INSERT', 'UPDATE')):
+            self.transaction.append(statement)
+        elif not statement.startswith('SET'):
+            self.committed.append(statement)
+
+
+class FakeResult:
+    with_rows = False
+
+
+class FakeCursor:
+    with_rows = False
+    
+    def __init__(self, connection):
+        self.connection = connection
+    
+    def execute(self, operation, multi=False):
+        if not multi:
+            return self.connection.apply(operation)
+        return self._results(operation.split(';\n'))
+    
+    def _results(self, statements):
+        for statement in statements:
+            self.connection.apply(statement)
+            yield FakeResult()
+    
+    def close(self):
+        pass
+
+
+def test_failed_statements_are_skipped_and_only_kept_statements_count():
+    connection = FakeConnection()
+    script = (
+        "CREATE TABLE a (x INT);\nCREATE BAD;\nCREATE TABLE b (x INT);\n"
+        + ''.join(f"INSERT INTO a VALUES ({i});\n" for i in range(5))
+        + "INSERT BAD;\nINSERT INTO a VALUES (9);\n"
+    )
+    report = ScriptRunner(connection, batch_statements=4).run(script)
+    
+    assert connection.committed == [
+        "CREATE TABLE a (x INT)",
+        "CREATE TABLE b (x INT)",
+        *(f"INSERT INTO a VALUES ({i})" for i in range(5)),
+        "INSERT INTO a VALUES (9)"
+    ]
+    assert report['executed'] == len(connection.committed)
+    assert [failure['statement'] for failure in report['failed']] == ["CREATE BAD", "INSERT BAD"]
+
+
+def test_statements_keep_the_script_order_and_only_indexes_are_deferred():
+    connection = FakeConnection()
+    script = (
+        "CREATE TABLE a (x INT);\n"
+        "CREATE INDEX a_x ON a (x);\n"
+        "INSERT INTO a VALUES (1);\n"
+        "ALTER TABLE a ADD COLUMN y INT;\n"
+        "UPDATE a SET y = x;\n"
+        "ALTER TABLE a ADD INDEX a_y (y);\n"
+        "INSERT INTO a VALUES (2, 2);\n"
+    )
+    report = ScriptRunner(connection).run(script)
+    
+    assert connection.log == [
+        "CREATE TABLE a (x INT)",
+        "INSERT INTO a VALUES (1)",
+        # Built after the data loaded before the next schema change
+        "CREATE INDEX a_x ON a (x)",
+        "ALTER TABLE a ADD COLUMN y INT",
+        "UPDATE a SET y = x",
+        "INSERT INTO a VALUES (2, 2)",
+        "ALTER TABLE a ADD INDEX a_y (y)"
+    ]
+    assert report['executed'] == 7
+    assert report['failed'] == []
@@ -0,0 +1,70 @@
+"""Tests for conditional table GETs answered from table write versions"""
+
+import pytest
+
+from backend.app import app
+from backend.database import Database
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Test client for a 'students' table whose reads are counted"""
+    reads = []
+    
+    def get_table_data(table_name, **kwargs):
+        reads.append(table_name)
+        return True, {'data': [{'id': 1}], 'total': 1, 'total_exact': True, 'next_cursor': None}
+    
+    monkeypatch.setitem(app.config, 'TABLE_ETAGS', True)
+    monkeypatch.setattr(Database, '_validate_table', classmethod(lambda cls, table_name: (True, None)))
+    monkeypatch.setattr(Database, 'get_table_data', get_table_data)
+    client = app.test_client()
+    client.reads = reads
+    return client
+
+
+def test_a_matching_etag_is_answered_without_reading_the_table(client):
+    first = client.get('/api/tables/students')
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    
+    second = client.get('/api/tables/students', headers={'If-None-Match': etag})
+    
+    assert second.status_code == 304
+    assert second.headers['ETag'] == etag
+    assert client.reads == ['students']
+
+
+def test_a_write_changes_the_etag(client):
+    etag = client.get('/api/tables/students').headers['ETag']
+    
+    Database.bump_table_versions(['students'])
+    response = client.get('/api/tables/students', headers={'If-None-Match': etag})
+    
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+def test_writes_to_other_tables_keep_the_etag(client):
+    etag = client.get('/api/tables/students').headers['ETag']
+    
+    Database.bump_table_versions(['courses'])
+    
+    assert client.get('/api/tables/students', headers={'If-None-Match': etag}).status_code == 304
+
+
+def test_each_page_has_its_own_etag(client):
+    first = client.get('/api/tables/students?limit=10').headers['ETag']
+    second = client.get('/api/tables/students?limit=10&offset=10').headers['ETag']
+    
+    assert first != second
+
+
+def test_versions_differ_between_processes(monkeypatch):
+    monkeypatch.setattr(Database, '_validate_table', classmethod(lambda cls, table_name: (True, None)))
+    _, version = Database.get_table_version('students')
+    
+    monkeypatch.setattr(Database, '_version_epoch', (-1, 'other-process'))
+    monkeypatch.setattr('os.getpid', lambda: -1)
+    
+    assert Database.get_table_version('students')[1] != version
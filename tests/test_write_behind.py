@@ -0,0 +1,158 @@
+"""Tests for the write-behind buffer and how progress saves use it"""
+
+import pytest
+
+from backend.database import Database
+from backend.models import Progress
+from backend.write_behind import WriteBehindBuffer
+
+
+class FlakyWriter:
+    """flush_batch callable that fails while failing is set"""
+    
+    def __init__(self):
+        self.failing = False
+        self.batches = []
+    
+    def __call__(self, batch):
+        if self.failing:
+            return False, "database unavailable"
+        self.batches.append(batch)
+        return True, {"affected_rows": len(batch)}
+
+
+@pytest.fixture
+def writer():
+    return FlakyWriter()
+
+
+@pytest.fixture
+def buffer(writer):
+    # Long interval: the tests flush by hand
+    buffer = WriteBehindBuffer(writer, interval=3600)
+    yield buffer
+    writer.failing = False
+    buffer.close()
+
+
+def test_saves_of_one_key_are_merged_into_one_write(buffer, writer):
+    buffer.put('a', {'score': 1})
+    buffer.put('a', {'score': 2, 'time': 10})
+    buffer.put('b', {'score': 5})
+    
+    assert buffer.get('a') == {'score': 2, 'time': 10}
+    assert buffer.flush() == 2
+    assert writer.batches == [{'a': {'score': 2, 'time': 10}, 'b': {'score': 5}}]
+    assert buffer.get('a') is None
+    assert buffer.stats()['coalescing_ratio'] == 1.5
+
+
+def test_failed_flush_keeps_the_batch_for_the_next_flush(buffer, writer):
+    buffer.put('a', {'score': 1, 'time': 10})
+    writer.failing = True
+    
+    assert buffer.flush() == 0
+    assert buffer.get('a') == {'score': 1, 'time': 10}
+    assert buffer.stats()['failed_flushes'] == 1
+    
+    writer.failing = False
+    assert buffer.flush() == 1
+    assert writer.batches == [{'a': {'score': 1, 'time': 10}}]
+
+
+def test_saves_made_after_a_failed_flush_win_over_the_retried_batch(buffer, writer):
+    buffer.put('a', {'score': 1, 'time': 10})
+    writer.failing = True
+    
+    def save_during_flush(batch):
+        # Another request saves while the failing batch is being written
+        buffer.put('a', {'score': 2})
+        return False, "database unavailable"
+    
+    buffer.flush_batch = save_during_flush
+    buffer.flush()
+    
+    assert buffer.get('a') == {'score': 2, 'time': 10}
+    buffer.flush_batch = writer
+    writer.failing = False
+    buffer.flush()
+    assert writer.batches == [{'a': {'score': 2, 'time': 10}}]
+
+
+def test_exceptions_from_the_writer_count_as_failed_flushes(buffer):
+    buffer.put('a', {'score': 1})
+    buffer.flush_batch = lambda batch: 1 / 0
+    
+    assert buffer.flush() == 0
+    assert buffer.get('a') == {'score': 1}
+
+
+def test_discard_drops_unsaved_fields(buffer, writer):
+    buffer.put('a', {'score': 1})
+    buffer.discard('a')
+    
+    assert buffer.flush() == 0
+    assert writer.batches == []
+
+
+def test_close_writes_what_is_left(writer):
+    buffer = WriteBehindBuffer(writer, interval=3600)
+    buffer.put('a', {'score': 3})
+    buffer.close()
+    
+    assert writer.batches == [{'a': {'score': 3}}]
+
+
+class RecordingConnection:
+    """Connection whose statements are appended to a shared log"""
+    
+    def __init__(self, log):
+        self.log = log
+    
+    def cursor(self):
+        return RecordingCursor(self.log)
+    
+    def commit(self):
+        self.log.append('commit')
+    
+    def rollback(self):
+        self.log.append('rollback')
+    
+    def close(self):
+        pass
+
+
+class RecordingCursor:
+    
+    def __init__(self, log):
+        self.log = log
+        self.row = None
+    
+    def execute(self, query, params=None):
+        self.log.append(' '.join(query.split()[:3]))
+        # No previous answer; the score after the increment is 7
+        self.row = (7,) if query.startswith('SELECT easy_score') else None
+    
+    def fetchone(self):
+        return self.row
+    
+    def close(self):
+        pass
+
+
+def test_record_answer_writes_buffered_saves_before_moving_the_score(monkeypatch):
+    log = []
+    buffer = WriteBehindBuffer(lambda batch: log.append(('flush', batch)) or (True, {}), interval=3600)
+    monkeypatch.setattr(Progress, '_buffer', buffer)
+    monkeypatch.setattr(Progress, 'LEVELS', ('easy',))
+    monkeypatch.setattr(Database, 'get_connection', classmethod(lambda cls: RecordingConnection(log)))
+    buffer.put('learner', {'easy_score': 5})
+    
+    success, result = Progress.record_answer('learner', 'easy', 'q1', 'SELECT 1', True)
+    
+    assert success and result == {'score': 7, 'delta': 1}
+    # The buffered score lands first, so it cannot overwrite the increment later
+    assert log[0] == ('flush', {'learner': {'easy_score': 5}})
+    assert log.index('INSERT INTO learner_progress') > 0
+    assert buffer.get('learner') is None
+    buffer.close()